@@ -0,0 +1,290 @@
+"""
+Columnar batch decoding of MFT record headers using NumPy
+"""
+
+import logging
+from typing import Dict, FrozenSet, Iterator, Optional, Any, Union
+from .constants import *
+from .mft_record import MftRecord
+from .windows_time import filetimes_to_datetime64, filetimes_to_unix, format_filetimes
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+HEADER_FIELDS = (
+    ('magic', '<u4', MFT_RECORD_MAGIC_NUMBER_OFFSET),
+    ('upd_off', '<u2', MFT_RECORD_UPDATE_SEQUENCE_OFFSET),
+    ('upd_cnt', '<u2', MFT_RECORD_UPDATE_SEQUENCE_SIZE_OFFSET),
+    ('lsn', '<u8', MFT_RECORD_LOGFILE_SEQUENCE_NUMBER_OFFSET),
+    ('seq', '<u2', MFT_RECORD_SEQUENCE_NUMBER_OFFSET),
+    ('link', '<u2', MFT_RECORD_HARD_LINK_COUNT_OFFSET),
+    ('attr_off', '<u2', MFT_RECORD_FIRST_ATTRIBUTE_OFFSET),
+    ('flags', '<u2', MFT_RECORD_FLAGS_OFFSET),
+    ('size', '<u4', MFT_RECORD_USED_SIZE_OFFSET),
+    ('alloc_sizef', '<u4', MFT_RECORD_ALLOCATED_SIZE_OFFSET),
+    ('base_ref', '<u8', MFT_RECORD_FILE_REFERENCE_OFFSET),
+    ('next_attrid', '<u2', MFT_RECORD_NEXT_ATTRIBUTE_ID_OFFSET),
+    ('recordnum', '<u4', MFT_RECORD_RECORD_NUMBER_OFFSET),
+)
+
+FILETIME_KEYS = ('crtime', 'mtime', 'ctime', 'atime')
+
+
+def header_dtype(record_size: int = MFT_RECORD_SIZE) -> 'np.dtype':
+    """
+    Build a structured dtype whose itemsize is one whole MFT record, so that
+    np.frombuffer yields one element per record with every header field decoded.
+
+    Args:
+        record_size: Size of a single MFT record in bytes
+
+    Returns:
+        NumPy structured dtype describing the record header
+    """
+    if not HAS_NUMPY:
+        raise ImportError("NumPy is required for batch parsing. Install with: pip install analyzeMFT[numpy]")
+
+    return np.dtype({
+        'names': [name for name, _, _ in HEADER_FIELDS],
+        'formats': [fmt for _, fmt, _ in HEADER_FIELDS],
+        'offsets': [offset for _, _, offset in HEADER_FIELDS],
+        'itemsize': record_size
+    })
+
+
+class RecordBatch:
+    """
+    Header fields of a run of consecutive MFT records, decoded as NumPy columns.
+
+    Full MftRecord objects are only built when requested through record().
+    """
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview], first_index: int = 0,
+                 record_size: int = MFT_RECORD_SIZE, logger: Optional[logging.Logger] = None):
+        """
+        Decode the headers of every complete record in a buffer.
+
+        Args:
+            buffer: Raw bytes holding one or more consecutive MFT records
+            first_index: Position of the first record in the source file
+            record_size: Size of a single MFT record in bytes
+            logger: Logger instance for debugging output
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if not HAS_NUMPY:
+            raise ImportError("NumPy is required for batch parsing. Install with: pip install analyzeMFT[numpy]")
+        self.logger = logger or logging.getLogger('analyzeMFT.batch_parser')
+        self.record_size = record_size
+        self.first_index = first_index
+        self.buffer = memoryview(buffer).cast('B')
+
+        count = len(self.buffer) // record_size
+        if len(self.buffer) % record_size:
+            self.logger.debug(f"Ignoring {len(self.buffer) % record_size} trailing bytes after {count} records")
+
+        headers = np.frombuffer(self.buffer, dtype=header_dtype(record_size), count=count)
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.ascontiguousarray(headers[name]) for name, _, _ in HEADER_FIELDS
+        }
+
+    def __len__(self) -> int:
+        return len(self.columns['recordnum'])
+
+    def __getitem__(self, name: str) -> 'np.ndarray':
+        return self.columns[name]
+
+    @property
+    def valid(self) -> 'np.ndarray':
+        """Boolean mask of records carrying the FILE signature."""
+        return self.columns['magic'] == int.from_bytes(MFT_RECORD_MAGIC, BYTE_ORDER)
+
+    @property
+    def in_use(self) -> 'np.ndarray':
+        return (self.columns['flags'] & FILE_RECORD_IN_USE) != 0
+
+    @property
+    def is_directory(self) -> 'np.ndarray':
+        return (self.columns['flags'] & FILE_RECORD_IS_DIRECTORY) != 0
+
+    @property
+    def base_record_num(self) -> 'np.ndarray':
+        return self.columns['base_ref'] & 0x0000FFFFFFFFFFFF
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Compute the same record counters MftAnalyzer keeps, straight from the columns.
+
+        Returns:
+            Dictionary with total, active, directory and file counts
+        """
+        directories = int(np.count_nonzero(self.is_directory))
+        return {
+            'total_records': len(self),
+            'active_records': int(np.count_nonzero(self.in_use)),
+            'directories': directories,
+            'files': len(self) - directories,
+            'bytes_processed': len(self) * self.record_size,
+        }
+
+    def _walk_attributes(self) -> Iterator[tuple]:
+        """
+        Walk the attribute chain of every record at once, one attribute per step.
+
+        Follows the same rules as MftRecord.parse_attributes: the walk ends at the
+        end marker or a zero length, and an attribute running past the record skips
+        8 bytes. Each step yields (rows, offsets, attr_type, fits) for the records
+        still walking, where fits marks attributes that lie inside the record.
+        """
+        size = self.record_size
+        rows = np.arange(len(self))
+        offsets = self.columns['attr_off'].astype(np.int64)
+        while len(rows):
+            in_bounds = offsets < size - 8
+            rows, offsets = rows[in_bounds], offsets[in_bounds]
+            _, attr_type = self._gather(rows, offsets, 4, '<u4')
+            _, attr_len = self._gather(rows, offsets + 4, 4, '<u4')
+            attr_len = attr_len.astype(np.int64)
+
+            live = (attr_type != 0xFFFFFFFF) & (attr_len != 0)
+            rows, offsets = rows[live], offsets[live]
+            attr_type, attr_len = attr_type[live], attr_len[live]
+            fits = offsets + attr_len <= size
+            yield rows, offsets, attr_type, fits
+
+            offsets = np.where(fits, offsets + attr_len, offsets + 8)
+
+    def _gather(self, rows: 'np.ndarray', offsets: 'np.ndarray', width: int, fmt: str) -> tuple:
+        """Read one little-endian value of width bytes at a per-row offset; out-of-record reads give 0."""
+        size = self.record_size
+        data = np.frombuffer(self.buffer, dtype=np.uint8, count=len(self) * size).reshape(len(self), size)
+        ok = (offsets >= 0) & (offsets + width <= size)
+        index = np.where(ok, offsets, 0)[:, None] + np.arange(width)
+        values = data[rows[:, None], index].view(fmt).reshape(len(rows))
+        return ok, np.where(ok, values, 0)
+
+    def attribute_offsets(self, attr_type: int, min_content: int = 0) -> 'np.ndarray':
+        """
+        Find the last attribute of a type in every record.
+
+        Args:
+            attr_type: Attribute type to look for
+            min_content: Bytes that must fit in the record after the 24-byte attribute header
+
+        Returns:
+            int64 column of attribute offsets within each record, -1 where there is none
+        """
+        result = np.full(len(self), -1, dtype=np.int64)
+        for rows, offsets, types, fits in self._walk_attributes():
+            selected = fits & (types == attr_type) & (offsets + 24 + min_content <= self.record_size)
+            result[rows[selected]] = offsets[selected]
+        return result
+
+    def filetime_columns(self) -> Dict[str, 'np.ndarray']:
+        """
+        Extract the raw $STANDARD_INFORMATION and $FILE_NAME FILETIME values of every record.
+
+        When an attribute type repeats the last occurrence wins. Missing times are 0.
+
+        Returns:
+            Dictionary of uint64 columns keyed 'si_crtime' ... 'fn_atime'
+        """
+        n = len(self)
+        columns = {f'{prefix}_{key}': np.zeros(n, dtype=np.uint64)
+                   for prefix in ('si', 'fn') for key in FILETIME_KEYS}
+        rows = np.arange(n)
+        for prefix, attr, base, needed in (('si', STANDARD_INFORMATION_ATTRIBUTE, 24, 32),
+                                            ('fn', FILE_NAME_ATTRIBUTE, 32, 64)):
+            offsets = self.attribute_offsets(attr, needed)
+            found = offsets >= 0
+            if not found.any():
+                continue
+            sel_rows, sel_offsets = rows[found], offsets[found]
+            for i, key in enumerate(FILETIME_KEYS):
+                _, values = self._gather(sel_rows, sel_offsets + base + 8 * i, 8, '<u8')
+                columns[f'{prefix}_{key}'][sel_rows] = values
+        return columns
+
+    def unix_times(self) -> Dict[str, 'np.ndarray']:
+        """Return every $SI/$FN timestamp of the batch as float Unix time columns."""
+        return {name: filetimes_to_unix(column) for name, column in self.filetime_columns().items()}
+
+    def datetimes(self, unit: str = 'ns') -> Dict[str, 'np.ndarray']:
+        """Return every $SI/$FN timestamp of the batch as datetime64 columns."""
+        return {name: filetimes_to_datetime64(column, unit) for name, column in self.filetime_columns().items()}
+
+    def time_strings(self, timespec: str = 'milliseconds') -> Dict[str, 'np.ndarray']:
+        """Return every $SI/$FN timestamp of the batch formatted as ISO 8601 strings."""
+        return {name: format_filetimes(column, timespec) for name, column in self.filetime_columns().items()}
+
+    def raw_record(self, index: int) -> memoryview:
+        """Return a zero-copy view of the raw bytes of one record in the batch."""
+        start = index * self.record_size
+        return self.buffer[start:start + self.record_size]
+
+    def record(self, index: int, compute_hashes: bool = False, debug_level: int = 0,
+               logger: Optional[logging.Logger] = None,
+               attributes: Optional[FrozenSet[int]] = None) -> MftRecord:
+        """
+        Build a full MftRecord for one record in the batch.
+
+        Args:
+            index: Position of the record within the batch
+            compute_hashes: Whether the record should compute its own hashes
+            debug_level: Debug level passed through to MftRecord
+            logger: Logger passed through to MftRecord
+            attributes: Attribute types to decode, or None for all
+
+        Returns:
+            Fully parsed MftRecord
+        """
+        if index < 0 or index >= len(self):
+            raise IndexError(f"Record index {index} out of range for batch of {len(self)} records")
+        return MftRecord(bytes(self.raw_record(index)), compute_hashes, debug_level, logger or self.logger,
+                         attributes=attributes)
+
+    def iter_records(self, mask: Optional['np.ndarray'] = None, **kwargs: Any) -> Iterator[MftRecord]:
+        """
+        Lazily build MftRecord objects, optionally only for records selected by a mask.
+
+        Args:
+            mask: Optional boolean array selecting the records to build
+            **kwargs: Passed through to record()
+
+        Yields:
+            MftRecord objects in file order
+        """
+        indexes = range(len(self)) if mask is None else np.flatnonzero(mask)
+        for index in indexes:
+            yield self.record(int(index), **kwargs)
+
+
+def iter_record_batches(mft_file: str, batch_size: int = 1000,
+                        record_size: int = MFT_RECORD_SIZE,
+                        logger: Optional[logging.Logger] = None) -> Iterator[RecordBatch]:
+    """
+    Read an MFT file and yield it as a series of RecordBatch objects.
+
+    Args:
+        mft_file: Path to the MFT file
+        batch_size: Number of records per batch
+        record_size: Size of a single MFT record in bytes
+        logger: Logger instance passed to each batch
+
+    Yields:
+        RecordBatch objects covering the file in order
+    """
+    index = 0
+    with open(mft_file, 'rb') as f:
+        while True:
+            data = f.read(batch_size * record_size)
+            if len(data) < record_size:
+                break
+            batch = RecordBatch(data, first_index=index, record_size=record_size, logger=logger)
+            index += len(batch)
+            yield batch
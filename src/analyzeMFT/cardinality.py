@@ -0,0 +1,147 @@
+"""
+Distinct-value counters for analysis statistics
+"""
+
+import hashlib
+import math
+from typing import Iterable, Set, Union
+
+CARDINALITY_MODES = ('auto', 'exact', 'hll')
+DEFAULT_PRECISION = 12
+DEFAULT_EXACT_THRESHOLD = 1000
+MIN_PRECISION = 4
+MAX_PRECISION = 16
+
+
+def _hash64(value: Union[bytes, str]) -> int:
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), 'big')
+
+
+def _check_precision(precision: int) -> None:
+    if not MIN_PRECISION <= precision <= MAX_PRECISION:
+        raise ValueError(f"HyperLogLog precision must be between {MIN_PRECISION} and {MAX_PRECISION}, "
+                         f"got: {precision}")
+
+
+class ExactCounter:
+    """Count distinct values by keeping every value in a set."""
+    exact = True
+
+    def __init__(self) -> None:
+        self.values: Set[Union[bytes, str]] = set()
+
+    def add(self, value: Union[bytes, str]) -> None:
+        self.values.add(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+
+class HyperLogLog:
+    """
+    Estimate the number of distinct values in 2 ** precision bytes of registers.
+
+    The relative standard error is about 1.04 / sqrt(2 ** precision), i.e. 1.6% for
+    the default precision of 12 (4 KiB of registers).
+    """
+    exact = False
+
+    def __init__(self, precision: int = DEFAULT_PRECISION) -> None:
+        """
+        Args:
+            precision: Number of index bits, between 4 and 16
+        """
+        _check_precision(precision)
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+        self._rank_bits = 64 - precision
+        self._rank_mask = (1 << self._rank_bits) - 1
+
+    def add(self, value: Union[bytes, str]) -> None:
+        x = _hash64(value)
+        index = x >> self._rank_bits
+        rank = self._rank_bits - (x & self._rank_mask).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[Union[bytes, str]]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """Fold another counter of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog counters with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are still empty
+            estimate = m * math.log(m / zeros)
+        return estimate
+
+    def __len__(self) -> int:
+        return int(round(self.estimate()))
+
+
+class AdaptiveCounter:
+    """
+    Count exactly until more than ``threshold`` distinct values have been seen,
+    then switch to a HyperLogLog estimate so memory stays bounded.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_EXACT_THRESHOLD, precision: int = DEFAULT_PRECISION) -> None:
+        """
+        Args:
+            threshold: Largest number of distinct values counted exactly
+            precision: HyperLogLog precision used after the switch
+        """
+        _check_precision(precision)
+        self.threshold = threshold
+        self.precision = precision
+        self.counter = ExactCounter()
+
+    @property
+    def exact(self) -> bool:
+        return self.counter.exact
+
+    def add(self, value: Union[bytes, str]) -> None:
+        self.counter.add(value)
+        if self.counter.exact and len(self.counter) > self.threshold:
+            hll = HyperLogLog(self.precision)
+            hll.update(self.counter)
+            self.counter = hll
+
+    def __len__(self) -> int:
+        return len(self.counter)
+
+
+def create_counter(mode: str = 'auto', precision: int = DEFAULT_PRECISION,
+                   threshold: int = DEFAULT_EXACT_THRESHOLD):
+    """
+    Create a distinct-value counter.
+
+    Args:
+        mode: 'exact', 'hll' or 'auto' (exact up to threshold, then HyperLogLog)
+        precision: HyperLogLog precision
+        threshold: Switch-over point for 'auto' mode
+
+    Returns:
+        Counter with add() and len()
+    """
+    if mode == 'exact':
+        return ExactCounter()
+    if mode == 'hll':
+        return HyperLogLog(precision)
+    if mode == 'auto':
+        return AdaptiveCounter(threshold, precision)
+    raise ValueError(f"Unsupported cardinality mode: {mode}. Use one of {', '.join(CARDINALITY_MODES)}")
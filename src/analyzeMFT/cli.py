@@ -9,7 +9,7 @@ from .config import ConfigManager, find_config_file
 from .test_generator import create_test_mft
 from .validators import (
     validate_paths_secure, validate_numeric_bounds, validate_export_format,
-    validate_config_schema, ValidationError, MFTValidationError, 
+    validate_hash_algorithms, validate_config_schema, ValidationError, MFTValidationError, 
     PathValidationError, NumericValidationError, ConfigValidationError
 )
 
@@ -31,6 +31,8 @@ async def main():    logging.basicConfig(
                             help="Export as CSV (default)")
     export_group.add_option("--json", action="store_const", const="json", dest="export_format",
                             help="Export as JSON")
+    export_group.add_option("--jsonl", action="store_const", const="jsonl", dest="export_format",
+                            help="Export as JSON Lines, one compact object per record, written as chunks complete")
     export_group.add_option("--xml", action="store_const", const="xml", dest="export_format",
                             help="Export as XML")
     export_group.add_option("--excel", action="store_const", const="excel", dest="export_format",
@@ -43,6 +45,11 @@ async def main():    logging.basicConfig(
                             help="Export as log2timeline CSV")
     export_group.add_option("--sqlite", action="store_const", const="sqlite", dest="export_format",
                             help="Export as SQLite database")
+    export_group.add_option("--full-text-index", action="store_true", dest="full_text_index", default=False,
+                            help="With --sqlite, add an FTS5 index for substring search on filenames and paths")
+    export_group.add_option("--compact-paths", action="store_true", dest="compact_paths", default=False,
+                            help="With --sqlite, store each directory path once and read full paths "
+                                 "from the record_paths view")
     export_group.add_option("--tsk", action="store_const", const="tsk", dest="export_format",
                             help="Export as TSK bodyfile format")
     
@@ -60,10 +67,39 @@ async def main():    logging.basicConfig(
                                 help="Number of records to process in each chunk (default: 1000)")
     performance_group.add_option("-H", "--hash", action="store_true", dest="compute_hashes",
                                 help="Compute hashes (MD5, SHA256, SHA512, CRC32)", default=False)
+    performance_group.add_option("--hash-algorithms", dest="hash_algorithms", metavar="LIST",
+                                help="Comma-separated hashes to compute, e.g. sha256 or md5,sha256 (implies --hash; default: all)")
+    performance_group.add_option("--unique-counter", dest="unique_counter", choices=["auto", "exact", "hll"],
+                                default="auto",
+                                help="How unique hashes are counted: exact, hll (HyperLogLog estimate) or auto "
+                                     "(exact for small volumes, then HyperLogLog; default: auto)")
+    performance_group.add_option("--hll-precision", dest="hll_precision", type="int", default=12,
+                                help="HyperLogLog precision, 4-16; uses 2^N bytes per counter (default: 12)")
+    performance_group.add_option("--no-path-index", action="store_false", dest="path_index", default=True,
+                                help="Skip the first indexing pass; paths to parents stored later in the file "
+                                     "are then reported as UnknownParent")
+    performance_group.add_option("--streaming", action="store_true", dest="streaming", default=False,
+                                help="Export each chunk as soon as it is parsed and keep only the path index "
+                                     "between chunks (always builds the path index)")
+    performance_group.add_option("--max-memory", dest="max_memory", type="int", metavar="MB",
+                                help="Resident memory limit in MB for the whole process; chunk and cache "
+                                     "sizes are fitted to what the process does not already use, and chunks "
+                                     "shrink or the run stops if it goes over (implies --streaming)")
+    performance_group.add_option("--max-records-in-memory", dest="max_records_in_memory", type="int", metavar="N",
+                                help="Keep at most N parsed records in memory and spill the least recently used "
+                                     "to a temporary SQLite file (default: keep all)")
+    performance_group.add_option("--spill-dir", dest="spill_dir", metavar="DIR",
+                                help="Directory for the record spill file (default: system temp directory)")
     performance_group.add_option("--no-multiprocessing-hashes", action="store_false", dest="multiprocessing_hashes",
                                 help="Disable multiprocessing for hash computation", default=True)
     performance_group.add_option("--hash-processes", dest="hash_processes", type="int",
                                 help="Number of processes for hash computation (default: auto-detect)")
+    performance_group.add_option("--retain-raw-records", action="store_true", dest="retain_raw_records",
+                                help="Keep the raw bytes of every record in memory after parsing", default=False)
+    performance_group.add_option("--io-mode", dest="io_mode", choices=["auto", "mmap", "buffered"], default="auto",
+                                help="How to read the MFT file: auto, mmap or buffered (default: auto)")
+    performance_group.add_option("--parallel-workers", dest="parallel_workers", type="int",
+                                help="Parse records in N worker processes (default: parse in a single process)")
     parser.add_option_group(performance_group)    config_group = OptionGroup(parser, "Configuration Options")
     config_group.add_option("-c", "--config", dest="config_file", metavar="FILE",
                            help="Load configuration from JSON/YAML file")
@@ -180,8 +216,14 @@ async def main():    logging.basicConfig(
             hash_processes=options.hash_processes,
             test_records=options.test_records,
             verbosity=options.verbosity,
-            debug=options.debug
-        )        validate_export_format(options.export_format, options.output_file)        validated_input, validated_output = validate_paths_secure(
+            debug=options.debug,
+            max_memory=options.max_memory,
+            max_records_in_memory=options.max_records_in_memory,
+            hll_precision=options.hll_precision
+        )        validate_export_format(options.export_format, options.output_file)
+        if options.hash_algorithms is not None:
+            options.hash_algorithms = list(validate_hash_algorithms(options.hash_algorithms))
+            options.compute_hashes = True        validated_input, validated_output = validate_paths_secure(
             options.filename, options.output_file
         )        options.filename = str(validated_input)
         options.output_file = str(validated_output)
@@ -205,7 +247,20 @@ async def main():    logging.basicConfig(
             profile,
             options.chunk_size,
             options.multiprocessing_hashes,
-            options.hash_processes
+            options.hash_processes,
+            options.retain_raw_records,
+            options.io_mode,
+            options.parallel_workers,
+            options.hash_algorithms,
+            options.unique_counter,
+            options.hll_precision,
+            options.path_index,
+            options.streaming,
+            options.max_memory,
+            options.max_records_in_memory,
+            options.spill_dir,
+            options.full_text_index,
+            options.compact_paths
         )
         
         await analyzer.analyze()
@@ -19,6 +19,7 @@ class AnalysisProfile:
     description: str = "Default analysis profile"
     export_format: str = "csv"
     compute_hashes: bool = False
+    hash_algorithms: Optional[list] = None
     verbosity: int = 0
     debug: int = 0    chunk_size: int = 1000
     enable_anomaly_detection: bool = False
@@ -157,6 +158,7 @@ class ConfigManager:
             "description": "Sample configuration file",
             "export_format": "csv",
             "compute_hashes": False,
+            "hash_algorithms": ["md5", "sha256", "sha512", "crc32"],
             "verbosity": 1,
             "debug": 0,
             "chunk_size": 1000,
@@ -241,6 +241,15 @@ INDEX_ENTRY_END = 0x02
 # MFT Record Size
 MFT_RECORD_SIZE = 1024
 
+# Record hash algorithms in output column order, with digest sizes in bytes
+HASH_ALGORITHMS = ('md5', 'sha256', 'sha512', 'crc32')
+HASH_DIGEST_SIZES = {'md5': 16, 'sha256': 32, 'sha512': 64, 'crc32': 4}
+
+# Memory estimates used to fit a streaming run into --max-memory (bytes)
+RECORD_MEMORY_ESTIMATE = 4096      # One parsed MftRecord without its raw bytes
+PATH_INDEX_RECORD_ESTIMATE = 64    # One PathIndex entry including its name
+PATH_CACHE_ENTRY_ESTIMATE = 256    # One cached directory path
+
 # Attribute Flags
 ATTR_FLAG_COMPRESSED = 0x0001
 ATTR_FLAG_ENCRYPTED = 0x4000
@@ -262,6 +271,7 @@ BYTE_ORDER = 'little'
 STRUCT_STANDARD_INFORMATION = '<QQQQLLLQQQ'
 STRUCT_FILE_NAME = '<QQQQQQLLLLBB'
 STRUCT_OBJECT_ID = '<16s16s16s16s'
+STRUCT_MFT_RECORD_HEADER = '<IHHQHHHHIIQHxxI'
 
 # MFT Record header offsets and sizes
 MFT_RECORD_MAGIC_NUMBER_OFFSET = 0
@@ -3,12 +3,77 @@ import csv
 import logging
 import os
 import json
+import re
 import sqlite3
-import xml.etree.ElementTree as ET
-from typing import List, Dict, Any
+import textwrap
+import time
+from abc import ABC, abstractmethod
+from itertools import repeat
+from typing import List, Dict, Any, Optional
+from xml.sax.saxutils import escape
 from .mft_record import MftRecord
 from .constants import *
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+# Formats the analyzer writes chunk by chunk even without --streaming
+CHUNKED_FORMATS = frozenset({'json', 'jsonl', 'xml', 'excel'})
+
+# Rows per worksheet in .xlsx files, header included
+EXCEL_MAX_ROWS = 1048576
+FILEPATH_COLUMN = CSV_HEADER.index('Filepath')
+
+# Characters XML 1.0 cannot carry, not even as character references
+XML_INVALID_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+
+def xml_element(name: str, value: Any) -> str:
+    """
+    Render one field as an XML element.
+
+    Dicts become nested elements, lists a sequence of <item> elements and None an
+    empty element. Text is escaped, and characters XML cannot represent are
+    written as \\xNN.
+    """
+    if isinstance(value, dict):
+        return f"<{name}>" + "".join(xml_element(key, item) for key, item in value.items()) + f"</{name}>"
+    if isinstance(value, list):
+        return f"<{name}>" + "".join(xml_element("item", item) for item in value) + f"</{name}>"
+    if value is None:
+        return f"<{name}/>"
+    text = XML_INVALID_CHARS.sub(lambda match: f"\\x{ord(match.group()):02x}", escape(str(value)))
+    return f"<{name}>{text}</{name}>"
+
+
+def json_line(data: Dict[str, Any]) -> bytes:
+    """Encode one object as a compact UTF-8 JSON line, with orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.dumps(data, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str) + "\n").encode('utf-8')
+
+
+def body_line(record: MftRecord) -> str:
+    # Format: MD5|name|inode|mode_as_string|UID|GID|size|atime|mtime|ctime|crtime
+    fn_times = record.fn_times
+    return (f"0|{record.filename}|{record.recordnum}|{record.flags:04o}|0|0|"
+            f"{record.filesize}|{fn_times['atime'].unixtime}|"
+            f"{fn_times['mtime'].unixtime}|{fn_times['ctime'].unixtime}|"
+            f"{fn_times['crtime'].unixtime}\n")
+
+
+def timeline_lines(record: MftRecord) -> str:
+    # Format: Time|Source|Type|User|Host|Short|Desc|Version|Filename|Inode|Notes|Format|Extra
+    fn_times = record.fn_times
+    return (f"{fn_times['crtime'].unixtime}|MFT|CREATE|||||{record.filename}|{record.recordnum}||||\n"
+            f"{fn_times['mtime'].unixtime}|MFT|MODIFY|||||{record.filename}|{record.recordnum}||||\n"
+            f"{fn_times['atime'].unixtime}|MFT|ACCESS|||||{record.filename}|{record.recordnum}||||\n"
+            f"{fn_times['ctime'].unixtime}|MFT|CHANGE|||||{record.filename}|{record.recordnum}||||\n")
+
 class FileWriters:
     @staticmethod
     async def write_csv(records: List[MftRecord], output_file: str) -> None:
@@ -20,59 +85,52 @@ class FileWriters:
             await asyncio.sleep(0)  
 
     @staticmethod
-    async def write_json(records: List[MftRecord], output_file: str) -> None:
-        json_data = [record.__dict__ for record in records]
-        with open(output_file, 'w', encoding='utf-8') as jsonfile:
-            json.dump(json_data, jsonfile, indent=2, default=str)
+    async def write_json(records: List[MftRecord], output_file: str,
+                         filepaths: Optional[List[str]] = None) -> None:
+        writer = JSONStreamWriter(output_file)
+        writer.write_records(records, filepaths)
+        writer.close()
+        await asyncio.sleep(0)
+
+    @staticmethod
+    async def write_jsonl(records: List[MftRecord], output_file: str,
+                          filepaths: Optional[List[str]] = None) -> None:
+        writer = JSONLinesStreamWriter(output_file)
+        writer.write_records(records, filepaths)
+        writer.close()
         await asyncio.sleep(0)
 
     @staticmethod
     async def write_xml(records: List[MftRecord], output_file: str) -> None:
-        root = ET.Element("mft_records")
-        for record in records:
-            record_elem = ET.SubElement(root, "record")
-            for key, value in record.__dict__.items():
-                ET.SubElement(record_elem, key).text = str(value)
-        tree = ET.ElementTree(root)
-        tree.write(output_file, encoding='utf-8', xml_declaration=True)
+        writer = XMLStreamWriter(output_file)
+        writer.write_records(records)
+        writer.close()
         await asyncio.sleep(0)
 
     @staticmethod
     async def write_excel(records: List[MftRecord], output_file: str) -> None:
         try:
-            import openpyxl
+            writer = ExcelStreamWriter(output_file)
         except ImportError:
             logging.error("openpyxl is not installed. Please install it to use Excel export.")
             return
 
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.append(CSV_HEADER) 
-        for record in records:
-            ws.append(record.to_csv())
-        wb.save(output_file)
+        writer.write_records(records)
+        writer.close()
         await asyncio.sleep(0)
 
     @staticmethod
     async def write_body(records: List[MftRecord], output_file: str) -> None:
         with open(output_file, 'w', encoding='utf-8') as bodyfile:
             for record in records:
-                # Format: MD5|name|inode|mode_as_string|UID|GID|size|atime|mtime|ctime|crtime
-                bodyfile.write(f"0|{record.filename}|{record.recordnum}|{record.flags:04o}|0|0|"
-                               f"{record.filesize}|{record.fn_times['atime'].unixtime}|"
-                               f"{record.fn_times['mtime'].unixtime}|{record.fn_times['ctime'].unixtime}|"
-                               f"{record.fn_times['crtime'].unixtime}\n")
+                bodyfile.write(body_line(record))
             await asyncio.sleep(0)
 
     @staticmethod
     async def write_timeline(records: List[MftRecord], output_file: str) -> None:
         with open(output_file, 'w', encoding='utf-8') as timeline:
             for record in records:
-                # Format: Time|Source|Type|User|Host|Short|Desc|Version|Filename|Inode|Notes|Format|Extra
-                timeline.write(f"{record.fn_times['crtime'].unixtime}|MFT|CREATE|||||{record.filename}|{record.recordnum}||||\n")
-                timeline.write(f"{record.fn_times['mtime'].unixtime}|MFT|MODIFY|||||{record.filename}|{record.recordnum}||||\n")
-                timeline.write(f"{record.fn_times['atime'].unixtime}|MFT|ACCESS|||||{record.filename}|{record.recordnum}||||\n")
-                timeline.write(f"{record.fn_times['ctime'].unixtime}|MFT|CHANGE|||||{record.filename}|{record.recordnum}||||\n")
+                timeline.write(timeline_lines(record))
             await asyncio.sleep(0)
 
     @staticmethod
@@ -121,6 +179,7 @@ class FileWriters:
 
         # Insert MFT records
         for record in records:
+            fn_times = record.fn_times
             cursor.execute('''
                 INSERT INTO mft_records (
                     record_number, filename, parent_record_number, file_size,
@@ -133,10 +192,10 @@ class FileWriters:
                 record.get_parent_record_num(),
                 record.filesize,
                 1 if record.flags & FILE_RECORD_IS_DIRECTORY else 0,
-                record.fn_times['crtime'].dtstr,
-                record.fn_times['mtime'].dtstr,
-                record.fn_times['atime'].dtstr,
-                record.fn_times['ctime'].dtstr,
+                fn_times['crtime'].dtstr,
+                fn_times['mtime'].dtstr,
+                fn_times['atime'].dtstr,
+                fn_times['ctime'].dtstr,
                 ','.join(map(str, record.attribute_types))
             ))
 
@@ -148,10 +207,235 @@ class FileWriters:
     async def write_tsk(records: List[MftRecord], output_file: str) -> None:
         with open(output_file, 'w', newline='', encoding='utf-8') as tskfile:
             for record in records:
-                # TSK body file format:
-                # MD5|name|inode|mode_as_string|UID|GID|size|atime|mtime|ctime|crtime
-                tskfile.write(f"0|{record.filename}|{record.recordnum}|{record.flags:04o}|0|0|"
-                              f"{record.filesize}|{record.fn_times['atime'].unixtime}|"
-                              f"{record.fn_times['mtime'].unixtime}|{record.fn_times['ctime'].unixtime}|"
-                              f"{record.fn_times['crtime'].unixtime}\n")
-            await asyncio.sleep(0)
\ No newline at end of file
+                # TSK body file format is the same as the mactime body format
+                tskfile.write(body_line(record))
+            await asyncio.sleep(0)
+
+
+class StreamWriter(ABC):
+    """
+    Base class for exporters that are fed one chunk of records at a time.
+
+    Nothing but the current chunk is held in memory. The output file is opened
+    on the first write and completed by close(), so an empty run still leaves a
+    well-formed file.
+    """
+    newline: Optional[str] = None
+
+    def __init__(self, output_file: str):
+        self.output_file = output_file
+        self.file = None
+        self.records_written = 0
+        self.write_time = 0.0
+        self.closed = False
+
+    def open(self) -> None:
+        self.file = open(self.output_file, 'w', newline=self.newline, encoding='utf-8')
+        self.write_header()
+
+    def write_header(self) -> None:
+        pass
+
+    def write_footer(self) -> None:
+        pass
+
+    @abstractmethod
+    def write_record(self, record: MftRecord, filepath: str) -> None:
+        """Write one record with its resolved path."""
+
+    def write_records(self, records: List[MftRecord], filepaths: Optional[List[str]] = None) -> None:
+        """
+        Append one chunk to the output.
+
+        Args:
+            records: Parsed records of the chunk
+            filepaths: Full path of each record, in the same order, if known
+        """
+        start_time = time.time()
+        if self.file is None:
+            self.open()
+        for record, filepath in zip(records, repeat(None) if filepaths is None else filepaths):
+            self.write_record(record, filepath)
+            self.records_written += 1
+        self.flush()
+        self.write_time += time.time() - start_time
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        start_time = time.time()
+        if self.file is None:
+            self.open()
+        self.write_footer()
+        self.file.close()
+        self.closed = True
+        self.write_time += time.time() - start_time
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Records written, seconds spent writing them and, once closed, the output size."""
+        stats = {'records': self.records_written, 'write_time': self.write_time}
+        if self.closed and os.path.exists(self.output_file):
+            stats['bytes'] = os.path.getsize(self.output_file)
+        return stats
+
+
+class JSONStreamWriter(StreamWriter):
+    """JSON array laid out as json.dump(..., indent=2) would, with filepath last when the path is known"""
+
+    def write_header(self) -> None:
+        self.file.write("[")
+
+    def write_record(self, record: MftRecord, filepath: Optional[str]) -> None:
+        record_dict = record.to_dict()
+        if filepath is not None:
+            record_dict['filepath'] = filepath
+        separator = ",\n" if self.records_written else "\n"
+        self.file.write(separator + textwrap.indent(json.dumps(record_dict, indent=2, default=str), "  "))
+
+    def write_footer(self) -> None:
+        self.file.write("\n]" if self.records_written else "]")
+
+
+class JSONLinesStreamWriter(StreamWriter):
+    """One compact JSON object per line: the MftRecord.to_dict() fields followed by filepath"""
+
+    def open(self) -> None:
+        self.file = open(self.output_file, 'wb')
+
+    def write_record(self, record: MftRecord, filepath: Optional[str]) -> None:
+        data = record.to_dict()
+        if filepath is not None:
+            data['filepath'] = filepath
+        self.file.write(json_line(data))
+
+
+class XMLStreamWriter(StreamWriter):
+    """
+    <mft_records> document written one <record> element at a time.
+
+    Each record has the MftRecord.to_dict() fields in their fixed order, followed
+    by filepath when the path is known.
+    """
+
+    def write_header(self) -> None:
+        self.file.write("<?xml version='1.0' encoding='utf-8'?>\n<mft_records>\n")
+
+    def write_record(self, record: MftRecord, filepath: Optional[str]) -> None:
+        fields = record.to_dict()
+        if filepath is not None:
+            fields['filepath'] = filepath
+        self.file.write(xml_element("record", fields) + "\n")
+
+    def write_footer(self) -> None:
+        self.file.write("</mft_records>\n")
+
+
+class ExcelStreamWriter(StreamWriter):
+    """
+    Rows appended to an openpyxl write-only workbook, which keeps no cell objects.
+
+    A worksheet holds at most max_rows rows including its header. The next
+    record starts a new sheet, so volumes past Excel's row limit are split over
+    "MFT", "MFT (2)", ... instead of producing a workbook Excel refuses to open.
+    Characters that are not allowed in cells are dropped.
+    """
+    max_rows = EXCEL_MAX_ROWS
+
+    def __init__(self, output_file: str):
+        import openpyxl
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+        super().__init__(output_file)
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.illegal_characters = ILLEGAL_CHARACTERS_RE
+        self.sheets = 0
+        self.sheet_rows = 0
+
+    def open(self) -> None:
+        self.add_sheet()
+
+    def add_sheet(self) -> None:
+        self.sheets += 1
+        title = "MFT" if self.sheets == 1 else f"MFT ({self.sheets})"
+        self.file = self.workbook.create_sheet(title)
+        self.file.append(CSV_HEADER)
+        self.sheet_rows = 1
+
+    def write_record(self, record: MftRecord, filepath: Optional[str]) -> None:
+        if self.sheet_rows >= self.max_rows:
+            self.add_sheet()
+        row = record.to_csv()
+        if filepath is not None:
+            row[FILEPATH_COLUMN] = filepath
+        sub = self.illegal_characters.sub
+        self.file.append([sub('', value) if isinstance(value, str) else value for value in row])
+        self.sheet_rows += 1
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        start_time = time.time()
+        if self.file is None:
+            self.open()
+        self.workbook.save(self.output_file)
+        self.closed = True
+        self.write_time += time.time() - start_time
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats['sheets'] = self.sheets
+        return stats
+
+
+class BodyStreamWriter(StreamWriter):
+    def write_record(self, record: MftRecord, filepath: str) -> None:
+        self.file.write(body_line(record))
+
+
+class TSKStreamWriter(BodyStreamWriter):
+    newline = ''
+
+
+class TimelineStreamWriter(StreamWriter):
+    def write_record(self, record: MftRecord, filepath: str) -> None:
+        self.file.write(timeline_lines(record))
+
+
+STREAM_WRITERS = {
+    'json': JSONStreamWriter,
+    'jsonl': JSONLinesStreamWriter,
+    'xml': XMLStreamWriter,
+    'excel': ExcelStreamWriter,
+    'body': BodyStreamWriter,
+    'tsk': TSKStreamWriter,
+    'timeline': TimelineStreamWriter,
+}
+
+
+def create_stream_writer(export_format: str, output_file: str) -> Optional[StreamWriter]:
+    """
+    Create the chunk-at-a-time writer for an export format.
+
+    CSV and SQLite are already written per chunk by MftAnalyzer and have no
+    entry here.
+
+    Args:
+        export_format: Export format name
+        output_file: Path of the output file
+
+    Returns:
+        The writer, or None if the format has none or its library is not installed
+    """
+    writer_class = STREAM_WRITERS.get(export_format)
+    if writer_class is None:
+        return None
+    try:
+        return writer_class(output_file)
+    except ImportError:
+        logging.error("openpyxl is not installed. Please install it to use Excel export.")
+        return None
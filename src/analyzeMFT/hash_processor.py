@@ -9,77 +9,279 @@ from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import List, Dict, Tuple, Optional, Any
 import logging
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from .constants import HASH_ALGORITHMS, HASH_DIGEST_SIZES
+from .validators import validate_hash_algorithms
+
+try:
+    from multiprocessing import shared_memory
+    HAS_SHARED_MEMORY = True
+except ImportError:
+    HAS_SHARED_MEMORY = False
+
+# Digest slot size per record in the shared result buffer when every algorithm
+# is selected: MD5 (16) + SHA256 (32) + SHA512 (64) + CRC32 (4, big-endian)
+DIGEST_SIZE = sum(HASH_DIGEST_SIZES.values())
+
+DIGEST_FUNCTIONS = {
+    'md5': lambda data: hashlib.md5(data).digest(),
+    'sha256': lambda data: hashlib.sha256(data).digest(),
+    'sha512': lambda data: hashlib.sha512(data).digest(),
+    'crc32': lambda data: (zlib.crc32(data) & 0xFFFFFFFF).to_bytes(4, 'big'),
+}
 
 
 @dataclass
 class HashResult:
-    """Result container for hash computation"""
+    """Result container for hash computation. Digests are raw bytes, None when not selected."""
     record_index: int
-    md5: str
-    sha256: str
-    sha512: str
-    crc32: str
+    md5: Optional[bytes]
+    sha256: Optional[bytes]
+    sha512: Optional[bytes]
+    crc32: Optional[bytes]
     processing_time: float
 
 
-def compute_hashes_for_record(data: Tuple[int, bytes]) -> HashResult:
+def compute_digests(raw_record: bytes, algorithms: Tuple[str, ...] = HASH_ALGORITHMS) -> Tuple[Optional[bytes], ...]:
+    """
+    Compute the selected digests of a record.
+
+    Args:
+        raw_record: Raw record bytes or memoryview
+        algorithms: Names of the algorithms to compute
+
+    Returns:
+        Tuple of (md5, sha256, sha512, crc32) raw digests, None for algorithms not selected
     """
-    Compute all hashes for a single MFT record.
+    return tuple(DIGEST_FUNCTIONS[name](raw_record) if name in algorithms else None
+                 for name in HASH_ALGORITHMS)
+
+
+def digest_layout(algorithms: Tuple[str, ...]) -> Tuple[List[Tuple[str, int, int]], int]:
+    """
+    Return the (name, start, end) slots of the selected digests within one
+    record's result slot, and the slot size.
+    """
+    layout = []
+    position = 0
+    for name in HASH_ALGORITHMS:
+        if name in algorithms:
+            layout.append((name, position, position + HASH_DIGEST_SIZES[name]))
+            position += HASH_DIGEST_SIZES[name]
+    return layout, position
+
+
+def compute_hashes_for_record(data: Tuple[int, bytes], algorithms: Tuple[str, ...] = HASH_ALGORITHMS) -> HashResult:
+    """
+    Compute the selected hashes for a single MFT record.
     
     Args:
         data: Tuple of (record_index, raw_record_bytes)
+        algorithms: Names of the algorithms to compute
         
     Returns:
-        HashResult containing all computed hashes
+        HashResult containing the computed digests
     """
     record_index, raw_record = data
-    start_time = time.time()    md5 = hashlib.md5()
-    sha256 = hashlib.sha256()
-    sha512 = hashlib.sha512()
-    
-    md5.update(raw_record)
-    sha256.update(raw_record)
-    sha512.update(raw_record)
-    
-    md5_hash = md5.hexdigest()
-    sha256_hash = sha256.hexdigest()
-    sha512_hash = sha512.hexdigest()
-    crc32_hash = format(zlib.crc32(raw_record) & 0xFFFFFFFF, '08x')
-    
+    start_time = time.time()
+    md5, sha256, sha512, crc32 = compute_digests(raw_record, algorithms)
     processing_time = time.time() - start_time
     
     return HashResult(
         record_index=record_index,
-        md5=md5_hash,
-        sha256=sha256_hash,
-        sha512=sha512_hash,
-        crc32=crc32_hash,
+        md5=md5,
+        sha256=sha256,
+        sha512=sha512,
+        crc32=crc32,
         processing_time=processing_time
     )
 
 
+def _attach_shared_memory(name: str) -> 'shared_memory.SharedMemory':
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _hash_into(data: memoryview, out: memoryview, first: int, count: int, algorithms: Tuple[str, ...]) -> None:
+    layout, slot_size = digest_layout(algorithms)
+    functions = [(DIGEST_FUNCTIONS[name], start, end) for name, start, end in layout]
+    offsets = data[:(first + count + 1) * 8].cast('Q')
+    for i in range(first, first + count):
+        record = data[offsets[i]:offsets[i + 1]]
+        position = i * slot_size
+        for function, start, end in functions:
+            out[position + start:position + end] = function(record)
+        record.release()
+    offsets.release()
+
+
+def compute_hashes_shared(task: Tuple[str, str, int, int, Tuple[str, ...]]) -> Tuple[int, int, float]:
+    """
+    Hash a range of records held in shared memory. Runs in a worker process.
+
+    The input block starts with (count + 1) uint64 offsets followed by the
+    concatenated records; the selected digests are written to the output block
+    in the slot layout given by digest_layout().
+
+    Args:
+        task: Tuple of (input block name, output block name, first index, count, algorithms)
+
+    Returns:
+        Tuple of (first index, count, processing time)
+    """
+    input_name, output_name, first, count, algorithms = task
+    start_time = time.time()
+    input_block = _attach_shared_memory(input_name)
+    output_block = _attach_shared_memory(output_name)
+    try:
+        _hash_into(input_block.buf, output_block.buf, first, count, algorithms)
+    finally:
+        input_block.close()
+        output_block.close()
+    return first, count, time.time() - start_time
+
+
+def _worker_ready(_: int) -> bool:
+    """No-op task used to bring pool workers up before the first real batch."""
+    return True
+
+
+class HashMemo:
+    """
+    Bounded LRU of digests for repeated record images.
+
+    Entries are keyed by (CRC32, length) and confirmed by comparing the stored
+    record bytes, so a fingerprint collision is treated as a miss.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Args:
+            max_entries: Maximum number of record images kept
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(record: bytes) -> Tuple[int, int]:
+        return zlib.crc32(record), len(record)
+
+    def get(self, key: Tuple[int, int], record: bytes) -> Optional[Tuple[Optional[bytes], ...]]:
+        """Return cached (md5, sha256, sha512, crc32) digests for record, or None."""
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != record:
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Tuple[int, int], record: bytes, digests: Tuple[Optional[bytes], ...]) -> None:
+        self.entries[key] = (bytes(record), digests)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
 class HashProcessor:
     """
-    Multiprocessing-capable hash computation processor for MFT records
+    Multiprocessing-capable hash computation processor for MFT records.
+
+    The worker pool is started lazily and reused across calls until close().
     """
     
-    def __init__(self, num_processes: Optional[int] = None, logger: Optional[logging.Logger] = None):
+    def __init__(self, num_processes: Optional[int] = None, logger: Optional[logging.Logger] = None,
+                 use_shared_memory: bool = True, algorithms: Tuple[str, ...] = HASH_ALGORITHMS,
+                 memo_size: int = 1024):
         """
         Initialize the hash processor.
         
         Args:
             num_processes: Number of processes to use. If None, uses optimal count.
             logger: Logger instance for debugging and progress reporting.
+            use_shared_memory: Pass records and digests to workers through shared
+                memory instead of pickling them, where available.
+            algorithms: Names of the hash algorithms to compute
+            memo_size: Number of distinct record images whose digests are
+                remembered by compute_hashes_adaptive(); 0 disables memoization.
         """
+        self.algorithms = validate_hash_algorithms(algorithms)
+        self.memo = HashMemo(memo_size) if memo_size > 0 else None
         self.num_processes = num_processes or min(mp.cpu_count(), 8)        self.logger = logger or logging.getLogger('analyzeMFT.hash_processor')
         self.stats = {
             'total_records': 0,
             'total_processing_time': 0.0,
             'multiprocessing_overhead': 0.0,
             'average_time_per_record': 0.0,
-            'processes_used': self.num_processes
+            'processes_used': self.num_processes,
+            'pool_startup_time': 0.0,
+            'pool_starts': 0,
+            'transfer': None,
+            'memo_hits': 0,
+            'memo_misses': 0
         }
+        self._executor = None
+        self.use_shared_memory = use_shared_memory and HAS_SHARED_MEMORY
+        self._shared_blocks = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Return the worker pool, starting it on first use."""
+        if self._executor is None:
+            start_time = time.time()
+            if self.use_shared_memory and hasattr(shared_memory, 'resource_tracker'):
+                # Workers must share our resource tracker, or their own trackers
+                # unlink the blocks they attached to when the pool shuts down
+                shared_memory.resource_tracker.ensure_running()
+            self._executor = ProcessPoolExecutor(max_workers=self.num_processes)
+            list(self._executor.map(_worker_ready, range(self.num_processes)))
+            startup_time = time.time() - start_time
+            self.stats['pool_startup_time'] += startup_time
+            self.stats['pool_starts'] += 1
+            self.logger.debug(f"Started hash worker pool with {self.num_processes} processes in {startup_time:.3f}s")
+        return self._executor
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Shut down the worker pool. The processor can still be used afterwards;
+        a new pool is started on the next multiprocessed call.
+
+        Args:
+            wait: Whether to wait for running hash tasks to finish
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+            self.logger.debug("Hash worker pool shut down")
+        for block in self._shared_blocks.values():
+            block.close()
+            block.unlink()
+        self._shared_blocks.clear()
+
+    def _shared_block(self, kind: str, size: int) -> 'shared_memory.SharedMemory':
+        """Return a shared memory block of at least size bytes, reusing it across calls."""
+        block = self._shared_blocks.get(kind)
+        if block is None or block.size < size:
+            if block is not None:
+                block.close()
+                block.unlink()
+                del self._shared_blocks[kind]
+            block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            self._shared_blocks[kind] = block
+        return block
+
+    def __enter__(self) -> 'HashProcessor':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
         
     def compute_hashes_single_threaded(self, raw_records: List[bytes]) -> List[HashResult]:
         """
@@ -95,7 +297,7 @@ class HashProcessor:
         results = []
         
         for i, raw_record in enumerate(raw_records):
-            result = compute_hashes_for_record((i, raw_record))
+            result = compute_hashes_for_record((i, raw_record), self.algorithms)
             results.append(result)
             
         total_time = time.time() - start_time
@@ -114,24 +316,29 @@ class HashProcessor:
         Compute hashes using multiprocessing.
         
         Args:
-            raw_records: List of raw MFT record bytes
+            raw_records: List of raw MFT record bytes or memoryviews. Records are
+                copied once into a shared memory block, or pickled when shared
+                memory is unavailable.
             
         Returns:
             List of HashResult objects in original order
         """
         if len(raw_records) < 10:            return self.compute_hashes_single_threaded(raw_records)
             
-        start_time = time.time()        indexed_records = [(i, record) for i, record in enumerate(raw_records)]
-        
-        results = []
-        with ProcessPoolExecutor(max_workers=self.num_processes) as executor:            mp_start = time.time()
-            future_to_index = {
-                executor.submit(compute_hashes_for_record, data): data[0] 
-                for data in indexed_records
-            }            temp_results = {}
-            for future in as_completed(future_to_index):
-                result = future.result()
-                temp_results[result.record_index] = result            results = [temp_results[i] for i in range(len(raw_records))]
+        start_time = time.time()
+        executor = self._get_executor()
+        mp_start = time.time()
+        results = None
+        if self.use_shared_memory:
+            try:
+                results = self._compute_hashes_shared(executor, raw_records)
+                self.stats['transfer'] = 'shared_memory'
+            except OSError as e:
+                self.logger.warning(f"Shared memory unavailable ({e}), sending records to workers by pickling")
+                self.use_shared_memory = False
+        if results is None:
+            results = self._compute_hashes_pickled(executor, raw_records)
+            self.stats['transfer'] = 'pickle'
             
         mp_overhead = time.time() - mp_start
         total_time = time.time() - start_time
@@ -147,10 +354,68 @@ class HashProcessor:
         self.logger.debug(f"Multiprocessed hash computation: {len(raw_records)} records in {total_time:.3f}s using {self.num_processes} processes")
         return results
         
+    def _compute_hashes_shared(self, executor: ProcessPoolExecutor, raw_records: List[bytes]) -> List[HashResult]:
+        count = len(raw_records)
+        header_size = (count + 1) * 8
+        total_size = header_size + sum(len(record) for record in raw_records)
+        layout, slot_size = digest_layout(self.algorithms)
+        input_block = self._shared_block('input', total_size)
+        output_block = self._shared_block('output', count * slot_size)
+
+        data = input_block.buf
+        offsets = data[:header_size].cast('Q')
+        position = header_size
+        for i, record in enumerate(raw_records):
+            offsets[i] = position
+            end = position + len(record)
+            data[position:end] = record
+            position = end
+        offsets[count] = position
+        offsets.release()
+
+        step = -(-count // self.num_processes)
+        tasks = [(input_block.name, output_block.name, first, min(step, count - first), self.algorithms)
+                 for first in range(0, count, step)]
+        record_times = [0.0] * count
+        for first, n, elapsed in executor.map(compute_hashes_shared, tasks):
+            record_times[first:first + n] = [elapsed / n] * n
+
+        digests = bytes(output_block.buf[:count * slot_size])
+        results = []
+        for i in range(count):
+            position = i * slot_size
+            d = dict.fromkeys(HASH_ALGORITHMS)
+            for name, start, end in layout:
+                d[name] = digests[position + start:position + end]
+            results.append(HashResult(
+                record_index=i,
+                md5=d['md5'],
+                sha256=d['sha256'],
+                sha512=d['sha512'],
+                crc32=d['crc32'],
+                processing_time=record_times[i]
+            ))
+        return results
+
+    def _compute_hashes_pickled(self, executor: ProcessPoolExecutor, raw_records: List[bytes]) -> List[HashResult]:
+        indexed_records = [(i, bytes(record)) for i, record in enumerate(raw_records)]
+        future_to_index = {
+            executor.submit(compute_hashes_for_record, data, self.algorithms): data[0] 
+            for data in indexed_records
+        }
+        temp_results = {}
+        for future in as_completed(future_to_index):
+            result = future.result()
+            temp_results[result.record_index] = result
+        return [temp_results[i] for i in range(len(raw_records))]
+
     def compute_hashes_adaptive(self, raw_records: List[bytes]) -> List[HashResult]:
         """
         Adaptively choose between single-threaded and multiprocessed computation
         based on the size of the batch and available resources.
+
+        Record images seen before, in this batch or in recent ones, are answered
+        from the memo and only distinct new images are hashed.
         
         Args:
             raw_records: List of raw MFT record bytes
@@ -158,6 +423,47 @@ class HashProcessor:
         Returns:
             List of HashResult objects
         """
+        if not raw_records:
+            return []
+        if self.memo is None:
+            return self._compute_hashes_adaptive(raw_records)
+
+        results = [None] * len(raw_records)
+        misses = []
+        miss_keys = []
+        miss_slots = []
+        batch = {}
+        for i, record in enumerate(raw_records):
+            key = self.memo.key(record)
+            digests = self.memo.get(key, record)
+            if digests is None:
+                for position in batch.get(key, ()):
+                    if misses[position] == record:
+                        miss_slots[position].append(i)
+                        break
+                else:
+                    batch.setdefault(key, []).append(len(misses))
+                    misses.append(record)
+                    miss_keys.append(key)
+                    miss_slots.append([i])
+                    continue
+            else:
+                results[i] = HashResult(i, *digests, processing_time=0.0)
+            self.memo.hits += 1
+        self.memo.misses += len(misses)
+
+        for result, key, record, slots in zip(self._compute_hashes_adaptive(misses), miss_keys, misses, miss_slots):
+            digests = (result.md5, result.sha256, result.sha512, result.crc32)
+            self.memo.put(key, record, digests)
+            results[slots[0]] = HashResult(slots[0], *digests, processing_time=result.processing_time)
+            for i in slots[1:]:
+                results[i] = HashResult(i, *digests, processing_time=0.0)
+
+        self.stats['memo_hits'] = self.memo.hits
+        self.stats['memo_misses'] = self.memo.misses
+        return results
+
+    def _compute_hashes_adaptive(self, raw_records: List[bytes]) -> List[HashResult]:
         if not raw_records:
             return []        mp_threshold = 50        cpu_count = mp.cpu_count()        use_multiprocessing = (
             len(raw_records) >= mp_threshold and
@@ -194,6 +500,12 @@ class HashProcessor:
         self.logger.info(f"  Records/second: {records_per_second:.1f}")
         self.logger.info(f"  Average time per record: {avg_time_ms:.2f}ms")
         self.logger.info(f"  Processes used: {self.stats['processes_used']}")
+        self.logger.info(f"  Algorithms: {', '.join(self.algorithms)}")
+        if self.stats['pool_starts']:
+            self.logger.info(f"  Pool startup time: {self.stats['pool_startup_time']:.3f}s")
+        if self.memo is not None:
+            self.logger.info(f"  Memo hit rate: {self.memo.hit_rate * 100:.1f}% "
+                             f"({self.memo.hits} of {self.memo.hits + self.memo.misses} records)")
         
         if self.stats['processes_used'] > 1:
             efficiency = (self.stats['total_processing_time'] - self.stats['multiprocessing_overhead']) / self.stats['total_processing_time'] * 100
@@ -237,7 +549,9 @@ def benchmark_hash_methods(raw_records: List[bytes], logger: Optional[logging.Lo
     time_st = time.time() - start_st    processor_mp = HashProcessor(logger=logger)
     start_mp = time.time()
     results_mp = processor_mp.compute_hashes_multiprocessed(raw_records)
-    time_mp = time.time() - start_mp    verification_passed = True
+    time_mp = time.time() - start_mp
+    pool_startup_time = processor_mp.stats['pool_startup_time']
+    processor_mp.close()    verification_passed = True
     if len(results_st) == len(results_mp):
         for i, (st_result, mp_result) in enumerate(zip(results_st, results_mp)):
             if (st_result.md5 != mp_result.md5 or 
@@ -260,6 +574,7 @@ def benchmark_hash_methods(raw_records: List[bytes], logger: Optional[logging.Lo
         'speedup_factor': speedup,
         'efficiency_percent': efficiency,
         'processes_used': processor_mp.num_processes,
+        'pool_startup_time': pool_startup_time,
         'verification_passed': verification_passed,
         'recommended_method': 'multiprocessing' if speedup > 1.2 else 'single_threaded'
     }
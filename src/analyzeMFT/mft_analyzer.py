@@ -7,19 +7,59 @@ import signal
 import sqlite3
 import sys
 import traceback
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
 from typing import Dict, Set, List, Optional, Any
 from .constants import *
-from .mft_record import MftRecord
-from .file_writers import FileWriters
+from .mft_record import MftRecord, attribute_projection
+from .file_writers import FileWriters, create_stream_writer, CHUNKED_FORMATS
 from .config import AnalysisProfile
-from .sqlite_writer import SQLiteWriter
-from .hash_processor import HashProcessor
+from .sqlite_writer import (BackgroundSQLiteWriter, BULK_LOAD_CACHE_KIB, DEFAULT_QUEUE_BATCHES, MIN_CACHE_KIB,
+                            ROW_MEMORY_ESTIMATE)
+from .hash_processor import HashProcessor, DIGEST_SIZE
+from .mft_reader import MftReader
+from .parallel_parser import ParallelParser
+from .validators import validate_hash_algorithms
+from .cardinality import create_counter, DEFAULT_PRECISION
+from .path_resolver import PathResolver, PATH_CACHE_SIZE
+from .path_index import PathIndex
+from .record_store import RecordStore
+
+
+def resident_memory() -> Optional[int]:
+    """
+    Return the resident memory of this process in bytes, or None where it cannot be read.
+
+    Reads the current size from /proc on Linux. Elsewhere the peak from getrusage is
+    used, which is never below the current size.
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if HAS_RESOURCE:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes, except on macOS where it is in bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    return None
+
 
 class MftAnalyzer:
     def __init__(self, mft_file: str, output_file: str, debug: int = 0, verbosity: int = 0, 
                  compute_hashes: bool = False, export_format: str = "csv", 
                  profile: Optional[AnalysisProfile] = None, chunk_size: int = 1000,
-                 multiprocessing_hashes: bool = True, hash_processes: Optional[int] = None) -> None:
+                 multiprocessing_hashes: bool = True, hash_processes: Optional[int] = None,
+                 retain_raw_records: bool = False, io_mode: str = "auto",
+                 parallel_workers: Optional[int] = None,
+                 hash_algorithms: Optional[List[str]] = None, unique_counter: str = "auto",
+                 hll_precision: int = DEFAULT_PRECISION, path_index: bool = True,
+                 streaming: bool = False, max_memory: Optional[int] = None,
+                 max_records_in_memory: Optional[int] = None, spill_dir: Optional[str] = None,
+                 full_text_index: bool = False, compact_paths: bool = False) -> None:
         self.mft_file = mft_file
         self.output_file = output_file
         self.debug = debug
@@ -28,7 +68,19 @@ class MftAnalyzer:
         self.export_format = export_format
         self.profile = profile
         self.chunk_size = chunk_size        self.multiprocessing_hashes = multiprocessing_hashes
-        self.hash_processes = hash_processes        if profile:            if not export_format or export_format == "csv":
+        self.hash_processes = hash_processes
+        self.retain_raw_records = retain_raw_records
+        self.io_mode = io_mode
+        self.parallel_workers = parallel_workers
+        self.hash_algorithms = hash_algorithms
+        self.use_path_index = path_index
+        self.full_text_index = full_text_index
+        self.compact_paths = compact_paths
+        self.max_memory = max_memory
+        self.streaming = streaming or max_memory is not None
+        if self.max_memory and io_mode == "auto":
+            # Mapped pages of the MFT count towards resident memory; buffered reads keep it to one chunk
+            self.io_mode = "buffered"        if profile:            if not export_format or export_format == "csv":
                 self.export_format = profile.export_format
             if not compute_hashes:
                 self.compute_hashes = profile.compute_hashes
@@ -37,16 +89,41 @@ class MftAnalyzer:
             if debug == 0:
                 self.debug = profile.debug            if hasattr(profile, 'chunk_size') and chunk_size == 1000:
                 self.chunk_size = profile.chunk_size
+            if hash_algorithms is None and getattr(profile, 'hash_algorithms', None):
+                self.hash_algorithms = profile.hash_algorithms
+
+        self.hash_algorithms = validate_hash_algorithms(self.hash_algorithms or HASH_ALGORITHMS)
+
+        self.attribute_projection = attribute_projection(
+            self.export_format, profile.custom_fields if profile else None
+        )
+        # Only the SQLite export has a table for individual attributes
+        self.attribute_headers = self.export_format == "sqlite"
         
         self.csvfile = None
         self.csv_writer = None
         self.sqlite_writer = None
+        self.aborted = False
+        self.stream_writer = None
         self.hash_processor = None
         self.interrupt_flag = asyncio.Event()
         self.setup_logging()
         self.setup_interrupt_handler()
+
+        if self.retain_raw_records and self.parallel_workers and self.parallel_workers > 1:
+            # Workers send parsed fields only, so there are no raw bytes to keep
+            self.logger.warning("--retain-raw-records is ignored with --parallel-workers")
+            self.retain_raw_records = False
         
-        self.mft_records = {}
+        if max_records_in_memory and not self.streaming:
+            self.mft_records = RecordStore(max_records_in_memory, spill_dir, self.logger)
+        else:
+            self.mft_records = {}
+        self.path_index = None
+        self.path_cache_size = PATH_CACHE_SIZE
+        self.sqlite_cache_kib = BULK_LOAD_CACHE_KIB
+        self.sqlite_queue_batches = DEFAULT_QUEUE_BATCHES
+        self.path_resolver = PathResolver(lambda recordnum: self.mft_records.get(recordnum))
         self.current_chunk = []        self.chunk_count = 0
         self.stats = {
             'total_records': 0,
@@ -55,14 +132,13 @@ class MftAnalyzer:
             'files': 0,
             'bytes_processed': 0,
             'chunks_processed': 0,
+            'parse_errors': 0,
         }
         if self.compute_hashes:
-            self.stats.update({
-                'unique_md5': set(),
-                'unique_sha256': set(),
-                'unique_sha512': set(),
-                'unique_crc32': set(),
-            })
+            self.stats.update({f'unique_{name}': create_counter(unique_counter, hll_precision)
+                               for name in self.hash_algorithms})
+            if self.max_memory and unique_counter == "exact":
+                self.logger.warning("Exact unique hash counting grows with the volume and is not covered by --max-memory")
 
     def setup_logging(self) -> None:
         """Get logger and configure level based on verbosity and debug levels."""        self.logger = logging.getLogger('analyzeMFT')        if not self.logger.handlers:            logging.basicConfig(
@@ -112,25 +188,46 @@ class MftAnalyzer:
         try:
             self.logger.warning("Starting MFT analysis...")            if self.export_format == "csv":
                 self.initialize_csv_writer()
+            elif self.streaming or self.export_format in CHUNKED_FORMATS:
+                self.stream_writer = create_stream_writer(self.export_format, self.output_file)
             await self.process_mft()
+            if self.hash_processor:
+                self.hash_processor.log_performance_summary()
+            self.close_hash_processor()
             await self.write_output()
         except Exception as e:
+            if self.aborted:
+                raise
             self.logger.error(f"An unexpected error occurred: {e}")
             if self.debug:
                 self.logger.debug("Full traceback:", exc_info=True)
         finally:
+            self.close_hash_processor()
             if self.csvfile:
-                self.csvfile.close()            if self.interrupt_flag.is_set():
-                self.logger.warning("Analysis interrupted by user.")
-            else:
-                self.logger.warning("Analysis complete.")
-            self.print_statistics()            if self.sqlite_writer:
+                self.csvfile.close()
+            if self.stream_writer:
+                self.stream_writer.close()
+            if self.sqlite_writer:
                 try:
+                    # Waits for the writer thread to drain its queue and build the indexes
                     self.sqlite_writer.close()
                     self.logger.info("Final SQLite database cleanup completed")
                 except Exception as e:
-                    self.logger.warning(f"Error during final SQLite cleanup: {e}")
+                    self.logger.warning(f"Error during final SQLite cleanup: {e}")            if self.interrupt_flag.is_set():
+                self.logger.warning("Analysis interrupted by user.")
+            elif self.aborted:
+                self.logger.error("Analysis aborted.")
+            else:
+                self.logger.warning("Analysis complete.")
+            self.print_statistics()
+            if isinstance(self.mft_records, RecordStore):
+                self.mft_records.close()
+
 
+    def close_hash_processor(self) -> None:
+        """Shut down the hash worker pool; running tasks are not awaited after an interrupt."""
+        if self.hash_processor:
+            self.hash_processor.close(wait=not self.interrupt_flag.is_set())
 
     async def process_mft(self) -> None:
         self.logger.warning(f"Processing MFT file: {self.mft_file}")
@@ -141,22 +238,29 @@ class MftAnalyzer:
             estimated_records = file_size // MFT_RECORD_SIZE
             self.logger.warning(f"MFT file size: {file_size:,} bytes, estimated {estimated_records:,} records")
             
-            with open(self.mft_file, 'rb') as f:
-                while not self.interrupt_flag.is_set():                    chunk = await self.read_chunk(f)
-                    if not chunk:
-                        break
-                    
-                    await self.process_chunk(chunk)                    if self.current_chunk:
-                        await self.write_chunk()
-                        self.current_chunk.clear()
-                        self.chunk_count += 1
-                        self.stats['chunks_processed'] += 1
-                    
-                    if self.interrupt_flag.is_set():
-                        self.logger.warning("Interrupt detected. Stopping processing.")
-                        break
+            if self.max_memory:
+                # Refuse before the first pass if even the estimated index cannot fit
+                requested_chunk_size = self.chunk_size
+                self.apply_memory_budget(estimated_records * PATH_INDEX_RECORD_ESTIMATE, requested_chunk_size)
+
+            if self.use_path_index or self.streaming:
+                self.build_path_index()
+
+            if self.max_memory:
+                self.apply_memory_budget(self.path_index.memory_usage(), requested_chunk_size, index_resident=True)
+            
+            if self.parallel_workers and self.parallel_workers > 1:
+                await self.process_mft_parallel()
+            else:
+                await self.process_mft_sequential()
 
         except Exception as e:
+            if isinstance(e, MemoryError) or (self.streaming and self.path_index is None):
+                # The budget cannot be met, or streaming has no parsed records to resolve
+                # paths from: stop instead of leaving an empty or truncated export
+                self.aborted = True
+                self.logger.error(f"Cannot process MFT file: {e}")
+                raise
             self.logger.error(f"Error reading MFT file: {str(e)}")
             if self.debug >= 1:
                 self.logger.debug("Full traceback:", exc_info=True)
@@ -165,24 +269,135 @@ class MftAnalyzer:
         self.logger.warning(f"Total chunks processed: {self.stats['chunks_processed']}")
         self.logger.warning(f"Total bytes processed: {self.stats['bytes_processed']:,}")
 
-    async def read_chunk(self, file) -> List[bytes]:
-        """Read a chunk of raw MFT records from file."""
-        chunk = []
-        for _ in range(self.chunk_size):
-            if self.interrupt_flag.is_set():
-                break
-            raw_record = file.read(MFT_RECORD_SIZE)
-            if not raw_record or len(raw_record) < MFT_RECORD_SIZE:
-                break
-            chunk.append(raw_record)
-            self.stats['bytes_processed'] += MFT_RECORD_SIZE
-        return chunk
+    def build_path_index(self) -> None:
+        """
+        First pass: index every record's name and parent so paths resolve against
+        the whole MFT, including parents stored after their children.
+        """
+        try:
+            self.path_index = PathIndex.build(self.mft_file, self.chunk_size, self.io_mode, self.logger)
+            self.path_resolver = PathResolver(self.path_index.get, self.path_cache_size)
+        except Exception as e:
+            if self.streaming:
+                # Streaming keeps no parsed records to fall back on
+                raise
+            self.logger.warning(f"Could not build path index ({e}), resolving paths from parsed records")
+
+    def apply_memory_budget(self, index_bytes: int, requested_chunk_size: int, index_resident: bool = False) -> None:
+        """
+        Size the chunk and the directory path cache so that a streaming run stays within --max-memory.
+
+        The measured resident memory of the process is charged first; it covers the
+        interpreter, loaded modules and, once built, the path index. The index still to
+        be built and fixed costs follow. For SQLite export a quarter of what remains goes
+        to the page cache, and the batches queued for the writer thread are charged per
+        record. A quarter of the rest goes to the path cache and the remainder to the
+        records held at once: one chunk, or every shard in flight when parsing in parallel. Per-record sizes are estimates, so check_memory()
+        measures again after every chunk.
+
+        Args:
+            index_bytes: Size of the path index, estimated or measured
+            requested_chunk_size: Chunk size asked for, used as an upper bound
+            index_resident: Whether the index is built and so already part of resident memory
+
+        Raises:
+            MemoryError: If the budget cannot hold the resident memory, the index and a single record
+        """
+        budget = self.max_memory * 1024 * 1024
+        resident = resident_memory()
+        if resident is None:
+            resident = 0
+        elif index_resident:
+            index_bytes = 0
+        per_record = RECORD_MEMORY_ESTIMATE + MFT_RECORD_SIZE
+        if self.retain_raw_records:
+            per_record += MFT_RECORD_SIZE
+        fixed = 0
+        if self.compute_hashes:
+            per_record += MFT_RECORD_SIZE + DIGEST_SIZE
+            if self.multiprocessing_hashes:
+                fixed += 1024 * (MFT_RECORD_SIZE + DIGEST_SIZE)
+        in_flight = 2 * self.parallel_workers + 1 if self.parallel_workers and self.parallel_workers > 1 else 1
+
+        remaining = budget - resident - index_bytes - fixed
+        if self.export_format == "sqlite":
+            self.sqlite_cache_kib = min(BULK_LOAD_CACHE_KIB, max(MIN_CACHE_KIB, remaining // 4 // 1024))
+            remaining -= self.sqlite_cache_kib * 1024
+            # Queued batches plus the one being inserted may take a quarter of the rest at the requested chunk size
+            queued_bytes = requested_chunk_size * ROW_MEMORY_ESTIMATE
+            self.sqlite_queue_batches = min(DEFAULT_QUEUE_BATCHES, max(1, remaining // 4 // queued_bytes - 1))
+            per_record += (self.sqlite_queue_batches + 1) * ROW_MEMORY_ESTIMATE
+            self.logger.info(f"SQLite page cache of {self.sqlite_cache_kib:,} KiB, "
+                             f"{self.sqlite_queue_batches} batches queued")
+        if remaining < per_record * in_flight:
+            raise MemoryError(f"--max-memory of {self.max_memory} MB is too small: the process already uses "
+                              f"{resident / (1024 * 1024):.1f} MB, the path index needs "
+                              f"{index_bytes / (1024 * 1024):.1f} MB more and each record about {per_record:,} bytes")
+
+        self.path_cache_size = min(PATH_CACHE_SIZE, max(1, remaining // 4 // PATH_CACHE_ENTRY_ESTIMATE))
+        self.path_resolver.max_entries = self.path_cache_size
+        chunk_budget = remaining - self.path_cache_size * PATH_CACHE_ENTRY_ESTIMATE
+        self.chunk_size = max(1, min(requested_chunk_size, chunk_budget // (per_record * in_flight)))
+        self.logger.info(f"Memory budget {self.max_memory} MB: {resident:,} bytes resident, path index "
+                         f"{index_bytes:,} bytes to add, {self.path_cache_size:,} cached paths, "
+                         f"chunks of {self.chunk_size:,} records")
+
+    def check_memory(self, parser: Optional[ParallelParser] = None) -> None:
+        """
+        Measure resident memory after a chunk and hold the run to --max-memory.
+
+        When over budget, halve the records held at once: the chunk size, or the shards
+        in flight when parser is given. Once that is down to one the run is stopped.
+
+        Raises:
+            MemoryError: If memory is still over budget with nothing left to shrink
+        """
+        resident = resident_memory()
+        if resident is None or resident <= self.max_memory * 1024 * 1024:
+            return
+        over = f"resident memory of {resident / (1024 * 1024):.1f} MB is over --max-memory {self.max_memory} MB"
+        if parser is not None and parser.max_pending > 1:
+            parser.max_pending //= 2
+            self.logger.warning(f"{over}, keeping {parser.max_pending} shards in flight")
+        elif parser is None and self.chunk_size > 1:
+            self.chunk_size //= 2
+            self.logger.warning(f"{over}, reducing chunks to {self.chunk_size:,} records")
+        else:
+            raise MemoryError(over)
+
+    async def process_mft_sequential(self) -> None:
+        """Read and parse the MFT chunk by chunk in this process."""
+        with MftReader(self.mft_file, self.chunk_size, io_mode=self.io_mode, logger=self.logger) as reader:
+            self.logger.info(f"Reading MFT file in {reader.mode} mode")
+            while not self.interrupt_flag.is_set():
+                chunk = reader.read_chunk()
+                if not chunk:
+                    break
+                self.stats['bytes_processed'] += len(chunk) * MFT_RECORD_SIZE
+                
+                await self.process_chunk(chunk)
+                chunk = None
+
+                if self.current_chunk:
+                    await self.write_chunk()
+                    self.current_chunk.clear()
+                    self.chunk_count += 1
+                    self.stats['chunks_processed'] += 1
+
+                if self.max_memory:
+                    self.check_memory()
+                    reader.chunk_size = self.chunk_size
+                
+                if self.interrupt_flag.is_set():
+                    self.logger.warning("Interrupt detected. Stopping processing.")
+                    break
 
     async def process_chunk(self, raw_records: List[bytes]) -> None:
-        """Process a chunk of raw MFT records."""        if self.compute_hashes and self.multiprocessing_hashes and self.hash_processor is None:
+        """Process a chunk of raw MFT records, given as bytes or memoryview slices."""        if self.compute_hashes and self.multiprocessing_hashes and self.hash_processor is None:
             self.hash_processor = HashProcessor(
                 num_processes=self.hash_processes,
-                logger=self.logger
+                logger=self.logger,
+                algorithms=self.hash_algorithms
             )
             self.logger.info(f"Initialized HashProcessor with {self.hash_processor.num_processes} processes")        hash_results = []
         if self.compute_hashes and self.multiprocessing_hashes and self.hash_processor:
@@ -194,37 +409,95 @@ class MftAnalyzer:
                 break
             
             try:                compute_individual_hashes = self.compute_hashes and not self.multiprocessing_hashes
-                record = MftRecord(raw_record, compute_individual_hashes, self.debug, self.logger)
-                self.stats['total_records'] += 1                if self.compute_hashes and self.multiprocessing_hashes and i < len(hash_results):
+                record = MftRecord(raw_record, compute_individual_hashes, self.debug, self.logger,
+                                   attributes=self.attribute_projection, hash_algorithms=self.hash_algorithms,
+                                   attribute_headers=self.attribute_headers)
+                if self.compute_hashes and self.multiprocessing_hashes and i < len(hash_results):
                     hash_result = hash_results[i]
-                    record.set_hashes(hash_result.md5, hash_result.sha256, hash_result.sha512, hash_result.crc32)                    if 'unique_md5' in self.stats:
-                        self.stats['unique_md5'].add(hash_result.md5)
-                        self.stats['unique_sha256'].add(hash_result.sha256)
-                        self.stats['unique_sha512'].add(hash_result.sha512)
-                        self.stats['unique_crc32'].add(hash_result.crc32)
-                
-                if record.flags & FILE_RECORD_IN_USE:
-                    self.stats['active_records'] += 1
-                if record.flags & FILE_RECORD_IS_DIRECTORY:
-                    self.stats['directories'] += 1
-                else:
-                    self.stats['files'] += 1                self.mft_records[record.recordnum] = record
-                self.current_chunk.append(record)
+                    record.set_hashes(hash_result.md5, hash_result.sha256, hash_result.sha512, hash_result.crc32)
 
-                if self.debug >= 2:
-                    self.logger.info(f"Processed record {self.stats['total_records']}: {record.filename}")
-                elif self.stats['total_records'] % 10000 == 0:
-                    self.logger.warning(f"Processed {self.stats['total_records']} records...")
+                if self.retain_raw_records:
+                    record.raw_record = bytes(raw_record)
+                else:
+                    record.release_raw()
+                
+                self.register_record(record)
 
             except Exception as e:
+                self.stats['parse_errors'] += 1
                 self.logger.warning(f"Error processing record {self.stats['total_records']}: {str(e)}")
                 self.logger.info(f"Raw record (first 100 bytes): {raw_record[:100].hex()}")
                 if self.debug >= 2:
                     self.logger.debug("Full traceback:", exc_info=True)
                 continue
 
-    async def read_record(self, file):
-        return file.read(MFT_RECORD_SIZE)
+    def register_record(self, record: MftRecord) -> None:
+        """Count a parsed record and queue it for output."""
+        self.stats['total_records'] += 1
+        if record.flags & FILE_RECORD_IN_USE:
+            self.stats['active_records'] += 1
+        if record.flags & FILE_RECORD_IS_DIRECTORY:
+            self.stats['directories'] += 1
+        else:
+            self.stats['files'] += 1
+        if self.compute_hashes:
+            for name in self.hash_algorithms:
+                digest = getattr(record, name)
+                if digest is not None:
+                    self.stats[f'unique_{name}'].add(digest)
+        if self.keeps_records():
+            self.mft_records[record.recordnum] = record
+        self.current_chunk.append(record)
+
+        if self.debug >= 2:
+            self.logger.info(f"Processed record {self.stats['total_records']}: {record.filename}")
+        elif self.stats['total_records'] % 10000 == 0:
+            self.logger.warning(f"Processed {self.stats['total_records']} records...")
+
+    def keeps_records(self) -> bool:
+        """Whether parsed records must be kept for write_output or path resolution."""
+        if self.streaming:
+            return False
+        # Paths come from the index, so chunks written by the stream and SQLite writers are final
+        return self.path_index is None or (self.stream_writer is None and self.export_format != "sqlite")
+
+    async def process_mft_parallel(self) -> None:
+        """Parse the MFT in worker processes and merge the shards in record order."""
+        parser = ParallelParser(
+            self.mft_file,
+            num_processes=self.parallel_workers,
+            shard_records=self.chunk_size,
+            compute_hashes=self.compute_hashes,
+            debug_level=self.debug,
+            attributes=self.attribute_projection,
+            attribute_headers=self.attribute_headers,
+            hash_algorithms=self.hash_algorithms,
+            logger=self.logger
+        )
+        self.logger.warning(f"Parsing with {parser.num_processes} worker processes")
+
+        shards = parser.iter_async()
+        try:
+            async for shard in shards:
+                self.stats['bytes_processed'] += shard.bytes_read
+                self.stats['parse_errors'] += shard.errors
+                for record in shard.records(self.logger):
+                    self.register_record(record)
+
+                if self.current_chunk:
+                    await self.write_chunk()
+                    self.current_chunk.clear()
+                    self.chunk_count += 1
+                    self.stats['chunks_processed'] += 1
+
+                if self.max_memory:
+                    self.check_memory(parser)
+
+                if self.interrupt_flag.is_set():
+                    self.logger.warning("Interrupt detected. Stopping processing.")
+                    break
+        finally:
+            await shards.aclose()
 
     def handle_interrupt(self) -> None:
         if sys.platform == "win32":            import win32api
@@ -254,8 +527,8 @@ class MftAnalyzer:
         try:
             if self.export_format == "csv":
                 await self.write_csv_chunk()
-            elif self.export_format == "json":
-                await self.write_json_chunk()
+            elif self.export_format != "sqlite" and (self.streaming or self.stream_writer):
+                await self.write_stream_chunk()
             elif self.export_format == "sqlite":
                 await self.write_sqlite_chunk()
             else:                await self.write_csv_chunk()
@@ -266,6 +539,13 @@ class MftAnalyzer:
             if self.debug:
                 self.logger.debug("Full traceback:", exc_info=True)
 
+    async def write_stream_chunk(self) -> None:
+        """Append the current chunk to the streaming exporter of the output format."""
+        if self.stream_writer is None:
+            return
+        filepaths = [self.build_filepath(record) for record in self.current_chunk]
+        self.stream_writer.write_records(self.current_chunk, filepaths)
+
     async def write_csv_chunk(self) -> None:
         """Write current chunk to CSV format."""
         if self.csv_writer is None:
@@ -290,24 +570,14 @@ class MftAnalyzer:
         if self.csvfile:
             self.csvfile.flush()
 
-    async def write_json_chunk(self) -> None:
-        """Write current chunk to JSON format (streaming)."""        import json
-        
-        chunk_filename = f"{self.output_file}.chunk_{self.chunk_count + 1}.json"
-        with open(chunk_filename, 'w') as f:
-            chunk_data = []
-            for record in self.current_chunk:
-                filepath = self.build_filepath(record)
-                record_dict = record.to_dict()
-                record_dict['filepath'] = filepath
-                chunk_data.append(record_dict)
-            json.dump(chunk_data, f, indent=2)
-
     async def write_sqlite_chunk(self) -> None:
         """Write current chunk to SQLite database."""
         if self.sqlite_writer is None:
-            self.sqlite_writer = SQLiteWriter(self.output_file, self.logger)
-            self.sqlite_writer.connect()
+            self.sqlite_writer = BackgroundSQLiteWriter(self.output_file, self.logger, full_text=self.full_text_index,
+                                                        compact_paths=self.compact_paths,
+                                                        queue_size=self.sqlite_queue_batches,
+                                                        cache_kib=self.sqlite_cache_kib)
+            self.sqlite_writer.start()
         
         try:            filepaths = {}
             for record in self.current_chunk:
@@ -315,8 +585,8 @@ class MftAnalyzer:
                     filepaths[record.recordnum] = self.build_filepath(record)
                 except Exception as e:
                     self.logger.warning(f"Error building filepath for record {record.recordnum}: {e}")
-                    filepaths[record.recordnum] = f"UnknownPath_{record.recordnum}"            self.sqlite_writer.write_records_batch(self.current_chunk, filepaths)
-            self.logger.info(f"Successfully wrote {len(self.current_chunk)} records to SQLite")
+                    filepaths[record.recordnum] = f"UnknownPath_{record.recordnum}"            self.sqlite_writer.submit(self.current_chunk, filepaths)
+            self.logger.info(f"Queued {len(self.current_chunk)} records for SQLite")
             
         except Exception as e:
             self.logger.error(f"Error writing SQLite chunk: {e}")
@@ -380,36 +650,7 @@ class MftAnalyzer:
             raise
 
     def build_filepath(self, record: MftRecord) -> str:
-        path_parts = []
-        current_record = record
-        max_depth = 255
-
-        while current_record and max_depth > 0:
-            if current_record.recordnum == 5:  
-                path_parts.insert(0, "")
-                break
-            elif current_record.filename:
-                path_parts.insert(0, current_record.filename)
-            else:
-                path_parts.insert(0, f"Unknown_{current_record.recordnum}")
-
-            parent_record_num = current_record.get_parent_record_num()
-            
-            if parent_record_num == current_record.recordnum:
-                path_parts.insert(0, "OrphanedFiles")
-                break
-            
-            current_record = self.mft_records.get(parent_record_num)
-            if not current_record:
-                path_parts.insert(0, f"UnknownParent_{parent_record_num}")
-                break
-
-            max_depth -= 1
-
-        if max_depth == 0:
-            path_parts.insert(0, "DeepPath")
-
-        return '\\'.join(path_parts)
+        return self.path_resolver.resolve(record)
 
     def print_statistics(self) -> None:
         self.logger.warning("\nMFT Analysis Statistics:")
@@ -417,31 +658,64 @@ class MftAnalyzer:
         self.logger.warning(f"Active records: {self.stats['active_records']}")
         self.logger.warning(f"Directories: {self.stats['directories']}")
         self.logger.warning(f"Files: {self.stats['files']}")
+        if self.stats['parse_errors']:
+            self.logger.warning(f"Records that failed to parse: {self.stats['parse_errors']}")
+        path_stats = self.path_resolver.get_stats()
+        self.logger.info(f"Path cache: {path_stats['hits']} hits, {path_stats['misses']} misses, "
+                         f"{path_stats['cycles']} cyclic parent chains")
+        if isinstance(self.mft_records, RecordStore):
+            store_stats = self.mft_records.get_stats()
+            self.logger.info(f"Record store: {store_stats['spilled']:,} records spilled to disk in "
+                             f"{store_stats['spill_batches']} batches, {store_stats['disk_reads']:,} read back")
+        if self.sqlite_writer:
+            sqlite_stats = self.sqlite_writer.get_stats()
+            self.logger.info(f"SQLite writer: {sqlite_stats['rows']:,} records and {sqlite_stats['attribute_rows']:,} "
+                             f"attributes in {sqlite_stats['commits']} commits, "
+                             f"commit latency {sqlite_stats['avg_commit_latency']:.3f}s avg / "
+                             f"{sqlite_stats['max_commit_latency']:.3f}s max, queue depth {sqlite_stats['queue_depth']} "
+                             f"(max {sqlite_stats['max_queue_depth']}), parsing blocked {sqlite_stats['blocked_time']:.2f}s")
         if self.compute_hashes:
-            self.logger.warning(f"Unique MD5 hashes: {len(self.stats['unique_md5'])}")
-            self.logger.warning(f"Unique SHA256 hashes: {len(self.stats['unique_sha256'])}")
-            self.logger.warning(f"Unique SHA512 hashes: {len(self.stats['unique_sha512'])}")
-            self.logger.warning(f"Unique CRC32 hashes: {len(self.stats['unique_crc32'])}")
+            for name in self.hash_algorithms:
+                counter = self.stats[f'unique_{name}']
+                estimated = "" if getattr(counter, 'exact', True) else " (estimated)"
+                self.logger.warning(f"Unique {name.upper()} hashes: {len(counter)}{estimated}")
+        if self.stream_writer:
+            export_stats = self.stream_writer.get_stats()
+            sheets = f" on {export_stats['sheets']} sheets" if export_stats.get('sheets', 1) > 1 else ""
+            self.logger.info(f"Exported {export_stats['records']:,} records{sheets} in {export_stats['write_time']:.2f}s"
+                             + (f", {export_stats['bytes']:,} bytes" if 'bytes' in export_stats else ""))
+        if (self.streaming or self.stream_writer) and HAS_RESOURCE:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # ru_maxrss is in kilobytes, except on macOS where it is in bytes
+            peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+            self.logger.info(f"Peak resident memory: {peak_mb:.1f} MB")
 
 
     async def write_output(self) -> None:
         self.logger.warning(f"Writing output in {self.export_format} format to {self.output_file}")
-        if self.export_format == "csv":
+        if self.streaming or self.stream_writer:
+            # Every chunk has already been written; only the closing markup is left
+            if self.stream_writer:
+                self.stream_writer.close()
+        elif self.export_format == "csv":
             await self.write_remaining_records()
         elif self.export_format == "sqlite":
-            await self.write_remaining_sqlite_records()
+            # Paths resolved against the index are final when a chunk is written, so the
+            # chunks already hold every record; without it, rewrite them with late parents
+            if self.path_index is None:
+                await self.write_remaining_sqlite_records()
         elif self.export_format == "json":
-            await FileWriters.write_json(list(self.mft_records.values()), self.output_file)
+            await FileWriters.write_json(self.mft_records.values(), self.output_file)
         elif self.export_format == "xml":
-            await FileWriters.write_xml(list(self.mft_records.values()), self.output_file)
+            await FileWriters.write_xml(self.mft_records.values(), self.output_file)
         elif self.export_format == "excel":
-            await FileWriters.write_excel(list(self.mft_records.values()), self.output_file)
+            await FileWriters.write_excel(self.mft_records.values(), self.output_file)
         elif self.export_format == "tsk":
-            await FileWriters.write_tsk(list(self.mft_records.values()), self.output_file)
+            await FileWriters.write_tsk(self.mft_records.values(), self.output_file)
         elif self.export_format == "body":
-            await FileWriters.write_body(list(self.mft_records.values()), self.output_file)
+            await FileWriters.write_body(self.mft_records.values(), self.output_file)
         elif self.export_format == "timeline":
-            await FileWriters.write_timeline(list(self.mft_records.values()), self.output_file)
+            await FileWriters.write_timeline(self.mft_records.values(), self.output_file)
         else:
             self.logger.error(f"Unsupported export format: {self.export_format}")
 
@@ -0,0 +1,178 @@
+"""
+Record readers for MFT input files
+"""
+
+import io
+import logging
+import mmap
+import time
+from typing import Any, Dict, List, Optional
+from .constants import *
+
+IO_MODES = ('auto', 'mmap', 'buffered')
+
+
+class MftReader:
+    """
+    Read fixed-size MFT records from a file as zero-copy memoryview slices.
+
+    In 'mmap' mode the whole file is mapped read-only and every record is a view
+    into the mapping. In 'buffered' mode each chunk is read with readinto() into a
+    preallocated bytearray that is reused for the next chunk, so record views are
+    only valid until the following read_chunk() call. 'auto' tries mmap first and
+    falls back to buffered reads for inputs that cannot be mapped (pipes, empty or
+    compressed streams).
+    """
+
+    def __init__(self, mft_file: str, chunk_size: int = 1000, record_size: int = MFT_RECORD_SIZE,
+                 io_mode: str = 'auto', logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            mft_file: Path to the MFT file
+            chunk_size: Number of records returned per read_chunk() call
+            record_size: Size of a single MFT record in bytes
+            io_mode: One of 'auto', 'mmap' or 'buffered'
+            logger: Logger instance for debugging output
+        """
+        if io_mode not in IO_MODES:
+            raise ValueError(f"Unsupported I/O mode: {io_mode}. Use one of {', '.join(IO_MODES)}")
+
+        self.mft_file = mft_file
+        self.chunk_size = chunk_size
+        self.record_size = record_size
+        self.io_mode = io_mode
+        self.logger = logger or logging.getLogger('analyzeMFT.mft_reader')
+        self.mode = None
+        self.file = None
+        self.mmap = None
+        self.view = None
+        self.buffer = None
+        self.position = 0
+
+    def open(self) -> 'MftReader':
+        self.file = open(self.mft_file, 'rb')
+        if self.io_mode in ('auto', 'mmap'):
+            try:
+                self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+                if hasattr(self.mmap, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    self.mmap.madvise(mmap.MADV_SEQUENTIAL)
+                self.view = memoryview(self.mmap)
+                self.mode = 'mmap'
+            except (ValueError, OSError, io.UnsupportedOperation) as e:
+                if self.io_mode == 'mmap':
+                    self.close()
+                    raise
+                self.logger.info(f"Memory mapping not possible for {self.mft_file} ({e}), using buffered reads")
+
+        if self.mode is None:
+            self.buffer = bytearray(self.chunk_size * self.record_size)
+            self.view = memoryview(self.buffer)
+            self.mode = 'buffered'
+
+        self.logger.debug(f"Reading {self.mft_file} in {self.mode} mode")
+        return self
+
+    def read_chunk(self) -> List[memoryview]:
+        """
+        Return the next chunk of complete records as memoryview slices.
+
+        Returns:
+            List of record views; empty at end of file
+        """
+        size = self.record_size
+        if self.mode == 'mmap':
+            end = min(self.position + self.chunk_size * size, len(self.view) - len(self.view) % size)
+            records = [self.view[offset:offset + size] for offset in range(self.position, end, size)]
+            self.position += len(records) * size
+            return records
+
+        # The chunk size may shrink between calls; the buffer keeps its first size
+        limit = min(len(self.buffer), self.chunk_size * size)
+        filled = 0
+        while filled < limit:
+            n = self.file.readinto(self.view[filled:limit])
+            if not n:
+                break
+            filled += n
+        self.position += filled
+        return [self.view[offset:offset + size] for offset in range(0, filled - filled % size, size)]
+
+    def close(self) -> None:
+        if self.view is not None:
+            try:
+                self.view.release()
+            except BufferError:
+                self.logger.debug("Record views still referenced, leaving buffer to the garbage collector")
+            self.view = None
+        if self.mmap is not None:
+            try:
+                self.mmap.close()
+            except BufferError:
+                self.logger.debug("Memory map still referenced, leaving it to the garbage collector")
+            self.mmap = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.buffer = None
+
+    def __enter__(self) -> 'MftReader':
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __iter__(self):
+        while True:
+            chunk = self.read_chunk()
+            if not chunk:
+                break
+            yield chunk
+
+
+def benchmark_readers(mft_file: str, chunk_size: int = 1000,
+                      logger: Optional[logging.Logger] = None) -> Dict[str, Any]:
+    """
+    Compare per-record file.read() against the buffered and mmap readers.
+
+    Args:
+        mft_file: Path to the MFT file to read
+        chunk_size: Number of records per chunk
+        logger: Logger instance
+
+    Returns:
+        Dictionary with timing results per reader
+    """
+    logger = logger or logging.getLogger('analyzeMFT.mft_reader')
+    results = {}
+
+    start_time = time.time()
+    records = 0
+    with open(mft_file, 'rb') as f:
+        while True:
+            raw_record = f.read(MFT_RECORD_SIZE)
+            if len(raw_record) < MFT_RECORD_SIZE:
+                break
+            records += 1
+    results['read'] = {'time': time.time() - start_time, 'records': records}
+
+    for mode in ('buffered', 'mmap'):
+        start_time = time.time()
+        records = 0
+        try:
+            with MftReader(mft_file, chunk_size, io_mode=mode, logger=logger) as reader:
+                for chunk in reader:
+                    records += len(chunk)
+                    del chunk
+        except (ValueError, OSError) as e:
+            logger.warning(f"{mode} reader unavailable: {e}")
+            continue
+        results[mode] = {'time': time.time() - start_time, 'records': records}
+
+    baseline = results['read']['time']
+    for mode, result in results.items():
+        result['speedup'] = baseline / result['time'] if result['time'] > 0 else 0
+        result['records_per_second'] = result['records'] / result['time'] if result['time'] > 0 else 0
+
+    summary = ', '.join(f"{mode}={result['time']:.3f}s" for mode, result in results.items())
+    logger.info(f"Reader benchmark: {summary}")
+    return results
@@ -1,19 +1,154 @@
 import struct
 import uuid
-import hashlib
-import zlib
 import logging
+import traceback
+from array import array
 from .constants import *
 from .windows_time import WindowsTime
+from .hash_processor import compute_digests
 from .validators import validate_attribute_length, ValidationError
 
-from typing import Dict, Set, List, Optional, Any, Union
-
+from typing import Dict, Set, FrozenSet, List, Optional, Any, Tuple, Union
+
+
+MFT_RECORD_HEADER = struct.Struct(STRUCT_MFT_RECORD_HEADER)
+# Common attribute header: type, length, non-resident flag, name length, name offset, flags, attribute id
+ATTRIBUTE_HEADER = struct.Struct('<LLBBHHH')
+RESIDENT_CONTENT = struct.Struct('<LH')
+NON_RESIDENT_SIZES = struct.Struct('<QQ')
+FILETIMES = struct.Struct('<4Q')
+
+TIMESTAMP_KEYS = ('crtime', 'mtime', 'ctime', 'atime')
+NO_TIMESTAMPS = (0,) * 8
+
+# Attribute types are multiples of 0x10 up to 0x100, so each one gets bit (type >> 4)
+ATTRIBUTE_MASK_LIMIT = 0x1000
+
+ATTRIBUTE_PARSERS = {
+    STANDARD_INFORMATION_ATTRIBUTE: 'parse_si_attribute',
+    FILE_NAME_ATTRIBUTE: 'parse_fn_attribute',
+    ATTRIBUTE_LIST_ATTRIBUTE: 'parse_attribute_list',
+    OBJECT_ID_ATTRIBUTE: 'parse_object_id_attribute',
+    SECURITY_DESCRIPTOR_ATTRIBUTE: 'parse_security_descriptor',
+    VOLUME_NAME_ATTRIBUTE: 'parse_volume_name',
+    VOLUME_INFORMATION_ATTRIBUTE: 'parse_volume_information',
+    DATA_ATTRIBUTE: 'parse_data',
+    INDEX_ROOT_ATTRIBUTE: 'parse_index_root',
+    INDEX_ALLOCATION_ATTRIBUTE: 'parse_index_allocation',
+    BITMAP_ATTRIBUTE: 'parse_bitmap',
+    REPARSE_POINT_ATTRIBUTE: 'parse_reparse_point',
+    EA_INFORMATION_ATTRIBUTE: 'parse_ea_information',
+    EA_ATTRIBUTE: 'parse_ea',
+    LOGGED_UTILITY_STREAM_ATTRIBUTE: 'parse_logged_utility_stream',
+}
+
+# Export formats that only print names, sizes and timestamps
+EXPORT_FORMAT_ATTRIBUTES = {
+    'body': frozenset({STANDARD_INFORMATION_ATTRIBUTE, FILE_NAME_ATTRIBUTE}),
+    'timeline': frozenset({STANDARD_INFORMATION_ATTRIBUTE, FILE_NAME_ATTRIBUTE}),
+    'tsk': frozenset({STANDARD_INFORMATION_ATTRIBUTE, FILE_NAME_ATTRIBUTE}),
+    'l2t': frozenset({STANDARD_INFORMATION_ATTRIBUTE, FILE_NAME_ATTRIBUTE}),
+}
+
+# Record fields filled in by each attribute parser; header fields need none
+FIELD_ATTRIBUTES = {
+    'si_times': STANDARD_INFORMATION_ATTRIBUTE,
+    'fn_times': FILE_NAME_ATTRIBUTE,
+    'filename': FILE_NAME_ATTRIBUTE,
+    'filesize': FILE_NAME_ATTRIBUTE,
+    'parent_ref': FILE_NAME_ATTRIBUTE,
+    'attribute_list': ATTRIBUTE_LIST_ATTRIBUTE,
+    'object_id': OBJECT_ID_ATTRIBUTE,
+    'birth_volume_id': OBJECT_ID_ATTRIBUTE,
+    'birth_object_id': OBJECT_ID_ATTRIBUTE,
+    'birth_domain_id': OBJECT_ID_ATTRIBUTE,
+    'security_descriptor': SECURITY_DESCRIPTOR_ATTRIBUTE,
+    'volume_name': VOLUME_NAME_ATTRIBUTE,
+    'volume_info': VOLUME_INFORMATION_ATTRIBUTE,
+    'data_attribute': DATA_ATTRIBUTE,
+    'index_root': INDEX_ROOT_ATTRIBUTE,
+    'index_allocation': INDEX_ALLOCATION_ATTRIBUTE,
+    'bitmap': BITMAP_ATTRIBUTE,
+    'reparse_point': REPARSE_POINT_ATTRIBUTE,
+    'ea_information': EA_INFORMATION_ATTRIBUTE,
+    'ea': EA_ATTRIBUTE,
+    'logged_utility_stream': LOGGED_UTILITY_STREAM_ATTRIBUTE,
+}
+
+# Fields of MftRecord.to_dict(), in output order
+DICT_HEADER_FIELDS = ('magic', 'upd_off', 'upd_cnt', 'lsn', 'seq', 'link', 'attr_off', 'flags',
+                      'size', 'alloc_sizef', 'base_ref', 'next_attrid', 'recordnum', 'filename')
+DICT_ATTRIBUTE_FIELDS = ('attribute_list', 'object_id', 'birth_volume_id', 'birth_object_id',
+                         'birth_domain_id', 'parent_ref', 'md5', 'sha256', 'sha512', 'crc32',
+                         'security_descriptor', 'volume_name', 'volume_info', 'data_attribute',
+                         'index_root', 'index_allocation', 'bitmap', 'reparse_point',
+                         'ea_information', 'ea', 'logged_utility_stream')
+
+NON_ATTRIBUTE_FIELDS = frozenset({'magic', 'upd_off', 'upd_cnt', 'lsn', 'seq', 'link', 'attr_off', 'flags',
+                                 'size', 'alloc_sizef', 'base_ref', 'next_attrid', 'recordnum',
+                                 'md5', 'sha256', 'sha512', 'crc32'})
+
+
+def plain_value(value: Any) -> Any:
+    """Convert binary values, also inside dicts and lists, to hex strings."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    if isinstance(value, dict):
+        return {k: plain_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [plain_value(v) for v in value]
+    return value
+
+
+def attribute_projection(export_format: Optional[str] = None,
+                         custom_fields: Optional[List[str]] = None) -> Optional[FrozenSet[int]]:
+    """
+    Work out which attribute types need to be decoded for an export.
+
+    The writers always emit every column of their format, so custom fields add
+    to what the format needs rather than replace it. $FILE_NAME is always kept
+    because path resolution reads the name and parent of every record.
+
+    Args:
+        export_format: Output format the records will be written in
+        custom_fields: Record fields explicitly requested by the analysis profile
+
+    Returns:
+        Set of attribute types to decode, or None to decode every attribute
+    """
+    required = EXPORT_FORMAT_ATTRIBUTES.get(export_format)
+    if required is None:
+        return None
+    projection = set(required) | {FILE_NAME_ATTRIBUTE}
+    for field in custom_fields or ():
+        if field in FIELD_ATTRIBUTES:
+            projection.add(FIELD_ATTRIBUTES[field])
+        elif field not in NON_ATTRIBUTE_FIELDS:
+            logging.getLogger('analyzeMFT.mft_record').warning(
+                f"Unknown custom field '{field}', decoding all attributes")
+            return None
+    return frozenset(projection)
 
 
 class MftRecord:
-    def __init__(self, raw_record: bytes, compute_hashes: bool = False, debug_level: int = 0, logger=None):
+    __slots__ = (
+        'raw_record', 'debug_level', 'logger',
+        'magic', 'upd_off', 'upd_cnt', 'lsn', 'seq', 'link', 'attr_off', 'flags',
+        'size', 'alloc_sizef', 'base_ref', 'next_attrid', 'recordnum',
+        'filename', 'timestamps', 'filesize', 'attribute_mask', 'other_attribute_types',
+        'attribute_list', 'object_id', 'birth_volume_id', 'birth_object_id', 'birth_domain_id',
+        'parent_ref', 'md5', 'sha256', 'sha512', 'crc32',
+        'security_descriptor', 'volume_name', 'volume_info', 'data_attribute',
+        'index_root', 'index_allocation', 'bitmap', 'reparse_point',
+        'ea_information', 'ea', 'logged_utility_stream', 'attributes', 'attribute_headers'
+    )
+
+    def __init__(self, raw_record: bytes, compute_hashes: bool = False, debug_level: int = 0, logger=None,
+                 attributes: Optional[FrozenSet[int]] = None, hash_algorithms: Tuple[str, ...] = HASH_ALGORITHMS,
+                 attribute_headers: bool = False):
         self.raw_record = raw_record
+        self.attributes = attributes
+        self.attribute_headers = [] if attribute_headers else None
         self.debug_level = debug_level
         self.logger = logger or logging.getLogger('analyzeMFT.mft_record')
         self.magic = 0
@@ -30,20 +165,10 @@ class MftRecord:
         self.next_attrid = 0
         self.recordnum = 0
         self.filename = ''
-        self.si_times = {
-            'crtime': WindowsTime(0, 0),
-            'mtime': WindowsTime(0, 0),
-            'atime': WindowsTime(0, 0),
-            'ctime': WindowsTime(0, 0)
-        }
-        self.fn_times = {
-            'crtime': WindowsTime(0, 0),
-            'mtime': WindowsTime(0, 0),
-            'atime': WindowsTime(0, 0),
-            'ctime': WindowsTime(0, 0)
-        }
+        self.timestamps = array('Q', NO_TIMESTAMPS)
         self.filesize = 0
-        self.attribute_types = set()
+        self.attribute_mask = 0
+        self.other_attribute_types = None
         self.attribute_list = []
         self.object_id = ''
         self.birth_volume_id = ''
@@ -54,9 +179,6 @@ class MftRecord:
         self.sha256 = None
         self.sha512 = None
         self.crc32 = None
-        if compute_hashes:
-            self.compute_hashes()
-        self.parse_record()
         self.security_descriptor = None
         self.volume_name = None
         self.volume_info = None
@@ -68,6 +190,78 @@ class MftRecord:
         self.ea_information = None
         self.ea = None
         self.logged_utility_stream = None
+        if compute_hashes:
+            self.compute_hashes(hash_algorithms)
+        self.parse_record()
+
+    @property
+    def debug(self) -> int:
+        return self.debug_level
+
+    @property
+    def si_times(self) -> Dict[str, WindowsTime]:
+        return {key: WindowsTime.from_filetime(self.timestamps[i]) for i, key in enumerate(TIMESTAMP_KEYS)}
+
+    @si_times.setter
+    def si_times(self, times: Dict[str, WindowsTime]) -> None:
+        for i, key in enumerate(TIMESTAMP_KEYS):
+            self.timestamps[i] = times[key].filetime
+
+    @property
+    def fn_times(self) -> Dict[str, WindowsTime]:
+        return {key: WindowsTime.from_filetime(self.timestamps[4 + i]) for i, key in enumerate(TIMESTAMP_KEYS)}
+
+    @fn_times.setter
+    def fn_times(self, times: Dict[str, WindowsTime]) -> None:
+        for i, key in enumerate(TIMESTAMP_KEYS):
+            self.timestamps[4 + i] = times[key].filetime
+
+    @property
+    def attribute_types(self) -> Set[int]:
+        types = {bit << 4 for bit in range(1, ATTRIBUTE_MASK_LIMIT >> 4) if self.attribute_mask >> bit & 1}
+        if self.other_attribute_types:
+            types.update(self.other_attribute_types)
+        return types
+
+    def add_attribute_type(self, attr_type: int) -> None:
+        if attr_type & 0xF == 0 and 0 < attr_type < ATTRIBUTE_MASK_LIMIT:
+            self.attribute_mask |= 1 << (attr_type >> 4)
+        else:
+            if self.other_attribute_types is None:
+                self.other_attribute_types = set()
+            self.other_attribute_types.add(attr_type)
+
+    def has_attribute(self, attr_type: int) -> bool:
+        if attr_type & 0xF == 0 and 0 < attr_type < ATTRIBUTE_MASK_LIMIT:
+            return bool(self.attribute_mask >> (attr_type >> 4) & 1)
+        return bool(self.other_attribute_types) and attr_type in self.other_attribute_types
+
+    def release_raw(self) -> None:
+        """
+        Drop the raw record bytes once parsing and hashing are finished.
+
+        Parsed fields stay available; only the parse_* methods and compute_hashes
+        need the raw bytes.
+        """
+        self.raw_record = None
+
+    def to_row(self) -> tuple:
+        """
+        Return the parsed fields as a plain tuple, without the raw bytes or the logger.
+
+        Cheaper to pickle than the record itself; from_row() rebuilds the record.
+        """
+        return tuple(getattr(self, name) for name in RECORD_ROW_FIELDS)
+
+    @classmethod
+    def from_row(cls, row: tuple, logger=None) -> 'MftRecord':
+        """Rebuild a parsed record from to_row() output without parsing it again."""
+        record = cls.__new__(cls)
+        record.raw_record = None
+        record.logger = logger or logging.getLogger('analyzeMFT.mft_record')
+        for name, value in zip(RECORD_ROW_FIELDS, row):
+            setattr(record, name, value)
+        return record
 
     def _default_logger(self, message: str, level: int = 0):
         logger = logging.getLogger('analyzeMFT.mft_record')
@@ -93,19 +287,9 @@ class MftRecord:
 
     def parse_record(self) -> None:
         try:
-            self.magic = struct.unpack("<I", self.raw_record[MFT_RECORD_MAGIC_NUMBER_OFFSET:MFT_RECORD_MAGIC_NUMBER_OFFSET+MFT_RECORD_MAGIC_NUMBER_SIZE])[0]
-            self.upd_off = struct.unpack("<H", self.raw_record[MFT_RECORD_UPDATE_SEQUENCE_OFFSET:MFT_RECORD_UPDATE_SEQUENCE_OFFSET+MFT_RECORD_UPDATE_SEQUENCE_SIZE])[0]
-            self.upd_cnt = struct.unpack("<H", self.raw_record[MFT_RECORD_UPDATE_SEQUENCE_SIZE_OFFSET:MFT_RECORD_UPDATE_SEQUENCE_SIZE_OFFSET+MFT_RECORD_UPDATE_SEQUENCE_SIZE_SIZE])[0]
-            self.lsn = struct.unpack("<Q", self.raw_record[MFT_RECORD_LOGFILE_SEQUENCE_NUMBER_OFFSET:MFT_RECORD_LOGFILE_SEQUENCE_NUMBER_OFFSET+MFT_RECORD_LOGFILE_SEQUENCE_NUMBER_SIZE])[0]
-            self.seq = struct.unpack("<H", self.raw_record[MFT_RECORD_SEQUENCE_NUMBER_OFFSET:MFT_RECORD_SEQUENCE_NUMBER_OFFSET+MFT_RECORD_SEQUENCE_NUMBER_SIZE])[0]
-            self.link = struct.unpack("<H", self.raw_record[MFT_RECORD_HARD_LINK_COUNT_OFFSET:MFT_RECORD_HARD_LINK_COUNT_OFFSET+MFT_RECORD_HARD_LINK_COUNT_SIZE])[0]
-            self.attr_off = struct.unpack("<H", self.raw_record[MFT_RECORD_FIRST_ATTRIBUTE_OFFSET:MFT_RECORD_FIRST_ATTRIBUTE_OFFSET+MFT_RECORD_FIRST_ATTRIBUTE_SIZE])[0]
-            self.flags = struct.unpack("<H", self.raw_record[MFT_RECORD_FLAGS_OFFSET:MFT_RECORD_FLAGS_OFFSET+MFT_RECORD_FLAGS_SIZE])[0]
-            self.size = struct.unpack("<I", self.raw_record[MFT_RECORD_USED_SIZE_OFFSET:MFT_RECORD_USED_SIZE_OFFSET+MFT_RECORD_USED_SIZE_SIZE])[0]
-            self.alloc_sizef = struct.unpack("<I", self.raw_record[MFT_RECORD_ALLOCATED_SIZE_OFFSET:MFT_RECORD_ALLOCATED_SIZE_OFFSET+MFT_RECORD_ALLOCATED_SIZE_SIZE])[0]
-            self.base_ref = struct.unpack("<Q", self.raw_record[MFT_RECORD_FILE_REFERENCE_OFFSET:MFT_RECORD_FILE_REFERENCE_OFFSET+MFT_RECORD_FILE_REFERENCE_SIZE])[0]
-            self.next_attrid = struct.unpack("<H", self.raw_record[MFT_RECORD_NEXT_ATTRIBUTE_ID_OFFSET:MFT_RECORD_NEXT_ATTRIBUTE_ID_OFFSET+MFT_RECORD_NEXT_ATTRIBUTE_ID_SIZE])[0]
-            self.recordnum = struct.unpack("<I", self.raw_record[MFT_RECORD_RECORD_NUMBER_OFFSET:MFT_RECORD_RECORD_NUMBER_OFFSET+MFT_RECORD_RECORD_NUMBER_SIZE])[0]
+            (self.magic, self.upd_off, self.upd_cnt, self.lsn, self.seq, self.link,
+             self.attr_off, self.flags, self.size, self.alloc_sizef, self.base_ref,
+             self.next_attrid, self.recordnum) = MFT_RECORD_HEADER.unpack_from(memoryview(self.raw_record))
             self.parse_attributes()
 
         except struct.error:
@@ -134,38 +318,13 @@ class MftRecord:
                 except ValidationError as e:
                     self.logger.error(f"Attribute validation failed at record {getattr(self, 'recordnum', 'unknown')}: {e}")                    offset += 8                    continue
                 
-                self.attribute_types.add(attr_type)
-
-                if attr_type == STANDARD_INFORMATION_ATTRIBUTE:
-                    self.parse_si_attribute(offset)
-                elif attr_type == FILE_NAME_ATTRIBUTE:
-                    self.parse_fn_attribute(offset)
-                elif attr_type == ATTRIBUTE_LIST_ATTRIBUTE:
-                    self.parse_attribute_list(offset)
-                elif attr_type == OBJECT_ID_ATTRIBUTE:
-                    self.parse_object_id_attribute(offset)
-                elif attr_type == SECURITY_DESCRIPTOR_ATTRIBUTE:
-                    self.parse_security_descriptor(offset)
-                elif attr_type == VOLUME_NAME_ATTRIBUTE:
-                    self.parse_volume_name(offset)
-                elif attr_type == VOLUME_INFORMATION_ATTRIBUTE:
-                    self.parse_volume_information(offset)
-                elif attr_type == DATA_ATTRIBUTE:
-                    self.parse_data(offset)
-                elif attr_type == INDEX_ROOT_ATTRIBUTE:
-                    self.parse_index_root(offset)
-                elif attr_type == INDEX_ALLOCATION_ATTRIBUTE:
-                    self.parse_index_allocation(offset)
-                elif attr_type == BITMAP_ATTRIBUTE:
-                    self.parse_bitmap(offset)
-                elif attr_type == REPARSE_POINT_ATTRIBUTE:
-                    self.parse_reparse_point(offset)
-                elif attr_type == EA_INFORMATION_ATTRIBUTE:
-                    self.parse_ea_information(offset)
-                elif attr_type == EA_ATTRIBUTE:
-                    self.parse_ea(offset)
-                elif attr_type == LOGGED_UTILITY_STREAM_ATTRIBUTE:
-                    self.parse_logged_utility_stream(offset)
+                self.add_attribute_type(attr_type)
+                if self.attribute_headers is not None:
+                    self.attribute_headers.append(self.read_attribute_header(offset))
+
+                parser = ATTRIBUTE_PARSERS.get(attr_type)
+                if parser and (self.attributes is None or attr_type in self.attributes):
+                    getattr(self, parser)(offset)
 
                 offset += attr_len
 
@@ -178,31 +337,47 @@ class MftRecord:
                     traceback.print_exc()
                 offset += 1
 
+    def read_attribute_header(self, offset: int) -> Tuple[int, str, bool, int, int, int, Optional[int], Optional[int], Optional[int]]:
+        """
+        Read the common header of the attribute at offset.
+
+        Returns:
+            Tuple of (type, name, resident, attribute id, offset in record, length,
+            content or mapping pairs offset, data size, allocated size). The last
+            three are None when the header is cut short.
+        """
+        attr_type, attr_len = struct.unpack_from('<LL', self.raw_record, offset)
+        name = ''
+        non_resident = attr_id = 0
+        content_offset = data_size = allocated_size = None
+        try:
+            _, _, non_resident, name_len, name_off, _, attr_id = ATTRIBUTE_HEADER.unpack_from(self.raw_record, offset)
+            if name_len:
+                name = bytes(self.raw_record[offset + name_off:offset + name_off + name_len * 2]).decode('utf-16-le', errors='replace')
+            if non_resident:
+                content_offset = int.from_bytes(self.raw_record[offset + 32:offset + 34], 'little')
+                allocated_size, data_size = NON_RESIDENT_SIZES.unpack_from(self.raw_record, offset + 40)
+            else:
+                data_size, content_offset = RESIDENT_CONTENT.unpack_from(self.raw_record, offset + 16)
+                allocated_size = data_size
+        except struct.error:
+            pass
+        return (attr_type, name, not non_resident, attr_id, offset, attr_len,
+                content_offset, data_size, allocated_size)
+
     def parse_si_attribute(self, offset: int) -> None:
         si_data = self.raw_record[offset+24:offset+72]
         if len(si_data) >= 32:
-            try:                timestamps = struct.unpack("<QQQQ", si_data[:32])
-                self.si_times = {
-                    'crtime': WindowsTime(timestamps[0] & 0xFFFFFFFF, timestamps[0] >> 32),
-                    'mtime': WindowsTime(timestamps[1] & 0xFFFFFFFF, timestamps[1] >> 32),
-                    'ctime': WindowsTime(timestamps[2] & 0xFFFFFFFF, timestamps[2] >> 32),
-                    'atime': WindowsTime(timestamps[3] & 0xFFFFFFFF, timestamps[3] >> 32)
-                }
+            try:                self.timestamps[0:4] = array('Q', FILETIMES.unpack_from(si_data))
             except struct.error:
                 pass
 
     def parse_fn_attribute(self, offset: int) -> None:
         fn_data = self.raw_record[offset+24:]
         if len(fn_data) >= 64:
-            try:                self.parent_ref = struct.unpack("<Q", fn_data[:8])[0] & 0x0000FFFFFFFFFFFF                timestamps = struct.unpack("<QQQQ", fn_data[8:40])
-                self.fn_times = {
-                    'crtime': WindowsTime(timestamps[0] & 0xFFFFFFFF, timestamps[0] >> 32),
-                    'mtime': WindowsTime(timestamps[1] & 0xFFFFFFFF, timestamps[1] >> 32),
-                    'ctime': WindowsTime(timestamps[2] & 0xFFFFFFFF, timestamps[2] >> 32),
-                    'atime': WindowsTime(timestamps[3] & 0xFFFFFFFF, timestamps[3] >> 32)
-                }                self.filesize = struct.unpack("<Q", fn_data[48:56])[0]                name_len = struct.unpack("B", fn_data[64:65])[0]
+            try:                self.parent_ref = struct.unpack("<Q", fn_data[:8])[0]                self.timestamps[4:8] = array('Q', FILETIMES.unpack_from(fn_data, 8))                self.filesize = struct.unpack("<Q", fn_data[48:56])[0]                name_len = struct.unpack("B", fn_data[64:65])[0]
                 if len(fn_data) >= 66 + name_len * 2:
-                    self.filename = fn_data[66:66+name_len*2].decode('utf-16-le', errors='replace')
+                    self.filename = bytes(fn_data[66:66+name_len*2]).decode('utf-16-le', errors='replace')
             except struct.error:
                 pass
 
@@ -237,7 +412,7 @@ class MftRecord:
                 name_offset = struct.unpack("B", self.raw_record[attr_content_offset+7:attr_content_offset+8])[0]
                 
                 if name_len > 0:
-                    name = self.raw_record[attr_content_offset+name_offset:attr_content_offset+name_offset+name_len*2].decode('utf-16-le', errors='replace')
+                    name = bytes(self.raw_record[attr_content_offset+name_offset:attr_content_offset+name_offset+name_len*2]).decode('utf-16-le', errors='replace')
                 else:
                     name = ""
                 
@@ -282,7 +457,7 @@ class MftRecord:
         vn_data = self.raw_record[offset+24:]
         try:
             name_length = struct.unpack("<H", vn_data[:2])[0]
-            self.volume_name = vn_data[2:2+name_length*2].decode('utf-16-le', errors='replace')
+            self.volume_name = bytes(vn_data[2:2+name_length*2]).decode('utf-16-le', errors='replace')
         except struct.error:
             if self.debug:
                 self.logger.error(f"Error parsing Volume Name attribute for record {self.recordnum}")
@@ -307,7 +482,7 @@ class MftRecord:
             name_length = struct.unpack("B", data_header[9:10])[0]
             name_offset = struct.unpack("<H", data_header[10:12])[0]
             if name_length > 0:
-                name = self.raw_record[offset+name_offset:offset+name_offset+name_length*2].decode('utf-16-le', errors='replace')
+                name = bytes(self.raw_record[offset+name_offset:offset+name_offset+name_length*2]).decode('utf-16-le', errors='replace')
             else:
                 name = ""
             
@@ -363,7 +538,7 @@ class MftRecord:
             bitmap_size = struct.unpack("<L", bitmap_data[:4])[0]
             self.bitmap = {
                 'size': bitmap_size,
-                'data': bitmap_data[4:4+bitmap_size]
+                'data': bytes(bitmap_data[4:4+bitmap_size])
             }
         except struct.error:
             if self.debug:
@@ -377,7 +552,7 @@ class MftRecord:
             self.reparse_point = {
                 'reparse_tag': reparse_tag,
                 'data_length': reparse_data_length,
-                'data': rp_data[8:8+reparse_data_length]
+                'data': bytes(rp_data[8:8+reparse_data_length])
             }
         except struct.error:
             if self.debug:
@@ -403,8 +578,8 @@ class MftRecord:
             flags = struct.unpack("B", ea_data[4:5])[0]
             name_length = struct.unpack("B", ea_data[5:6])[0]
             value_length = struct.unpack("<H", ea_data[6:8])[0]
-            name = ea_data[8:8+name_length].decode('ascii', errors='replace')
-            value = ea_data[8+name_length:8+name_length+value_length]
+            name = bytes(ea_data[8:8+name_length]).decode('ascii', errors='replace')
+            value = bytes(ea_data[8+name_length:8+name_length+value_length])
             
             self.ea = {
                 'next_entry_offset': next_entry_offset,
@@ -422,7 +597,7 @@ class MftRecord:
             stream_size = struct.unpack("<Q", lus_data[:8])[0]
             self.logged_utility_stream = {
                 'size': stream_size,
-                'data': lus_data[8:8+stream_size]
+                'data': bytes(lus_data[8:8+stream_size])
             }
         except struct.error:
             if self.debug:
@@ -430,6 +605,8 @@ class MftRecord:
 
 
     def to_csv(self) -> List[Union[str, int]]:
+        si_times = self.si_times
+        fn_times = self.fn_times
         row = [
             self.recordnum,
             "Valid" if self.magic == int.from_bytes(MFT_RECORD_MAGIC, BYTE_ORDER) else "Invalid",
@@ -441,34 +618,34 @@ class MftRecord:
             
             self.filename,
             "",            
-            self.si_times['crtime'].dtstr,
-            self.si_times['mtime'].dtstr,
-            self.si_times['atime'].dtstr,
-            self.si_times['ctime'].dtstr,
+            si_times['crtime'].dtstr,
+            si_times['mtime'].dtstr,
+            si_times['atime'].dtstr,
+            si_times['ctime'].dtstr,
             
-            self.fn_times['crtime'].dtstr,
-            self.fn_times['mtime'].dtstr,
-            self.fn_times['atime'].dtstr,
-            self.fn_times['ctime'].dtstr,
+            fn_times['crtime'].dtstr,
+            fn_times['mtime'].dtstr,
+            fn_times['atime'].dtstr,
+            fn_times['ctime'].dtstr,
             
             self.object_id,
             self.birth_volume_id,
             self.birth_object_id,
             self.birth_domain_id,
             
-            str(STANDARD_INFORMATION_ATTRIBUTE in self.attribute_types),
-            str(ATTRIBUTE_LIST_ATTRIBUTE in self.attribute_types),
-            str(FILE_NAME_ATTRIBUTE in self.attribute_types),
-            str(VOLUME_NAME_ATTRIBUTE in self.attribute_types),
-            str(VOLUME_INFORMATION_ATTRIBUTE in self.attribute_types),
-            str(DATA_ATTRIBUTE in self.attribute_types),
-            str(INDEX_ROOT_ATTRIBUTE in self.attribute_types),
-            str(INDEX_ALLOCATION_ATTRIBUTE in self.attribute_types),
-            str(BITMAP_ATTRIBUTE in self.attribute_types),
-            str(REPARSE_POINT_ATTRIBUTE in self.attribute_types),
-            str(EA_INFORMATION_ATTRIBUTE in self.attribute_types),
-            str(EA_ATTRIBUTE in self.attribute_types),
-            str(LOGGED_UTILITY_STREAM_ATTRIBUTE in self.attribute_types),
+            str(self.has_attribute(STANDARD_INFORMATION_ATTRIBUTE)),
+            str(self.has_attribute(ATTRIBUTE_LIST_ATTRIBUTE)),
+            str(self.has_attribute(FILE_NAME_ATTRIBUTE)),
+            str(self.has_attribute(VOLUME_NAME_ATTRIBUTE)),
+            str(self.has_attribute(VOLUME_INFORMATION_ATTRIBUTE)),
+            str(self.has_attribute(DATA_ATTRIBUTE)),
+            str(self.has_attribute(INDEX_ROOT_ATTRIBUTE)),
+            str(self.has_attribute(INDEX_ALLOCATION_ATTRIBUTE)),
+            str(self.has_attribute(BITMAP_ATTRIBUTE)),
+            str(self.has_attribute(REPARSE_POINT_ATTRIBUTE)),
+            str(self.has_attribute(EA_INFORMATION_ATTRIBUTE)),
+            str(self.has_attribute(EA_ATTRIBUTE)),
+            str(self.has_attribute(LOGGED_UTILITY_STREAM_ATTRIBUTE)),
             
             str(self.attribute_list),
             str(self.security_descriptor),
@@ -483,38 +660,47 @@ class MftRecord:
             str(self.ea),
             str(self.logged_utility_stream)
         ]
-        if self.md5 is not None:
-            row.extend([self.md5, self.sha256, self.sha512, self.crc32])
-        else:
-            row.extend([""] * 4)        return row
+        row.extend(digest.hex() if digest is not None else ""
+                   for digest in (self.md5, self.sha256, self.sha512, self.crc32))        return row
 
-    def compute_hashes(self) -> None:
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the parsed fields as a JSON-serializable dictionary.
+
+        Timestamps are rendered as ISO strings and binary attribute content as hex.
+        The raw record bytes and the logger are not included.
+        """
+        data = {name: getattr(self, name) for name in DICT_HEADER_FIELDS}
+        data['si_times'] = {key: t.dtstr for key, t in self.si_times.items()}
+        data['fn_times'] = {key: t.dtstr for key, t in self.fn_times.items()}
+        data['filesize'] = self.filesize
+        data['attribute_types'] = sorted(self.attribute_types)
+        for name in DICT_ATTRIBUTE_FIELDS:
+            data[name] = plain_value(getattr(self, name))
+        return data
+
+    def compute_hashes(self, algorithms: Tuple[str, ...] = HASH_ALGORITHMS) -> None:
         """
         Compute hashes for this MFT record using single-threaded approach.
         For better performance with multiple records, use HashProcessor class.
+
+        Digests are stored as raw bytes; algorithms not selected are left as None.
+
+        Args:
+            algorithms: Names of the hash algorithms to compute
         """
-        md5 = hashlib.md5()
-        sha256 = hashlib.sha256()
-        sha512 = hashlib.sha512()
-        
-        md5.update(self.raw_record)
-        sha256.update(self.raw_record)
-        sha512.update(self.raw_record)
+        self.md5, self.sha256, self.sha512, self.crc32 = compute_digests(self.raw_record, algorithms)
         
-        self.md5 = md5.hexdigest()
-        self.sha256 = sha256.hexdigest()
-        self.sha512 = sha512.hexdigest()
-        self.crc32 = format(zlib.crc32(self.raw_record) & 0xFFFFFFFF, '08x')
-        
-    def set_hashes(self, md5: str, sha256: str, sha512: str, crc32: str) -> None:
+    def set_hashes(self, md5: Optional[bytes], sha256: Optional[bytes],
+                   sha512: Optional[bytes], crc32: Optional[bytes]) -> None:
         """
         Set hash values from external computation (e.g., multiprocessing).
         
         Args:
-            md5: MD5 hash as hex string
-            sha256: SHA256 hash as hex string  
-            sha512: SHA512 hash as hex string
-            crc32: CRC32 hash as hex string
+            md5: MD5 digest as raw bytes, or None if not computed
+            sha256: SHA256 digest as raw bytes, or None if not computed
+            sha512: SHA512 digest as raw bytes, or None if not computed
+            crc32: CRC32 as 4 big-endian bytes, or None if not computed
         """
         self.md5 = md5
         self.sha256 = sha256
@@ -529,4 +715,7 @@ class MftRecord:
         elif self.flags & FILE_RECORD_HAS_SPECIAL_INDEX:
             return "Special Index"
         else:
-            return "File"
\ No newline at end of file
+            return "File"
+
+# Slots sent between processes by to_row() and from_row()
+RECORD_ROW_FIELDS = tuple(name for name in MftRecord.__slots__ if name not in ('raw_record', 'logger'))
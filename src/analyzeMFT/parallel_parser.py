@@ -0,0 +1,193 @@
+"""
+Multi-process sharded parsing of MFT files
+"""
+
+import asyncio
+import logging
+import multiprocessing as mp
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import AsyncIterator, FrozenSet, Iterator, List, Optional, Tuple
+from .constants import *
+from .mft_record import MftRecord
+
+
+@dataclass
+class ShardResult:
+    """Records parsed by one worker for one shard, as MftRecord.to_row() tuples"""
+    index: int
+    first_record: int
+    rows: List[tuple] = field(default_factory=list)
+    errors: int = 0
+    bytes_read: int = 0
+    processing_time: float = 0.0
+
+    def records(self, logger: Optional[logging.Logger] = None) -> Iterator[MftRecord]:
+        """Rebuild the parsed records in file order."""
+        for row in self.rows:
+            yield MftRecord.from_row(row, logger)
+
+
+def plan_shards(file_size: int, shard_records: int,
+                record_size: int = MFT_RECORD_SIZE) -> List[Tuple[int, int]]:
+    """
+    Split an MFT file into record-aligned ranges.
+
+    Args:
+        file_size: Size of the MFT file in bytes
+        shard_records: Number of records per shard
+        record_size: Size of a single MFT record in bytes
+
+    Returns:
+        List of (first_record, record_count) tuples covering every complete record
+    """
+    if shard_records < 1:
+        raise ValueError("shard_records must be at least 1")
+    total = file_size // record_size
+    return [(start, min(shard_records, total - start)) for start in range(0, total, shard_records)]
+
+
+def parse_shard(task: Tuple[str, int, int, int, bool, int, Optional[FrozenSet[int]], Tuple[str, ...], bool]) -> ShardResult:
+    """
+    Parse one record-aligned range of an MFT file. Runs in a worker process.
+
+    Args:
+        task: Tuple of (mft_file, shard_index, first_record, record_count,
+              compute_hashes, debug_level, attribute projection, hash algorithms,
+              attribute_headers)
+
+    Returns:
+        ShardResult with the parsed record rows in file order
+    """
+    mft_file, index, first_record, count, compute_hashes, debug, attributes, hash_algorithms, attribute_headers = task
+    logger = logging.getLogger('analyzeMFT.parallel_parser')
+    start_time = time.time()
+    result = ShardResult(index=index, first_record=first_record)
+
+    with open(mft_file, 'rb') as f:
+        f.seek(first_record * MFT_RECORD_SIZE)
+        data = f.read(count * MFT_RECORD_SIZE)
+    result.bytes_read = len(data) - len(data) % MFT_RECORD_SIZE
+
+    view = memoryview(data)
+    for offset in range(0, result.bytes_read, MFT_RECORD_SIZE):
+        try:
+            record = MftRecord(view[offset:offset + MFT_RECORD_SIZE], compute_hashes, debug, logger,
+                               attributes=attributes, hash_algorithms=hash_algorithms,
+                               attribute_headers=attribute_headers)
+            result.rows.append(record.to_row())
+        except Exception as e:
+            result.errors += 1
+            logger.warning(f"Error processing record {first_record + offset // MFT_RECORD_SIZE}: {e}")
+
+    result.processing_time = time.time() - start_time
+    return result
+
+
+class ParallelParser:
+    """
+    Parse an MFT file in worker processes, one record-aligned shard per task.
+
+    Results are yielded strictly in file order. At most ``max_pending`` shards
+    are in flight at once, so memory stays bounded regardless of file size.
+    """
+
+    def __init__(self, mft_file: str, num_processes: Optional[int] = None, shard_records: int = 1000,
+                 compute_hashes: bool = False, debug_level: int = 0,
+                 attributes: Optional[FrozenSet[int]] = None, hash_algorithms: Tuple[str, ...] = HASH_ALGORITHMS,
+                 attribute_headers: bool = False, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            mft_file: Path to the MFT file
+            num_processes: Number of worker processes. If None, uses the CPU count.
+            shard_records: Number of records parsed per task
+            compute_hashes: Whether workers compute record hashes
+            debug_level: Debug level passed to MftRecord
+            attributes: Attribute projection passed to MftRecord
+            hash_algorithms: Hash algorithms computed by workers
+            attribute_headers: Whether records keep their attribute headers
+            logger: Logger instance
+        """
+        self.mft_file = mft_file
+        self.num_processes = num_processes or mp.cpu_count()
+        self.shard_records = shard_records
+        self.compute_hashes = compute_hashes
+        self.debug_level = debug_level
+        self.attributes = attributes
+        self.hash_algorithms = hash_algorithms
+        self.attribute_headers = attribute_headers
+        self.logger = logger or logging.getLogger('analyzeMFT.parallel_parser')
+        self.max_pending = self.num_processes * 2
+        self.stats = {
+            'shards': 0,
+            'records': 0,
+            'errors': 0,
+            'worker_time': 0.0,
+            'wall_time': 0.0,
+        }
+
+    def shards(self) -> List[Tuple[int, int]]:
+        return plan_shards(os.path.getsize(self.mft_file), self.shard_records)
+
+    def _tasks(self) -> List[tuple]:
+        tasks = [(self.mft_file, i, first, count, self.compute_hashes, self.debug_level, self.attributes,
+                  self.hash_algorithms, self.attribute_headers)
+                 for i, (first, count) in enumerate(self.shards())]
+        self.logger.info(f"Parsing {len(tasks)} shards with {self.num_processes} processes")
+        return tasks
+
+    def _count(self, result: ShardResult) -> None:
+        self.stats['shards'] += 1
+        self.stats['records'] += len(result.rows)
+        self.stats['errors'] += result.errors
+        self.stats['worker_time'] += result.processing_time
+
+    def __iter__(self) -> Iterator[ShardResult]:
+        start_time = time.time()
+        tasks = self._tasks()
+        with ProcessPoolExecutor(max_workers=self.num_processes) as executor:
+            pending = deque()
+            next_task = 0
+            try:
+                while next_task < len(tasks) or pending:
+                    while next_task < len(tasks) and len(pending) < self.max_pending:
+                        pending.append(executor.submit(parse_shard, tasks[next_task]))
+                        next_task += 1
+
+                    result = pending.popleft().result()
+                    self._count(result)
+                    yield result
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        self.stats['wall_time'] = time.time() - start_time
+
+    async def iter_async(self) -> AsyncIterator[ShardResult]:
+        """
+        Yield shards in file order like iteration does, but await each one so the
+        event loop keeps running while the workers parse.
+        """
+        start_time = time.time()
+        tasks = self._tasks()
+        executor = ProcessPoolExecutor(max_workers=self.num_processes)
+        pending = deque()
+        next_task = 0
+        try:
+            while next_task < len(tasks) or pending:
+                while next_task < len(tasks) and len(pending) < self.max_pending:
+                    pending.append(asyncio.wrap_future(executor.submit(parse_shard, tasks[next_task])))
+                    next_task += 1
+
+                result = await pending.popleft()
+                self._count(result)
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+        self.stats['wall_time'] = time.time() - start_time
@@ -0,0 +1,246 @@
+"""
+Compact first-pass index of record names and parent references
+"""
+
+import logging
+import struct
+import sys
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from .batch_parser import HAS_NUMPY, RecordBatch
+from .constants import *
+from .mft_reader import MftReader
+from .mft_record import MFT_RECORD_HEADER
+
+ATTRIBUTE_HEADER = struct.Struct('<LL')
+PARENT_RECORD_MASK = 0x0000FFFFFFFFFFFF
+# Distinct names remembered for sharing pool space while the index is built
+NAME_INTERN_SIZE = 65536
+
+
+def scan_record(raw_record: bytes) -> Tuple[int, int, int, int, str]:
+    """
+    Read only the header and $FILE_NAME attributes of a record.
+
+    Attributes are walked with the same rules as MftRecord.parse_attributes, and
+    as there the last $FILE_NAME attribute wins.
+
+    Args:
+        raw_record: Raw record bytes or memoryview
+
+    Returns:
+        Tuple of (record number, sequence number, flags, raw parent reference, filename)
+    """
+    header = MFT_RECORD_HEADER.unpack_from(raw_record)
+    seq, attr_off, flags, recordnum = header[4], header[6], header[7], header[12]
+    parent_ref, filename = scan_file_name(raw_record, attr_off)
+    return recordnum, seq, flags, parent_ref, filename
+
+
+def scan_file_name(raw_record: bytes, attr_off: int) -> Tuple[int, str]:
+    """
+    Walk the attributes of a record for its last $FILE_NAME.
+
+    Args:
+        raw_record: Raw record bytes or memoryview
+        attr_off: Offset of the first attribute, from the record header
+
+    Returns:
+        Tuple of (raw parent reference, filename); (0, '') without a $FILE_NAME
+    """
+    parent_ref = 0
+    filename = ''
+    size = len(raw_record)
+    offset = attr_off
+
+    while offset < size - 8:
+        attr_type, attr_len = ATTRIBUTE_HEADER.unpack_from(raw_record, offset)
+        if attr_type == 0xFFFFFFFF or attr_len == 0:
+            break
+        if offset + attr_len > size:
+            offset += 8
+            continue
+        if attr_type == FILE_NAME_ATTRIBUTE:
+            fn = offset + 24
+            if size - fn >= 64:
+                parent_ref = int.from_bytes(raw_record[fn:fn + 8], 'little')
+                if size - fn > 64:
+                    name_len = raw_record[fn + 64]
+                    if size - fn >= 66 + name_len * 2:
+                        filename = bytes(raw_record[fn + 66:fn + 66 + name_len * 2]).decode('utf-16-le', errors='replace')
+        offset += attr_len
+
+    return parent_ref, filename
+
+
+class IndexEntry:
+    """Read-only view of one indexed record, usable wherever PathResolver expects a record"""
+    __slots__ = ('recordnum', 'seq', 'flags', 'parent_ref', 'filename')
+
+    def __init__(self, recordnum: int, seq: int, flags: int, parent_ref: int, filename: str):
+        self.recordnum = recordnum
+        self.seq = seq
+        self.flags = flags
+        self.parent_ref = parent_ref
+        self.filename = filename
+
+    def get_parent_record_num(self) -> int:
+        return self.parent_ref & PARENT_RECORD_MASK
+
+    @property
+    def parent_seq(self) -> int:
+        return self.parent_ref >> 48
+
+
+class PathIndex:
+    """
+    Names and parent references of every record in array-backed columns.
+
+    Built in a first pass over the MFT so that paths can be resolved before the
+    full parse, including parents that appear later in the file. Each record costs
+    24 bytes of columns plus its UTF-8 name in a shared pool. A name already among
+    the last NAME_INTERN_SIZE distinct names is not stored again, so common names
+    such as desktop.ini are shared while the interning table stays bounded.
+
+    Lookups are by the record number in the record header; when several slots
+    carry the same number the last one wins, as with MftAnalyzer.mft_records.
+    """
+
+    def __init__(self, intern_size: int = NAME_INTERN_SIZE):
+        self.recordnums = array('I')
+        self.seqs = array('H')
+        self.flags = array('H')
+        self.parents = array('Q')
+        self.name_offsets = array('I')
+        self.name_lengths = array('H')
+        self.name_pool = bytearray()
+        self.positions: Dict[int, int] = {}
+        self.intern_size = intern_size
+        self._interned: Optional["OrderedDict[bytes, int]"] = OrderedDict()
+
+    def add(self, raw_record: bytes) -> None:
+        """Index the next record slot of the file."""
+        try:
+            fields = scan_record(raw_record)
+        except (struct.error, IndexError):
+            fields = (0, 0, 0, 0, '')
+        self._append(*fields)
+
+    def add_batch(self, batch: RecordBatch) -> None:
+        """
+        Index the next record slots of the file from a batch. Header columns are
+        copied in bulk and the $FILE_NAME attributes are located for the whole batch
+        at once; only the name itself is decoded per record.
+        """
+        start = len(self.recordnums)
+        recordnums = batch['recordnum'].tolist()
+        if self.positions or recordnums != list(range(start, start + len(recordnums))):
+            for position, recordnum in enumerate(recordnums, start):
+                self._place(recordnum, position)
+        for column, key in ((self.recordnums, 'recordnum'), (self.seqs, 'seq'), (self.flags, 'flags')):
+            column.frombytes(batch[key].astype(column.typecode).tobytes())
+
+        size = batch.record_size
+        data = batch.buffer
+        offsets = batch.attribute_offsets(FILE_NAME_ATTRIBUTE, 64).tolist()
+        for i, (attr_off, offset) in enumerate(zip(batch['attr_off'].tolist(), offsets)):
+            parent_ref, filename = 0, ''
+            if offset >= 0:
+                fn = i * size + offset + 24
+                room = (i + 1) * size - fn
+                parent_ref = int.from_bytes(data[fn:fn + 8], 'little')
+                if room > 64 and room >= 66 + data[fn + 64] * 2:
+                    filename = bytes(data[fn + 66:fn + 66 + data[fn + 64] * 2]).decode('utf-16-le', errors='replace')
+                else:
+                    parent_ref, filename = scan_file_name(batch.raw_record(i), attr_off)
+            self.parents.append(parent_ref)
+            self._add_name(filename)
+
+    def _append(self, recordnum: int, seq: int, flags: int, parent_ref: int, filename: str) -> None:
+        self._place(recordnum, len(self.recordnums))
+        self.recordnums.append(recordnum)
+        self.seqs.append(seq)
+        self.flags.append(flags)
+        self.parents.append(parent_ref)
+        self._add_name(filename)
+
+    def _add_name(self, filename: str) -> None:
+        name = filename.encode('utf-8')
+        interned = self._interned
+        name_offset = interned.get(name) if interned is not None else None
+        if name_offset is None:
+            name_offset = len(self.name_pool)
+            self.name_pool += name
+            if interned is not None:
+                interned[name] = name_offset
+                if len(interned) > self.intern_size:
+                    interned.popitem(last=False)
+        else:
+            interned.move_to_end(name)
+        self.name_offsets.append(name_offset)
+        self.name_lengths.append(len(name))
+
+    def _place(self, recordnum: int, position: int) -> None:
+        if recordnum != position:
+            self.positions[recordnum] = position
+        elif recordnum in self.positions:
+            del self.positions[recordnum]
+
+    def finish(self) -> None:
+        """Drop the interning table once every record has been added."""
+        self._interned = None
+
+    def get(self, recordnum: int) -> Optional[IndexEntry]:
+        """Return the indexed entry for a record number, or None if no slot carries it."""
+        position = self.positions.get(recordnum, recordnum)
+        if position >= len(self.recordnums) or self.recordnums[position] != recordnum:
+            return None
+        return IndexEntry(recordnum, self.seqs[position], self.flags[position],
+                          self.parents[position], self.name(position))
+
+    def name(self, position: int) -> str:
+        offset = self.name_offsets[position]
+        return self.name_pool[offset:offset + self.name_lengths[position]].decode('utf-8')
+
+    def __len__(self) -> int:
+        return len(self.recordnums)
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held by the columns and the name pool."""
+        columns = (self.recordnums, self.seqs, self.flags, self.parents, self.name_offsets, self.name_lengths)
+        return (sum(column.itemsize * len(column) for column in columns) + len(self.name_pool)
+                + sys.getsizeof(self.positions))
+
+    @classmethod
+    def build(cls, mft_file: str, chunk_size: int = 1000, io_mode: str = 'auto',
+              logger: Optional[logging.Logger] = None) -> 'PathIndex':
+        """
+        Scan an MFT file and index every complete record.
+
+        Args:
+            mft_file: Path to the MFT file
+            chunk_size: Number of records read at a time
+            io_mode: I/O mode passed to MftReader
+            logger: Logger instance
+
+        Returns:
+            The finished PathIndex
+        """
+        logger = logger or logging.getLogger('analyzeMFT.path_index')
+        start_time = time.time()
+        index = cls()
+        with MftReader(mft_file, chunk_size, io_mode=io_mode, logger=logger) as reader:
+            for chunk in reader:
+                if HAS_NUMPY:
+                    index.add_batch(RecordBatch(b''.join(chunk)))
+                else:
+                    for raw_record in chunk:
+                        index.add(raw_record)
+                    del raw_record
+                del chunk
+        index.finish()
+        logger.info(f"Indexed {len(index):,} records for path resolution in {time.time() - start_time:.3f}s "
+                    f"({index.memory_usage():,} bytes)")
+        return index
@@ -0,0 +1,118 @@
+"""
+Memoized reconstruction of full file paths from MFT parent references
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+ROOT_RECORD_NUMBER = 5
+PATH_CACHE_SIZE = 65536
+
+
+class PathResolver:
+    """
+    Build full paths by walking parent references, caching each directory's path.
+
+    Directory paths are cached under (record number, sequence number), so a record
+    only walks up to its nearest cached ancestor and appends the names below it.
+    Parent chains that loop back on themselves are cut at the first repeated
+    record and prefixed with "CyclicPath". Paths that depend on a parent that has
+    not been seen yet are not cached, so they resolve correctly once it arrives.
+    """
+
+    def __init__(self, get_record: Callable[[int], Optional[Any]],
+                 max_entries: Optional[int] = PATH_CACHE_SIZE):
+        """
+        Args:
+            get_record: Returns the parsed record for a record number, or None
+            max_entries: Maximum number of cached directory paths, least recently
+                used first out. None keeps every directory.
+        """
+        self.get_record = get_record
+        self.max_entries = max_entries
+        self.cache: "OrderedDict[Tuple[int, int], str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.cycles = 0
+
+    def resolve(self, record: Any) -> str:
+        """
+        Return the full path of a record, with components joined by backslashes.
+
+        Args:
+            record: Parsed MftRecord (or any object with recordnum, seq, filename
+                and get_parent_record_num())
+
+        Returns:
+            Path starting with a backslash for records under the root, or with
+            OrphanedFiles, UnknownParent_N or CyclicPath when the chain is broken
+        """
+        chain = []
+        seen = set()
+        current = record
+        base = None
+        cacheable = True
+
+        while True:
+            if current is not record:
+                key = (current.recordnum, getattr(current, 'seq', 0))
+                cached = self.cache.get(key)
+                if cached is not None:
+                    self.hits += 1
+                    self.cache.move_to_end(key)
+                    base = cached
+                    break
+                self.misses += 1
+
+            if current.recordnum == ROOT_RECORD_NUMBER:
+                base = ""
+                chain.append(None)
+                break
+
+            chain.append(current)
+            seen.add(current.recordnum)
+            parent_num = current.get_parent_record_num()
+            if parent_num == current.recordnum:
+                base = "OrphanedFiles"
+                break
+            if parent_num in seen:
+                self.cycles += 1
+                base = "CyclicPath"
+                break
+            parent = self.get_record(parent_num)
+            if parent is None:
+                base = f"UnknownParent_{parent_num}"
+                cacheable = False
+                break
+            current = parent
+
+        if chain and chain[-1] is None:
+            # The root contributes an empty leading component
+            chain.pop()
+            if current is not record:
+                self._store((current.recordnum, getattr(current, 'seq', 0)), base)
+
+        path = base
+        for directory in reversed(chain):
+            name = directory.filename or f"Unknown_{directory.recordnum}"
+            path = f"{path}\\{name}"
+            if cacheable and directory is not record:
+                self._store((directory.recordnum, getattr(directory, 'seq', 0)), path)
+        return path
+
+    def _store(self, key: Tuple[int, int], path: str) -> None:
+        self.cache[key] = path
+        self.cache.move_to_end(key)
+        if self.max_entries is not None and len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'cycles': self.cycles,
+            'entries': len(self.cache),
+        }
@@ -0,0 +1,248 @@
+"""
+Record-number mapping that spills least recently used records to disk
+"""
+
+import heapq
+import logging
+import os
+import pickle
+import sqlite3
+import tempfile
+import zlib
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+DEFAULT_MEMORY_RECORDS = 100000
+SPILL_FRACTION = 0.1
+COMPRESSION_LEVEL = 1
+
+
+class RecordStore(MutableMapping):
+    """
+    Dict-like store of parsed records keyed by record number.
+
+    At most ``max_in_memory`` records are held as objects, least recently used
+    first out. Evicted records are pickled, compressed and written to a table in
+    a temporary SQLite file keyed by record number, and read back on access.
+    Records are spilled in batches of a tenth of the hot set, so each write is a
+    single transaction.
+
+    A spilled row stays on disk after the record is read back, and is rewritten
+    when the record is evicted again, so lookups never write to the table. This
+    keeps iteration stable while records are looked up inside the loop.
+
+    Iteration follows first-insertion order, as for a dict, whether a record is
+    in memory or on disk. values() and items() read spilled records without
+    bringing them back into memory.
+    """
+
+    def __init__(self, max_in_memory: int = DEFAULT_MEMORY_RECORDS, directory: Optional[str] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            max_in_memory: Maximum number of records kept as objects
+            directory: Directory for the spill file. If None, uses the system temp directory.
+            logger: Logger instance
+        """
+        if max_in_memory < 1:
+            raise ValueError(f"max_in_memory must be at least 1, got {max_in_memory}")
+        self.max_in_memory = max_in_memory
+        self.spill_batch = max(1, int(max_in_memory * SPILL_FRACTION))
+        self.directory = directory
+        self.logger = logger or logging.getLogger('analyzeMFT.record_store')
+
+        self.hot: "OrderedDict[int, Any]" = OrderedDict()
+        self.positions: Dict[int, int] = {}
+        self.next_position = 0
+        self.disk_count = 0
+        self.hot_on_disk = set()
+        self.conn: Optional[sqlite3.Connection] = None
+        self.path: Optional[str] = None
+        self.stats = {
+            'hits': 0,
+            'disk_reads': 0,
+            'spilled': 0,
+            'spill_batches': 0,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.conn is None:
+            fd, self.path = tempfile.mkstemp(prefix='analyzeMFT_records_', suffix='.db', dir=self.directory)
+            os.close(fd)
+            self.conn = sqlite3.connect(self.path)
+            self.conn.execute("PRAGMA journal_mode = OFF")
+            self.conn.execute("PRAGMA synchronous = OFF")
+            self.conn.execute("""
+                CREATE TABLE records (
+                    recordnum INTEGER PRIMARY KEY,
+                    position INTEGER NOT NULL,
+                    data BLOB NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX idx_records_position ON records (position)")
+            self.logger.info(f"Spilling records beyond {self.max_in_memory:,} to {self.path}")
+        return self.conn
+
+    @staticmethod
+    def _dump(record: Any) -> bytes:
+        return zlib.compress(pickle.dumps(record, pickle.HIGHEST_PROTOCOL), COMPRESSION_LEVEL)
+
+    @staticmethod
+    def _load(data: bytes) -> Any:
+        return pickle.loads(zlib.decompress(data))
+
+    @property
+    def cold_count(self) -> int:
+        """Number of records held only on disk."""
+        return self.disk_count - len(self.hot_on_disk)
+
+    def _spill(self) -> None:
+        rows = []
+        for _ in range(min(self.spill_batch, len(self.hot))):
+            recordnum, record = self.hot.popitem(last=False)
+            rows.append((recordnum, self.positions.pop(recordnum), self._dump(record)))
+            if recordnum in self.hot_on_disk:
+                self.hot_on_disk.remove(recordnum)
+            else:
+                self.disk_count += 1
+        conn = self._connect()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO records (recordnum, position, data) VALUES (?, ?, ?)", rows)
+        self.stats['spilled'] += len(rows)
+        self.stats['spill_batches'] += 1
+
+    def _read_cold(self, recordnum: int, with_record: bool = True) -> Optional[Tuple[int, Any]]:
+        """Return the (position, record) of a record held only on disk, or None."""
+        if not self.cold_count or recordnum in self.hot_on_disk:
+            return None
+        column = "data" if with_record else "NULL"
+        row = self.conn.execute(f"SELECT position, {column} FROM records WHERE recordnum = ?",
+                                (recordnum,)).fetchone()
+        if row is None:
+            return None
+        if not with_record:
+            return row[0], None
+        self.stats['disk_reads'] += 1
+        return row[0], self._load(row[1])
+
+    def _promote(self, recordnum: int, position: int, record: Any) -> None:
+        """Bring a record read from disk into the hot set, leaving its row in place."""
+        self.hot_on_disk.add(recordnum)
+        self._insert_hot(recordnum, position, record)
+
+    def _insert_hot(self, recordnum: int, position: int, record: Any) -> None:
+        self.hot[recordnum] = record
+        self.positions[recordnum] = position
+        if len(self.hot) > self.max_in_memory:
+            self._spill()
+
+    def __getitem__(self, recordnum: int) -> Any:
+        record = self.hot.get(recordnum)
+        if record is not None or recordnum in self.hot:
+            self.hot.move_to_end(recordnum)
+            self.stats['hits'] += 1
+            return record
+        cold = self._read_cold(recordnum)
+        if cold is None:
+            raise KeyError(recordnum)
+        position, record = cold
+        self._promote(recordnum, position, record)
+        return record
+
+    def __setitem__(self, recordnum: int, record: Any) -> None:
+        if recordnum in self.hot:
+            self.hot[recordnum] = record
+            self.hot.move_to_end(recordnum)
+            return
+        cold = self._read_cold(recordnum, with_record=False)
+        if cold is not None:
+            self._promote(recordnum, cold[0], record)
+        else:
+            self._insert_hot(recordnum, self.next_position, record)
+            self.next_position += 1
+
+    def __delitem__(self, recordnum: int) -> None:
+        if recordnum in self.hot:
+            del self.hot[recordnum]
+            del self.positions[recordnum]
+            if recordnum not in self.hot_on_disk:
+                return
+            self.hot_on_disk.remove(recordnum)
+        elif self._read_cold(recordnum, with_record=False) is None:
+            raise KeyError(recordnum)
+        with self.conn:
+            self.conn.execute("DELETE FROM records WHERE recordnum = ?", (recordnum,))
+        self.disk_count -= 1
+
+    def __contains__(self, recordnum: object) -> bool:
+        if recordnum in self.hot:
+            return True
+        return self._read_cold(recordnum, with_record=False) is not None
+
+    def __len__(self) -> int:
+        return len(self.hot) + self.cold_count
+
+    def _ordered(self, with_records: bool) -> Iterator[Tuple[int, int, Any]]:
+        """Yield (position, recordnum, record or None) for every record in insertion order."""
+        hot = sorted((self.positions[recordnum], recordnum, record if with_records else None)
+                     for recordnum, record in self.hot.items())
+        if not self.disk_count:
+            return iter(hot)
+        # Rows of records taken into the snapshot are skipped, including ones
+        # rewritten by a spill while the cursor is open
+        hot_keys = {recordnum for _, recordnum, _ in hot}
+        columns = "position, recordnum, data" if with_records else "position, recordnum, NULL"
+        cursor = self.conn.execute(f"SELECT {columns} FROM records ORDER BY position")
+        cold = ((position, recordnum, self._load(data) if with_records else None)
+                for position, recordnum, data in cursor if recordnum not in hot_keys)
+        return heapq.merge(hot, cold, key=lambda entry: entry[0])
+
+    def __iter__(self) -> Iterator[int]:
+        for _, recordnum, _ in self._ordered(False):
+            yield recordnum
+
+    def values(self) -> Iterator[Any]:
+        for _, _, record in self._ordered(True):
+            yield record
+
+    def items(self) -> Iterator[Tuple[int, Any]]:
+        for _, recordnum, record in self._ordered(True):
+            yield recordnum, record
+
+    def clear(self) -> None:
+        self.hot.clear()
+        self.positions.clear()
+        self.hot_on_disk.clear()
+        if self.disk_count:
+            with self.conn:
+                self.conn.execute("DELETE FROM records")
+            self.disk_count = 0
+
+    def close(self) -> None:
+        """Drop every record and delete the spill file."""
+        self.hot.clear()
+        self.positions.clear()
+        self.hot_on_disk.clear()
+        self.disk_count = 0
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                self.logger.warning(f"Could not remove spill file {self.path}: {e}")
+            self.path = None
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = dict(self.stats)
+        stats['in_memory'] = len(self.hot)
+        stats['on_disk'] = self.cold_count
+        return stats
+
+    def __enter__(self) -> 'RecordStore':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -38,10 +38,10 @@ CREATE TABLE IF NOT EXISTS mft_records (
     birth_domain_id TEXT,
     
     -- Hash information (if computed)
-    md5_hash TEXT,
-    sha256_hash TEXT,
-    sha512_hash TEXT,
-    crc32_hash TEXT,
+    md5_hash BLOB,
+    sha256_hash BLOB,
+    sha512_hash BLOB,
+    crc32_hash BLOB,
     
     -- Metadata
     is_active BOOLEAN,
@@ -62,6 +62,10 @@ CREATE TABLE IF NOT EXISTS mft_attributes (
     attribute_size INTEGER,
     resident BOOLEAN,
     data_size INTEGER,
+    attribute_id INTEGER,
+    attribute_offset INTEGER,
+    content_offset INTEGER,
+    allocated_size INTEGER,
     content_preview TEXT,
     FOREIGN KEY (record_number) REFERENCES mft_records(record_number),
     FOREIGN KEY (attribute_type) REFERENCES attribute_types(id)
@@ -73,8 +77,8 @@ CREATE TABLE IF NOT EXISTS alternate_data_streams (
     record_number INTEGER,
     stream_name TEXT,
     stream_size INTEGER,
-    md5_hash TEXT,
-    sha256_hash TEXT,
+    md5_hash BLOB,
+    sha256_hash BLOB,
     FOREIGN KEY (record_number) REFERENCES mft_records(record_number)
 );
 
@@ -99,6 +103,22 @@ CREATE INDEX IF NOT EXISTS idx_mft_records_creation_time ON mft_records(si_creat
 CREATE INDEX IF NOT EXISTS idx_mft_records_modification_time ON mft_records(si_modification_time);
 CREATE INDEX IF NOT EXISTS idx_mft_attributes_record_type ON mft_attributes(record_number, attribute_type);
 
+-- Directory tree in nested-set form, built after the load: a directory's subtree
+-- is every row whose lft lies between its lft and rgt
+CREATE TABLE IF NOT EXISTS directories (
+    id INTEGER PRIMARY KEY,
+    parent_id INTEGER,
+    name TEXT,
+    path TEXT,
+    lft INTEGER NOT NULL,
+    rgt INTEGER NOT NULL,
+    depth INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_directories_lft ON directories(lft);
+CREATE INDEX IF NOT EXISTS idx_directories_parent ON directories(parent_id);
+CREATE INDEX IF NOT EXISTS idx_directories_path ON directories(path);
+
 -- Views for common queries
 CREATE VIEW IF NOT EXISTS active_files AS
 SELECT * FROM mft_records 
@@ -112,6 +132,12 @@ CREATE VIEW IF NOT EXISTS deleted_files AS
 SELECT * FROM mft_records 
 WHERE is_deleted = 1;
 
+-- Full path of every record, including paths left to be derived from the parent directory
+CREATE VIEW IF NOT EXISTS record_paths AS
+SELECT r.record_number,
+       COALESCE(r.filepath, d.path || '\' || r.filename) AS filepath
+FROM mft_records r LEFT JOIN directories d ON d.id = r.parent_record_number;
+
 CREATE VIEW IF NOT EXISTS timeline_view AS
 SELECT 
     record_number,
@@ -5,19 +5,184 @@ SQLite database writer for MFT analysis results
 import sqlite3
 import logging
 import os
+import queue
+import threading
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from .mft_record import MftRecord
+from typing import List, Optional, Dict, Any, Tuple
+import time
+from array import array
+from collections import defaultdict
+from .constants import DATA_ATTRIBUTE, FILE_RECORD_IN_USE, FILE_RECORD_IS_DIRECTORY
+from .mft_record import MftRecord, TIMESTAMP_KEYS
+from .windows_time import format_filetimes
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+FILE_REFERENCE_MASK = 0x0000FFFFFFFFFFFF
+
+# Timestamps are stored as crtime, mtime, ctime, atime; the columns are creation, modification, access, entry
+TIME_COLUMNS = tuple(TIMESTAMP_KEYS.index(key) for key in ('crtime', 'mtime', 'atime', 'ctime'))
+TIME_COLUMNS = TIME_COLUMNS + tuple(4 + index for index in TIME_COLUMNS)
+
+SCHEMA_INDEXES = (
+    ("idx_mft_records_filepath", "mft_records(filepath)"),
+    ("idx_mft_records_filename", "mft_records(filename)"),
+    ("idx_mft_records_parent", "mft_records(parent_record_number)"),
+    ("idx_mft_records_flags", "mft_records(flags)"),
+    ("idx_mft_records_creation_time", "mft_records(si_creation_time)"),
+    ("idx_mft_records_modification_time", "mft_records(si_modification_time)"),
+)
+# Needed while loading, to drop the attributes of a record that is written again
+LOAD_INDEXES = (
+    ("idx_mft_attributes_record_type", "mft_attributes(record_number, attribute_type)"),
+)
+
+# Columns added to mft_attributes after the first schema version
+ATTRIBUTE_COLUMNS = (
+    ("attribute_id", "INTEGER"),
+    ("attribute_offset", "INTEGER"),
+    ("content_offset", "INTEGER"),
+    ("allocated_size", "INTEGER"),
+)
+
+# Directory tree in nested-set form: every directory below another has lft and rgt
+# inside the ancestor's interval, so a subtree is one range scan on lft
+DIRECTORY_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS directories (
+        id INTEGER PRIMARY KEY,
+        parent_id INTEGER,
+        name TEXT,
+        path TEXT,
+        lft INTEGER NOT NULL,
+        rgt INTEGER NOT NULL,
+        depth INTEGER NOT NULL
+    )
+"""
+DIRECTORY_INDEXES = (
+    ("idx_directories_lft", "directories(lft)"),
+    ("idx_directories_parent", "directories(parent_id)"),
+    ("idx_directories_path", "directories(path)"),
+)
+# Full path of every record, whether stored or left to be derived from the parent directory
+RECORD_PATHS_VIEW_SQL = """
+    CREATE VIEW IF NOT EXISTS record_paths AS
+    SELECT r.record_number,
+           COALESCE(r.filepath, d.path || '\\' || r.filename) AS filepath
+    FROM mft_records r LEFT JOIN directories d ON d.id = r.parent_record_number
+"""
+PATH_SEPARATOR = "\\"
+
+# Settings for loading into a fresh database: the rollback journal stays in memory,
+# nothing is fsynced until the load is finished, and index sorts stay off disk.
+# The page cache is set apart, in KiB, so a memory budget can shrink it; a cache
+# below the default also moves index sorts to temporary files, which holds sorts
+# to the cache size instead of the whole index.
+BULK_LOAD_PRAGMAS = (
+    ("journal_mode", "MEMORY"),
+    ("synchronous", "OFF"),
+)
+BULK_LOAD_CACHE_KIB = 256 * 1024
+MIN_CACHE_KIB = 2000
+SAFE_PRAGMAS = (
+    ("journal_mode", "DELETE"),
+    ("synchronous", "FULL"),
+    ("cache_size", -2000),
+    ("temp_store", "DEFAULT"),
+)
+
+# Full-text index over names and paths. mft_records holds the text, the index only the
+# tokens. Trigram tokens answer any substring of three or more characters; unicode61
+# is the fallback for SQLite builds before 3.34 and matches whole words only.
+SEARCH_TOKENIZERS = ("trigram", "unicode61")
+SEARCH_TABLE_SQL = """
+    CREATE VIRTUAL TABLE mft_search USING fts5(
+        filename, filepath, content='mft_records', content_rowid='record_number', tokenize='{tokenizer}'
+    )
+"""
+SEARCH_TRIGGERS = (
+    ("mft_search_insert", """
+        AFTER INSERT ON mft_records BEGIN
+            INSERT INTO mft_search (rowid, filename, filepath) VALUES (new.record_number, new.filename, new.filepath);
+        END
+    """),
+    ("mft_search_delete", """
+        AFTER DELETE ON mft_records BEGIN
+            INSERT INTO mft_search (mft_search, rowid, filename, filepath)
+            VALUES ('delete', old.record_number, old.filename, old.filepath);
+        END
+    """),
+    ("mft_search_update", """
+        AFTER UPDATE OF record_number, filename, filepath ON mft_records BEGIN
+            INSERT INTO mft_search (mft_search, rowid, filename, filepath)
+            VALUES ('delete', old.record_number, old.filename, old.filepath);
+            INSERT INTO mft_search (rowid, filename, filepath) VALUES (new.record_number, new.filename, new.filepath);
+        END
+    """),
+)
+SEARCH_COLUMNS = ("filename", "filepath")
+MIN_TRIGRAM_LENGTH = 3
+
+DEFAULT_QUEUE_BATCHES = 8
+ROW_MEMORY_ESTIMATE = 1024  # Bytes per record of prepared mft_records and mft_attributes rows
+DEFAULT_COMMIT_ROWS = 100000
+DEFAULT_COMMIT_INTERVAL = 5.0
+
+RECORD_INSERT_SQL = """
+    INSERT OR REPLACE INTO mft_records (
+        record_number, sequence_number, flags, used_size, allocated_size,
+        base_record_number, next_attribute_id, filepath, filename,
+        parent_record_number, parent_sequence_number,
+        si_creation_time, si_modification_time, si_access_time, si_entry_time,
+        fn_creation_time, fn_modification_time, fn_access_time, fn_entry_time,
+        file_attributes, allocated_file_size, real_file_size,
+        object_id, birth_volume_id, birth_object_id, birth_domain_id,
+        md5_hash, sha256_hash, sha512_hash, crc32_hash,
+        is_active, is_directory, is_deleted, has_ads
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+ATTRIBUTE_DELETE_SQL = "DELETE FROM mft_attributes WHERE record_number = ?"
+ATTRIBUTE_INSERT_SQL = """
+    INSERT INTO mft_attributes (
+        record_number, attribute_type, attribute_name, attribute_size, resident, data_size,
+        attribute_id, attribute_offset, content_offset, allocated_size
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
 
 
 class SQLiteWriter:
     """Handles writing MFT analysis results to SQLite database"""
     
-    def __init__(self, database_path: str, logger: Optional[logging.Logger] = None):
+    def __init__(self, database_path: str, logger: Optional[logging.Logger] = None, bulk_load: bool = False,
+                 full_text: bool = False, compact_paths: bool = False, cache_kib: int = BULK_LOAD_CACHE_KIB):
+        """
+        Args:
+            database_path: Path to the SQLite database file
+            logger: Logger instance
+            bulk_load: Tune the connection for ingest and build the schema indexes
+                only when the load is finished, see finish_bulk_load()
+            full_text: Maintain the mft_search full-text index over filename and filepath
+            compact_paths: When the directory index is built, clear every filepath that
+                equals its parent directory's path plus its filename; read full paths
+                from the record_paths view
+            cache_kib: Page cache size in KiB while bulk loading; below
+                BULK_LOAD_CACHE_KIB index sorts spill to temporary files
+        """
         self.database_path = Path(database_path)
         self.logger = logger or logging.getLogger('analyzeMFT.sqlite')
         self.conn: Optional[sqlite3.Connection] = None
         self.cursor: Optional[sqlite3.Cursor] = None
+        self.bulk_load = bulk_load
+        self.bulk_loading = False
+        self.attribute_type_ids: Optional[set] = None
+        self.full_text = full_text
+        self.search_tokenizer: Optional[str] = None
+        self.compact_paths = compact_paths
+        self.paths_compacted = False
+        self.cache_kib = cache_kib
         
     def __enter__(self):
         self.connect()
@@ -29,7 +194,18 @@ class SQLiteWriter:
     def connect(self) -> None:
         """Connect to SQLite database and initialize schema"""
         try:            self.database_path.parent.mkdir(parents=True, exist_ok=True)            self.conn = sqlite3.connect(str(self.database_path))
-            self.cursor = self.conn.cursor()            self.cursor.execute("PRAGMA foreign_keys = ON")            self._initialize_schema()
+            self.cursor = self.conn.cursor()            self.cursor.execute("PRAGMA foreign_keys = ON")
+            if self.bulk_load:
+                temp_store = "MEMORY" if self.cache_kib >= BULK_LOAD_CACHE_KIB else "FILE"
+                self._set_pragmas(BULK_LOAD_PRAGMAS + (("cache_size", -self.cache_kib), ("temp_store", temp_store)))
+                self.bulk_loading = True
+            self._initialize_schema()
+            self.search_tokenizer = self._find_search_index()
+            if self.full_text:
+                self._setup_search_index()
+            if self.search_tokenizer is not None:
+                # REPLACE removes the old row without firing delete triggers unless this is on
+                self.cursor.execute("PRAGMA recursive_triggers = ON")
             
             self.logger.info(f"Connected to SQLite database: {self.database_path}")
             
@@ -41,14 +217,283 @@ class SQLiteWriter:
         """Close database connection"""
         if self.conn:
             self.conn.commit()
+            if self.bulk_loading:
+                self.finish_bulk_load()
             self.conn.close()
+            self.conn = None
+            self.cursor = None
             self.logger.info("SQLite database connection closed")
+
+    def _set_pragmas(self, pragmas) -> None:
+        for name, value in pragmas:
+            self.cursor.execute(f"PRAGMA {name} = {value}")
+
+    def _create_indexes(self, indexes=SCHEMA_INDEXES) -> None:
+        for name, target in indexes:
+            self.cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+    def _upgrade_schema(self) -> None:
+        """Add columns and indexes missing from a database written by an older version."""
+        existing = {row[1] for row in self.cursor.execute("PRAGMA table_info(mft_attributes)").fetchall()}
+        for name, column_type in ATTRIBUTE_COLUMNS:
+            if name not in existing:
+                self.cursor.execute(f"ALTER TABLE mft_attributes ADD COLUMN {name} {column_type}")
+        self._create_indexes(LOAD_INDEXES)
+        self._create_directory_table()
+
+    def _create_directory_table(self) -> None:
+        self.cursor.execute(DIRECTORY_TABLE_SQL)
+        self._create_indexes(DIRECTORY_INDEXES)
+        self.cursor.execute(RECORD_PATHS_VIEW_SQL)
+
+    def build_directory_index(self) -> int:
+        """
+        Rebuild the directories table from the directory rows of mft_records.
+
+        Each directory gets its parent, its path and a nested-set interval and depth
+        computed in one depth-first walk. Directories whose parent is missing, or is
+        the directory itself, are roots; a parent loop is cut where the walk meets it.
+        With compact_paths, record paths that the record_paths view can derive are
+        cleared afterwards. Called by finish_bulk_load().
+
+        Returns:
+            Number of directories indexed
+        """
+        start_time = time.time()
+        rows = self.cursor.execute("""
+            SELECT r.record_number, r.parent_record_number, r.filename, p.filepath
+            FROM mft_records r JOIN record_paths p ON p.record_number = r.record_number
+            WHERE r.is_directory = 1
+            ORDER BY r.record_number
+        """).fetchall()
+        directories = {row[0]: row for row in rows}
+        children = defaultdict(list)
+        roots = []
+        for recordnum, parent, _, _ in rows:
+            if parent in directories and parent != recordnum:
+                children[parent].append(recordnum)
+            else:
+                roots.append(recordnum)
+
+        intervals: Dict[int, list] = {}
+        counter = 0
+        for root in roots + [recordnum for recordnum in directories if recordnum not in roots]:
+            if root in intervals:
+                continue
+            stack = [(root, 0)]
+            while stack:
+                recordnum, depth = stack.pop()
+                if recordnum < 0:
+                    intervals[~recordnum][1] = counter
+                    counter += 1
+                    continue
+                if recordnum in intervals:
+                    continue
+                intervals[recordnum] = [counter, None, depth]
+                counter += 1
+                stack.append((~recordnum, depth))
+                stack.extend((child, depth + 1) for child in reversed(children[recordnum]) if child not in intervals)
+
+        self.cursor.execute("DELETE FROM directories")
+        self.cursor.executemany(
+            "INSERT INTO directories (id, parent_id, name, path, lft, rgt, depth) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(recordnum, parent, name, path) + tuple(intervals[recordnum])
+             for recordnum, parent, name, path in rows]
+        )
+
+        if self.compact_paths:
+            if self.search_tokenizer is not None:
+                self.logger.warning("The full-text index searches stored paths; keeping full paths in mft_records")
+            else:
+                self.cursor.execute("""
+                    UPDATE mft_records SET filepath = NULL
+                    WHERE filepath = (SELECT d.path || ? || mft_records.filename FROM directories d
+                                      WHERE d.id = mft_records.parent_record_number)
+                """, (PATH_SEPARATOR,))
+                self.paths_compacted = True
+        self.conn.commit()
+        self.logger.info(f"Indexed {len(rows):,} directories in {time.time() - start_time:.3f}s")
+        return len(rows)
+
+    def find_directory(self, path: str) -> Optional[int]:
+        """Return the record number of the directory with this full path, or None."""
+        row = self.cursor.execute("SELECT id FROM directories WHERE path = ?", (path,)).fetchone()
+        return row[0] if row else None
+
+    def subtree(self, directory: int, max_depth: Optional[int] = None) -> List[Tuple[int, str, int]]:
+        """
+        List every record below a directory using its nested-set interval.
+
+        Args:
+            directory: Record number of the directory
+            max_depth: Only return records at most this many levels below it
+
+        Returns:
+            List of (record_number, filename, depth) tuples ordered by record number,
+            where the directory's own entries have depth 1
+        """
+        sql = """
+            SELECT r.record_number, r.filename, d.depth - a.depth + 1
+            FROM directories a
+            JOIN directories d ON d.lft BETWEEN a.lft AND a.rgt
+            JOIN mft_records r ON r.parent_record_number = d.id AND r.record_number != d.id
+            WHERE a.id = ?
+        """
+        params: List[Any] = [directory]
+        if max_depth is not None:
+            sql += " AND d.depth - a.depth < ?"
+            params.append(max_depth)
+        return self.cursor.execute(sql + " ORDER BY r.record_number", params).fetchall()
+
+    def directory_size(self, directory: int) -> Tuple[int, int]:
+        """
+        Roll up the files below a directory at any depth.
+
+        Returns:
+            Tuple of (number of files, sum of their real sizes)
+        """
+        return self.cursor.execute("""
+            SELECT COUNT(*), COALESCE(SUM(r.real_file_size), 0)
+            FROM directories a
+            JOIN directories d ON d.lft BETWEEN a.lft AND a.rgt
+            JOIN mft_records r ON r.parent_record_number = d.id
+            WHERE a.id = ? AND r.is_directory = 0
+        """, (directory,)).fetchone()
+
+    def _drop_indexes(self) -> None:
+        for name, _ in SCHEMA_INDEXES:
+            self.cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+    def finish_bulk_load(self) -> None:
+        """
+        Build the deferred indexes, refresh the query planner statistics and switch
+        the connection back to durable settings. Called by close() if still loading.
+        """
+        if not self.bulk_loading:
+            return
+        start_time = time.time()
+        self.conn.commit()
+        self.build_directory_index()
+        self._create_indexes()
+        if self.full_text:
+            self._rebuild_search_index()
+        self.cursor.execute("ANALYZE")
+        self.conn.commit()
+        self._set_pragmas(SAFE_PRAGMAS)
+        if self.paths_compacted:
+            # Return the pages freed by the cleared paths to the file system
+            self.cursor.execute("VACUUM")
+        self.bulk_loading = False
+        self.logger.info(f"Built indexes and statistics in {time.time() - start_time:.3f}s")
             
+    def _find_search_index(self) -> Optional[str]:
+        """Return the tokenizer of an existing mft_search table, or None if there is none."""
+        row = self.cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='mft_search'").fetchone()
+        if row is None:
+            return None
+        return next((tokenizer for tokenizer in SEARCH_TOKENIZERS if tokenizer in row[0]), SEARCH_TOKENIZERS[-1])
+
+    def _setup_search_index(self) -> None:
+        """
+        Create the full-text index if needed and keep it in sync with mft_records through
+        triggers. While bulk loading the triggers are left out and the index is rebuilt
+        in one pass by finish_bulk_load().
+        """
+        created = False
+        if self.search_tokenizer is None:
+            error = None
+            for tokenizer in SEARCH_TOKENIZERS:
+                try:
+                    self.cursor.execute(SEARCH_TABLE_SQL.format(tokenizer=tokenizer))
+                    self.search_tokenizer = tokenizer
+                    break
+                except sqlite3.OperationalError as e:
+                    error = e
+            if self.search_tokenizer is None:
+                self.logger.warning(f"SQLite full-text index not available, skipping it: {error}")
+                self.full_text = False
+                return
+            if self.search_tokenizer != SEARCH_TOKENIZERS[0]:
+                self.logger.warning("SQLite has no trigram tokenizer; the full-text index matches whole words only")
+            created = True
+
+        if self.bulk_loading:
+            for name, _ in SEARCH_TRIGGERS:
+                self.cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        elif created:
+            self._rebuild_search_index()
+        else:
+            self._create_search_triggers()
+        self.conn.commit()
+
+    def _create_search_triggers(self) -> None:
+        for name, body in SEARCH_TRIGGERS:
+            self.cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+    def _rebuild_search_index(self) -> None:
+        """Index every row of mft_records again and install the sync triggers."""
+        self.cursor.execute("INSERT INTO mft_search (mft_search) VALUES ('rebuild')")
+        self._create_search_triggers()
+
+    def search(self, text: str, prefix: bool = False, column: Optional[str] = None,
+               limit: Optional[int] = 100) -> List[Tuple[int, str, str]]:
+        """
+        Find records by a piece of their filename or filepath, ignoring case.
+
+        With a trigram index any substring of three or more characters is looked up
+        in the index. A unicode61 index can only serve prefix searches for a single
+        word. Everything else, and databases without an index, scan mft_records with
+        paths read through record_paths, so compacted paths are found as well.
+
+        Args:
+            text: Text to look for
+            prefix: Match only at the start of the column instead of anywhere in it
+            column: 'filename' or 'filepath'; None searches both, or only filename for prefix searches
+            limit: Maximum number of rows to return, or None for all
+
+        Returns:
+            List of (record_number, filename, filepath) tuples ordered by record number
+        """
+        if column is None:
+            columns = ("filename",) if prefix else SEARCH_COLUMNS
+        elif column in SEARCH_COLUMNS:
+            columns = (column,)
+        else:
+            raise ValueError(f"Cannot search column {column!r}, expected one of {', '.join(SEARCH_COLUMNS)}")
+
+        escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = escaped + "%" if prefix else "%" + escaped + "%"
+        params: List[Any] = [pattern] * len(columns)
+
+        use_index = self.search_tokenizer == "trigram" and len(text) >= MIN_TRIGRAM_LENGTH
+        if self.search_tokenizer == "unicode61" and prefix and text.isalnum():
+            use_index = True
+        if use_index:
+            phrase = '"' + text.replace('"', '""') + '"' + ("*" if self.search_tokenizer == "unicode61" else "")
+            query = "{" + " ".join(columns) + "} : " + phrase
+            like = " OR ".join(f"{name} LIKE ? ESCAPE '\\'" for name in columns)
+            # The index narrows the candidates; LIKE keeps exact substring or prefix semantics
+            sql = (f"SELECT rowid, filename, filepath FROM mft_search WHERE mft_search MATCH ? AND ({like}) "
+                   f"ORDER BY rowid")
+            params.insert(0, query)
+        else:
+            sources = {"filename": "r.filename", "filepath": "p.filepath"}
+            like = " OR ".join(f"{sources[name]} LIKE ? ESCAPE '\\'" for name in columns)
+            sql = (f"SELECT r.record_number, r.filename, p.filepath FROM mft_records r "
+                   f"JOIN record_paths p ON p.record_number = r.record_number WHERE {like} ORDER BY r.record_number")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self.cursor.execute(sql, params).fetchall()
+
     def _initialize_schema(self) -> None:
         """Initialize database schema"""
         try:            self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='mft_records'")
             if self.cursor.fetchone():
                 self.logger.info("Database schema already exists, skipping initialization")
+                self._upgrade_schema()
+                if self.bulk_loading:
+                    self._drop_indexes()
                 return
             
             self.logger.info("Initializing new database schema")            self._create_tables()            self._populate_reference_tables()
@@ -111,10 +556,10 @@ class SQLiteWriter:
                 birth_domain_id TEXT,
                 
                 -- Hash information (if computed)
-                md5_hash TEXT,
-                sha256_hash TEXT,
-                sha512_hash TEXT,
-                crc32_hash TEXT,
+                md5_hash BLOB,
+                sha256_hash BLOB,
+                sha512_hash BLOB,
+                crc32_hash BLOB,
                 
                 -- Metadata
                 is_active BOOLEAN,
@@ -134,22 +579,19 @@ class SQLiteWriter:
                 attribute_size INTEGER,
                 resident BOOLEAN,
                 data_size INTEGER,
+                attribute_id INTEGER,
+                attribute_offset INTEGER,
+                content_offset INTEGER,
+                allocated_size INTEGER,
                 content_preview TEXT,
                 FOREIGN KEY (record_number) REFERENCES mft_records(record_number),
                 FOREIGN KEY (attribute_type) REFERENCES attribute_types(id)
             )
-        """)        indexes = [
-            "CREATE INDEX IF NOT EXISTS idx_mft_records_filepath ON mft_records(filepath)",
-            "CREATE INDEX IF NOT EXISTS idx_mft_records_filename ON mft_records(filename)",
-            "CREATE INDEX IF NOT EXISTS idx_mft_records_parent ON mft_records(parent_record_number)",
-            "CREATE INDEX IF NOT EXISTS idx_mft_records_flags ON mft_records(flags)",
-            "CREATE INDEX IF NOT EXISTS idx_mft_records_creation_time ON mft_records(si_creation_time)",
-            "CREATE INDEX IF NOT EXISTS idx_mft_records_modification_time ON mft_records(si_modification_time)",
-            "CREATE INDEX IF NOT EXISTS idx_mft_attributes_record_type ON mft_attributes(record_number, attribute_type)"
-        ]
-        
-        for index_sql in indexes:
-            self.cursor.execute(index_sql)        self.cursor.execute("""
+        """)
+        self._create_indexes(LOAD_INDEXES)
+        if not self.bulk_loading:
+            self._create_indexes()
+        self.cursor.execute("""
             CREATE VIEW IF NOT EXISTS active_files AS
             SELECT * FROM mft_records 
             WHERE is_active = 1 AND is_directory = 0
@@ -166,6 +608,7 @@ class SQLiteWriter:
             SELECT * FROM mft_records 
             WHERE is_deleted = 1
         """)
+        self._create_directory_table()
 
     def _populate_reference_tables(self) -> None:
         """Populate reference tables with static data"""        attribute_types = [
@@ -203,19 +646,8 @@ class SQLiteWriter:
         
     def write_record(self, record: MftRecord, filepath: str = "") -> None:
         """Write a single MFT record to database"""
-        try:            record_data = self._prepare_record_data(record, filepath)            self.cursor.execute("""
-                INSERT OR REPLACE INTO mft_records (
-                    record_number, sequence_number, flags, used_size, allocated_size,
-                    base_record_number, next_attribute_id, filepath, filename,
-                    parent_record_number, parent_sequence_number,
-                    si_creation_time, si_modification_time, si_access_time, si_entry_time,
-                    fn_creation_time, fn_modification_time, fn_access_time, fn_entry_time,
-                    file_attributes, allocated_file_size, real_file_size,
-                    object_id, birth_volume_id, birth_object_id, birth_domain_id,
-                    md5_hash, sha256_hash, sha512_hash, crc32_hash,
-                    is_active, is_directory, is_deleted, has_ads
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, record_data)            self._write_attributes(record)
+        try:            record_data = self._prepare_record_data(record, filepath)
+            self.insert_batch(([record_data], self._prepare_attribute_rows(record, record_data[0])))
             
         except Exception as e:
             self.logger.error(f"Error writing record {record.recordnum}: {e}")
@@ -223,139 +655,185 @@ class SQLiteWriter:
             
     def write_records_batch(self, records: List[MftRecord], filepaths: Dict[int, str] = None) -> None:
         """Write multiple records in a batch"""
-        if filepaths is None:
-            filepaths = {}
-            
         try:
-            self.logger.info(f"Writing batch of {len(records)} records to SQLite database")            for record in records:
-                try:
-                    filepath = filepaths.get(getattr(record, 'recordnum', 0), "")
-                    recordnum = getattr(record, 'recordnum', 0)
-                    filename = getattr(record, 'filename', None)
-                    flags = getattr(record, 'flags', 0)                    self.cursor.execute("""
-                        INSERT OR REPLACE INTO mft_records (
-                            record_number, filepath, filename, flags, is_active, is_directory, is_deleted
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        recordnum,
-                        filepath,
-                        filename, 
-                        flags,
-                        bool(flags & 1) if flags else False,                        bool(flags & 2) if flags else False,                        not bool(flags & 1) if flags else True
-                    ))
-                    
-                except Exception as e:
-                    self.logger.warning(f"Error writing record {getattr(record, 'recordnum', 'unknown')}: {e}")
-                    continue
-                
+            self.logger.info(f"Writing batch of {len(records)} records to SQLite database")
+            batch = self.prepare_batch(records, filepaths)
+            self.insert_batch(batch)
             self.conn.commit()
-            self.logger.info(f"Successfully wrote batch of {len(records)} records to database")
+            self.logger.info(f"Successfully wrote batch of {len(batch[0])} records and "
+                             f"{len(batch[1])} attributes to database")
             
         except Exception as e:
             self.logger.error(f"Error writing record batch: {e}")
             if self.conn:
                 self.conn.rollback()
             raise
-            
-    def _prepare_record_data(self, record: MftRecord, filepath: str) -> tuple:
-        """Prepare record data for database insertion"""
-        from .constants import FILE_RECORD_IN_USE, FILE_RECORD_IS_DIRECTORY        def safe_getattr(obj, attr, default=None):
+
+    def prepare_batch(self, records: List[MftRecord],
+                      filepaths: Dict[int, str] = None) -> Tuple[List[tuple], List[tuple]]:
+        """
+        Convert records to row tuples for insert_batch(). Needs no connection, so it
+        can run on a different thread from the one that inserts.
+
+        Args:
+            records: Records to convert
+            filepaths: Resolved path for each record number
+
+        Returns:
+            Tuple of (mft_records rows, mft_attributes rows). When a record number
+            appears more than once the last record wins; records that cannot be
+            converted are logged and skipped.
+        """
+        if filepaths is None:
+            filepaths = {}
+        batch_times = self._format_times(records)
+        latest = {}
+        for record, times in zip(records, batch_times):
             try:
-                return getattr(obj, attr, default)
-            except (AttributeError, TypeError):
-                return default        parent_record_num = None
+                recordnum = getattr(record, 'recordnum', 0)
+                record_data = self._prepare_record_data(record, filepaths.get(recordnum, ""), times)
+                latest[recordnum] = (record_data, self._prepare_attribute_rows(record, recordnum))
+                
+            except Exception as e:
+                self.logger.warning(f"Error writing record {getattr(record, 'recordnum', 'unknown')}: {e}")
+                continue
+        record_rows = [record_data for record_data, _ in latest.values()]
+        attribute_rows = [row for _, rows in latest.values() for row in rows]
+        return record_rows, attribute_rows
+
+    def insert_batch(self, batch: Tuple[List[tuple], List[tuple]]) -> None:
+        """
+        Insert rows from prepare_batch() in the current transaction without committing.
+        Attributes already stored for the same record numbers are replaced.
+        """
+        record_rows, attribute_rows = batch
+        self._register_attribute_types(attribute_rows)
+        self.cursor.executemany(ATTRIBUTE_DELETE_SQL, [(row[0],) for row in record_rows])
+        self.cursor.executemany(RECORD_INSERT_SQL, record_rows)
+        if attribute_rows:
+            self.cursor.executemany(ATTRIBUTE_INSERT_SQL, attribute_rows)
+
+    def _prepare_attribute_rows(self, record: MftRecord, recordnum: int) -> List[tuple]:
+        """Build one mft_attributes row per attribute header kept by the record."""
+        headers = getattr(record, 'attribute_headers', None)
+        if not isinstance(headers, list):
+            return []
+        return [(recordnum, attr_type, name, length, resident, data_size, attr_id, offset, content_offset, allocated_size)
+                for (attr_type, name, resident, attr_id, offset, length, content_offset, data_size, allocated_size)
+                in headers]
+
+    def _register_attribute_types(self, attribute_rows: List[tuple]) -> None:
+        """Add attribute types missing from attribute_types so the foreign key holds."""
+        if self.attribute_type_ids is None:
+            self.attribute_type_ids = {row[0] for row in self.cursor.execute("SELECT id FROM attribute_types")}
+        unknown = {row[1] for row in attribute_rows} - self.attribute_type_ids
+        if unknown:
+            self.cursor.executemany("INSERT OR IGNORE INTO attribute_types (id, name) VALUES (?, ?)",
+                                    [(attr_type, f"UNKNOWN_{attr_type:#x}") for attr_type in sorted(unknown)])
+            self.attribute_type_ids |= unknown
+            
+    def _prepare_record_data(self, record: MftRecord, filepath: str, times: Optional[tuple] = None) -> tuple:
+        """Prepare record data for database insertion, with times preformatted by _format_times if given"""
+        flags = self._int_field(record, 'flags') or 0
+        parent_record_num = None
         try:
             if hasattr(record, 'get_parent_record_num'):
                 parent_record_num = record.get_parent_record_num()
         except Exception:
             pass
-            
-        parent_seq_num = safe_getattr(record, 'parent_sequence_number', None)        si_times = (None, None, None, None)        fn_times = (None, None, None, None)        file_info = (None, None, None)        object_info = (None, None, None, None)        hash_info = (
-            safe_getattr(record, 'md5', None),
-            safe_getattr(record, 'sha256', None),
-            safe_getattr(record, 'sha512', None),
-            safe_getattr(record, 'crc32', None)
-        )        flags = safe_getattr(record, 'flags', 0)
-        is_active = bool(flags & FILE_RECORD_IN_USE) if flags else False
-        is_directory = bool(flags & FILE_RECORD_IS_DIRECTORY) if flags else False
-        is_deleted = not is_active
-        has_ads = safe_getattr(record, 'has_ads', False)
-        
+        parent_ref = self._int_field(record, 'parent_ref')
+        base_ref = self._int_field(record, 'base_ref')
+        filename = getattr(record, 'filename', None)
+        is_active = bool(flags & FILE_RECORD_IN_USE)
+
         return (
-            safe_getattr(record, 'recordnum', 0),            safe_getattr(record, 'sequence_number', None),            flags,            safe_getattr(record, 'used_size', None),            safe_getattr(record, 'allocated_size', None),            safe_getattr(record, 'base_record_number', None),            safe_getattr(record, 'next_attribute_id', None),            filepath,            safe_getattr(record, 'filename', None),            parent_record_num,            parent_seq_num,            si_times[0], si_times[1], si_times[2], si_times[3],            fn_times[0], fn_times[1], fn_times[2], fn_times[3],            file_info[0], file_info[1], file_info[2],            object_info[0], object_info[1], object_info[2], object_info[3],            hash_info[0], hash_info[1], hash_info[2], hash_info[3],            is_active, is_directory, is_deleted, has_ads        )
-        
-    def _extract_si_times(self, record: MftRecord) -> tuple:
-        """Extract Standard Information timestamps"""
-        si_times = (None, None, None, None)
-        
-        if hasattr(record, 'standard_information') and record.standard_information:
-            si = record.standard_information
-            si_times = (
-                getattr(si, 'creation_time', None),
-                getattr(si, 'modification_time', None),
-                getattr(si, 'access_time', None),
-                getattr(si, 'entry_time', None)
-            )
-        
-        return si_times
-        
-    def _extract_fn_times(self, record: MftRecord) -> tuple:
-        """Extract File Name timestamps"""
-        fn_times = (None, None, None, None)
-        
-        if hasattr(record, 'file_name') and record.file_name:
-            fn = record.file_name
-            fn_times = (
-                getattr(fn, 'creation_time', None),
-                getattr(fn, 'modification_time', None),
-                getattr(fn, 'access_time', None),
-                getattr(fn, 'entry_time', None)
-            )
-        
-        return fn_times
-        
+            self._int_field(record, 'recordnum') or 0,
+            self._int_field(record, 'seq'),
+            flags,
+            self._int_field(record, 'size'),
+            self._int_field(record, 'alloc_sizef'),
+            base_ref & FILE_REFERENCE_MASK if base_ref is not None else None,
+            self._int_field(record, 'next_attrid'),
+            filepath,
+            filename if isinstance(filename, str) else None,
+            parent_record_num,
+            parent_ref >> 48 if parent_ref is not None else None,
+            *(times if times is not None else self._format_times([record])[0]),
+            *self._extract_file_info(record),
+            *self._extract_object_info(record),
+            *self._extract_hash_info(record),
+            is_active, bool(flags & FILE_RECORD_IS_DIRECTORY), not is_active, self._has_ads(record)
+        )
+
+    @staticmethod
+    def _int_field(record: MftRecord, name: str) -> Optional[int]:
+        """Return an integer field of the record, or None if it is missing or not an integer."""
+        value = getattr(record, name, None)
+        return value if isinstance(value, int) else None
+
+    def _format_times(self, records: List[MftRecord]) -> List[tuple]:
+        """
+        Format the $STANDARD_INFORMATION and $FILE_NAME times of every record with one
+        format_filetimes call, vectorised when NumPy is installed.
+
+        Returns:
+            One tuple per record of the eight time columns; None where a time is unset
+        """
+        empty = array('Q', bytes(8 * len(TIME_COLUMNS)))
+        rows = []
+        for record in records:
+            timestamps = getattr(record, 'timestamps', None)
+            is_full = isinstance(timestamps, array) and timestamps.typecode == 'Q' and len(timestamps) == 8
+            rows.append(timestamps if is_full else empty)
+
+        if HAS_NUMPY:
+            raw = np.frombuffer(b''.join(row.tobytes() for row in rows), dtype=np.uint64)
+            filetimes = raw.reshape(len(rows), 8)[:, list(TIME_COLUMNS)]
+            text = np.where(filetimes != 0, format_filetimes(filetimes).astype(object), None)
+            return [tuple(row) for row in text.tolist()]
+
+        filetimes = [row[index] for row in rows for index in TIME_COLUMNS]
+        text = [value if filetime else None for filetime, value in zip(filetimes, format_filetimes(filetimes))]
+        return [tuple(text[i:i + 8]) for i in range(0, len(text), 8)]
+
+    def _extract_si_times(self, record: MftRecord) -> tuple:
+        """Extract Standard Information timestamps"""
+        return self._format_times([record])[0][:4]
+
+    def _extract_fn_times(self, record: MftRecord) -> tuple:
+        """Extract File Name timestamps"""
+        return self._format_times([record])[0][4:]
+
     def _extract_file_info(self, record: MftRecord) -> tuple:
         """Extract file attributes and size information"""
-        file_attributes = None
-        allocated_size = None
-        real_size = None
-        
-        if hasattr(record, 'file_name') and record.file_name:
-            fn = record.file_name
-            file_attributes = getattr(fn, 'file_attributes', None)
-            allocated_size = getattr(fn, 'allocated_size', None)
-            real_size = getattr(fn, 'real_size', None)
-        
-        return (file_attributes, allocated_size, real_size)
-        
+        # MftRecord keeps only the real size from $FILE_NAME
+        return (None, None, self._int_field(record, 'filesize'))
+
     def _extract_object_info(self, record: MftRecord) -> tuple:
         """Extract Object ID information"""
-        object_id = None
-        birth_volume_id = None
-        birth_object_id = None
-        birth_domain_id = None
-        
-        if hasattr(record, 'object_id') and record.object_id:
-            oid = record.object_id
-            object_id = getattr(oid, 'object_id', None)
-            birth_volume_id = getattr(oid, 'birth_volume_id', None)
-            birth_object_id = getattr(oid, 'birth_object_id', None)
-            birth_domain_id = getattr(oid, 'birth_domain_id', None)
-        
-        return (object_id, birth_volume_id, birth_object_id, birth_domain_id)
-        
+        values = []
+        for name in ('object_id', 'birth_volume_id', 'birth_object_id', 'birth_domain_id'):
+            value = getattr(record, name, None)
+            values.append(value if isinstance(value, str) and value else None)
+        return tuple(values)
+
     def _extract_hash_info(self, record: MftRecord) -> tuple:
         """Extract hash information"""
-        md5_hash = getattr(record, 'md5', None)
-        sha256_hash = getattr(record, 'sha256', None)
-        sha512_hash = getattr(record, 'sha512', None)
-        crc32_hash = getattr(record, 'crc32', None)
-        
-        return (md5_hash, sha256_hash, sha512_hash, crc32_hash)
-        
-    def _write_attributes(self, record: MftRecord) -> None:
-        """Write attribute information for a record"""        pass
-            
+        values = []
+        for name in ('md5', 'sha256', 'sha512', 'crc32'):
+            value = getattr(record, name, None)
+            values.append(value if isinstance(value, (bytes, str)) else None)
+        return tuple(values)
+
+    @staticmethod
+    def _has_ads(record: MftRecord) -> bool:
+        """True if the record has a named $DATA attribute, as far as the kept attribute headers show."""
+        headers = getattr(record, 'attribute_headers', None)
+        if isinstance(headers, list):
+            return any(header[0] == DATA_ATTRIBUTE and header[1] for header in headers)
+        has_ads = getattr(record, 'has_ads', False)
+        return has_ads if isinstance(has_ads, bool) else False
+
     def create_indexes(self) -> None:
         """Create additional performance indexes"""
         indexes = [
@@ -397,4 +875,154 @@ class SQLiteWriter:
         except Exception as e:
             self.logger.error(f"Error getting statistics: {e}")
             
-        return stats
\ No newline at end of file
+        return stats
+
+
+class BackgroundSQLiteWriter:
+    """
+    Runs a SQLiteWriter on a dedicated thread that owns the connection.
+
+    Callers convert records to rows on their own thread with submit(), which hands
+    each batch to the writer through a bounded queue and blocks while the queue is
+    full, so parsing never gets more than queue_size batches ahead of the disk.
+    The writer commits once commit_rows rows are pending or commit_interval seconds
+    have passed since the last commit, whichever comes first.
+
+    An error on the writer thread stops the inserts; it is raised from the next
+    submit() or from close().
+    """
+
+    def __init__(self, database_path: str, logger: Optional[logging.Logger] = None, bulk_load: bool = True,
+                 queue_size: int = DEFAULT_QUEUE_BATCHES, commit_rows: int = DEFAULT_COMMIT_ROWS,
+                 commit_interval: float = DEFAULT_COMMIT_INTERVAL, full_text: bool = False,
+                 compact_paths: bool = False, cache_kib: int = BULK_LOAD_CACHE_KIB):
+        """
+        Args:
+            database_path: Path to the SQLite database file
+            logger: Logger instance
+            bulk_load: Open the database in SQLiteWriter bulk-load mode
+            queue_size: Maximum number of batches waiting to be inserted
+            commit_rows: Commit once this many rows have been inserted since the last commit
+            commit_interval: Commit once this many seconds have passed since the last commit
+            full_text: Build the mft_search full-text index, see SQLiteWriter
+            compact_paths: Store paths once per directory, see SQLiteWriter
+            cache_kib: Page cache size in KiB while bulk loading
+        """
+        self.logger = logger or logging.getLogger('analyzeMFT.sqlite')
+        self.writer = SQLiteWriter(database_path, self.logger, bulk_load=bulk_load, full_text=full_text,
+                                   compact_paths=compact_paths, cache_kib=cache_kib)
+        self.queue: "queue.Queue[Optional[Tuple[List[tuple], List[tuple]]]]" = queue.Queue(maxsize=queue_size)
+        self.commit_rows = commit_rows
+        self.commit_interval = commit_interval
+        self.thread: Optional[threading.Thread] = None
+        self.ready = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.closed = False
+        self.stats = {
+            'batches': 0,
+            'rows': 0,
+            'attribute_rows': 0,
+            'commits': 0,
+            'commit_time': 0.0,
+            'max_commit_latency': 0.0,
+            'max_queue_depth': 0,
+            'blocked_time': 0.0,
+        }
+
+    def start(self) -> None:
+        """Start the writer thread and wait until it has opened the database."""
+        self.thread = threading.Thread(target=self._run, name='analyzeMFT-sqlite-writer', daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.error is not None:
+            self.thread.join()
+            self.closed = True
+            raise self.error
+
+    def submit(self, records: List[MftRecord], filepaths: Dict[int, str] = None) -> None:
+        """Queue a batch of records, blocking while the writer is queue_size batches behind."""
+        if self.error is not None:
+            raise self.error
+        batch = self.writer.prepare_batch(records, filepaths)
+        if not batch[0]:
+            return
+        start_time = time.time()
+        self.queue.put(batch)
+        self.stats['blocked_time'] += time.time() - start_time
+        self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self.queue.qsize())
+
+    def close(self) -> None:
+        """Insert everything still queued, finish the load and close the database."""
+        if self.closed:
+            return
+        self.closed = True
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def _commit(self) -> None:
+        start_time = time.time()
+        self.writer.conn.commit()
+        latency = time.time() - start_time
+        self.stats['commits'] += 1
+        self.stats['commit_time'] += latency
+        self.stats['max_commit_latency'] = max(self.stats['max_commit_latency'], latency)
+
+    def _run(self) -> None:
+        try:
+            self.writer.connect()
+        except Exception as e:
+            self.error = e
+            self.ready.set()
+            return
+        self.ready.set()
+
+        pending = 0
+        last_commit = time.time()
+        stopping = False
+        try:
+            while True:
+                try:
+                    if pending:
+                        batch = self.queue.get(timeout=max(0.0, last_commit + self.commit_interval - time.time()))
+                    else:
+                        batch = self.queue.get()
+                except queue.Empty:
+                    batch = ()
+                if batch is None:
+                    stopping = True
+                    break
+                if batch:
+                    self.writer.insert_batch(batch)
+                    pending += len(batch[0])
+                    self.stats['batches'] += 1
+                    self.stats['rows'] += len(batch[0])
+                    self.stats['attribute_rows'] += len(batch[1])
+                if pending and (pending >= self.commit_rows or time.time() - last_commit >= self.commit_interval):
+                    self._commit()
+                    pending = 0
+                    last_commit = time.time()
+            if pending:
+                self._commit()
+        except Exception as e:
+            self.logger.error(f"SQLite writer thread failed: {e}")
+            self.error = e
+            self.writer.conn.rollback()
+            # Keep taking batches so that submit() does not block forever
+            while not stopping and self.queue.get() is not None:
+                pass
+        finally:
+            try:
+                self.writer.close()
+            except Exception as e:
+                self.logger.warning(f"Error closing SQLite database: {e}")
+                if self.error is None:
+                    self.error = e
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['queue_depth'] = self.queue.qsize()
+        stats['avg_commit_latency'] = stats['commit_time'] / stats['commits'] if stats['commits'] else 0.0
+        return stats
@@ -17,6 +17,8 @@ import struct
 from pathlib import Path
 from typing import Optional, Tuple, Dict, Any, Union
 import logging
+from .cardinality import MAX_PRECISION, MIN_PRECISION
+from .constants import HASH_ALGORITHMS
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +46,7 @@ MIN_HASH_PROCESSES = 1
 MAX_HASH_PROCESSES = 32
 MIN_TEST_RECORDS = 1
 MAX_TEST_RECORDS = 1000000
+MIN_MAX_MEMORY_MB = 64  # Interpreter and NumPy alone take about 60 MB resident
 MFT_RECORD_SIZE = 1024MFT_MAGIC_SIGNATURE = b'FILE'
 
 def validate_mft_file(file_path: str) -> Path:
@@ -132,7 +135,9 @@ def validate_output_path(output_path: str) -> Path:
         raise PathValidationError(f"Output path validation failed: {e}")
 
 def validate_numeric_bounds(chunk_size: int, hash_processes: Optional[int] = None, 
-                          test_records: int = 1000, verbosity: int = 0, debug: int = 0) -> None:
+                          test_records: int = 1000, verbosity: int = 0, debug: int = 0,
+                          max_memory: Optional[int] = None, max_records_in_memory: Optional[int] = None,
+                          hll_precision: Optional[int] = None) -> None:
     """
     Validate all numeric parameters are within safe bounds.
     
@@ -142,6 +147,9 @@ def validate_numeric_bounds(chunk_size: int, hash_processes: Optional[int] = Non
         test_records: Number of test records to generate
         verbosity: Verbosity level
         debug: Debug level
+        max_memory: Memory budget in MB for streaming mode (optional)
+        max_records_in_memory: Parsed records kept in memory before spilling (optional)
+        hll_precision: HyperLogLog precision for unique hash counts (optional)
         
     Raises:
         NumericValidationError: If any parameter is out of bounds
@@ -169,6 +177,27 @@ def validate_numeric_bounds(chunk_size: int, hash_processes: Optional[int] = Non
         
     if not isinstance(debug, int) or debug < 0 or debug > 5:
         raise NumericValidationError(f"Debug level must be between 0 and 5, got: {debug}")
+
+    if max_memory is not None:
+        if not isinstance(max_memory, int):
+            raise NumericValidationError(f"Memory budget must be an integer, got: {type(max_memory).__name__}")
+
+        if max_memory < MIN_MAX_MEMORY_MB:
+            raise NumericValidationError(
+                f"Memory budget must be at least {MIN_MAX_MEMORY_MB} MB, got: {max_memory} MB"
+            )
+
+    if max_records_in_memory is not None:
+        if not isinstance(max_records_in_memory, int) or max_records_in_memory < 1:
+            raise NumericValidationError(
+                f"Records kept in memory must be a positive integer, got: {max_records_in_memory}"
+            )
+
+    if hll_precision is not None:
+        if not isinstance(hll_precision, int) or not MIN_PRECISION <= hll_precision <= MAX_PRECISION:
+            raise NumericValidationError(
+                f"HyperLogLog precision must be between {MIN_PRECISION} and {MAX_PRECISION}, got: {hll_precision}"
+            )
     
     logger.debug(f"Numeric validation successful: chunk_size={chunk_size}, hash_processes={hash_processes}, "
                 f"test_records={test_records}, verbosity={verbosity}, debug={debug}")
@@ -187,12 +216,13 @@ def validate_export_format(export_format: str, output_file: str) -> str:
     Raises:
         ValidationError: If format is invalid or incompatible
     """
-    valid_formats = ['csv', 'json', 'xml', 'excel', 'body', 'timeline', 'l2t', 'sqlite', 'tsk']
+    valid_formats = ['csv', 'json', 'jsonl', 'xml', 'excel', 'body', 'timeline', 'l2t', 'sqlite', 'tsk']
     
     if export_format not in valid_formats:
         raise ValidationError(f"Invalid export format: {export_format}. Valid formats: {', '.join(valid_formats)}")    ext_mapping = {
         'csv': ['.csv'],
         'json': ['.json'],
+        'jsonl': ['.jsonl', '.ndjson'],
         'xml': ['.xml'],
         'excel': ['.xlsx', '.xls'],
         'sqlite': ['.db', '.sqlite', '.sqlite3'],
@@ -215,6 +245,33 @@ def validate_export_format(export_format: str, output_file: str) -> str:
     logger.debug(f"Export format validation successful: {export_format}")
     return export_format
 
+def validate_hash_algorithms(algorithms: Union[str, list, tuple]) -> Tuple[str, ...]:
+    """
+    Validate a selection of hash algorithms.
+    
+    Args:
+        algorithms: Comma-separated string or sequence of algorithm names
+        
+    Returns:
+        Tuple[str, ...]: Selected algorithms in output column order
+        
+    Raises:
+        ValidationError: If the selection is empty or names an unsupported algorithm
+    """
+    if isinstance(algorithms, str):
+        algorithms = algorithms.split(',')
+    selected = {str(name).strip().lower() for name in algorithms} - {''}
+    
+    if not selected:
+        raise ValidationError(f"At least one hash algorithm is required. Valid algorithms: {', '.join(HASH_ALGORITHMS)}")
+    unknown = selected.difference(HASH_ALGORITHMS)
+    if unknown:
+        raise ValidationError(
+            f"Invalid hash algorithm(s): {', '.join(sorted(unknown))}. Valid algorithms: {', '.join(HASH_ALGORITHMS)}"
+        )
+    
+    return tuple(name for name in HASH_ALGORITHMS if name in selected)
+
 def validate_attribute_length(attr_len: int, offset: int, record_size: int, attr_type: int = None) -> None:
     """
     Validate MFT attribute length to prevent buffer overruns.
@@ -252,10 +309,11 @@ def validate_config_schema(config: Dict[str, Any]) -> Dict[str, Any]:
         'chunk_size': {'type': int, 'min': MIN_CHUNK_SIZE, 'max': MAX_CHUNK_SIZE},
         'verbosity': {'type': int, 'min': 0, 'max': 5},
         'debug': {'type': int, 'min': 0, 'max': 5},
-        'export_format': {'type': str, 'allowed': ['csv', 'json', 'xml', 'excel', 'body', 'timeline', 'l2t', 'sqlite', 'tsk']},
+        'export_format': {'type': str, 'allowed': ['csv', 'json', 'jsonl', 'xml', 'excel', 'body', 'timeline', 'l2t', 'sqlite', 'tsk']},
         'compute_hashes': {'type': bool},
         'multiprocessing_hashes': {'type': bool},
         'hash_processes': {'type': int, 'min': MIN_HASH_PROCESSES, 'max': MAX_HASH_PROCESSES, 'optional': True},
+        'hash_algorithms': {'type': list, 'allowed': list(HASH_ALGORITHMS), 'optional': True},
         'file_size_threshold_mb': {'type': int, 'min': 1, 'max': 10000, 'optional': True}
     }
     
@@ -279,6 +337,12 @@ def validate_config_schema(config: Dict[str, Any]) -> Dict[str, Any]:
                 raise ConfigValidationError(
                     f"Configuration key '{key}' must be one of {rules['allowed']}, got: {value}"
                 )
+        if expected_type == list and 'allowed' in rules:
+            invalid = [item for item in value if item not in rules['allowed']]
+            if invalid or not value:
+                raise ConfigValidationError(
+                    f"Configuration key '{key}' must be a non-empty list of {rules['allowed']}, got: {value}"
+                )
         
         validated_config[key] = value
     
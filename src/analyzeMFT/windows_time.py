@@ -1,26 +1,215 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+FILETIME_UNIX_EPOCH = 116444736000000000
+FILETIME_TICKS_PER_SECOND = 10000000
+MAX_FILETIME = 253402300800 * FILETIME_TICKS_PER_SECOND + FILETIME_UNIX_EPOCH - 1
+FILETIME_EPOCH = datetime(1601, 1, 1)
+FILETIME_EPOCH_UTC = FILETIME_EPOCH.replace(tzinfo=timezone.utc)
+MAX_NANOSECOND_TICKS = (2**63 - 1) // 100
+
+TIMESPEC_UNITS = {
+    'seconds': 's',
+    'milliseconds': 'ms',
+    'microseconds': 'us',
+    'nanoseconds': 'ns'
+}
+
+DTSTR_CACHE_SIZE = 65536
+
+_UNSET = object()
+
+
+def _filetime_to_unix(filetime: int) -> float:
+    t = float(filetime >> 32) * 2**32 + (filetime & 0xFFFFFFFF)
+    return (t / 10000000) - 11644473600
+
+
+@lru_cache(maxsize=DTSTR_CACHE_SIZE)
+def _convert_filetime(filetime: int) -> Tuple[Optional[datetime], str]:
+    """
+    Convert a FILETIME to (datetime, ISO string), shared across all WindowsTime instances.
+
+    Both are computed with integer arithmetic, so the string matches format_filetimes
+    and every export shows the same time for the same record.
+    """
+    if filetime == 0:
+        return None, "Not defined"
+    if filetime > MAX_FILETIME:
+        return None, "Invalid timestamp"
+    return FILETIME_EPOCH_UTC + timedelta(microseconds=filetime // 10), _format_filetime(filetime, 'milliseconds')
+
 
 class WindowsTime:
+    """
+    A FILETIME value whose datetime, string and Unix forms are computed on first access.
+
+    Formatted values are shared through a bounded class-level LRU, since NTFS volumes
+    contain long runs of identical timestamps.
+    """
+    __slots__ = ('filetime', '_dt', '_dtstr', '_unixtime')
+
     def __init__(self, low: int, high: int) -> None:
-        self.low = int(low)
-        self.high = int(high)
-        
-        if (low == 0) and (high == 0):
-            self.dt = None
-            self.dtstr = "Not defined"
-            self.unixtime = 0
-            return
-        
-        self.unixtime = self.get_unix_time()
-        
-        try:
-            self.dt = datetime.fromtimestamp(self.unixtime, tz=timezone.utc)
-            self.dtstr = self.dt.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
-        except:
-            self.dt = None
-            self.dtstr = "Invalid timestamp"
-            self.unixtime = 0
+        self.filetime = (int(high) << 32) + int(low)
+        self._dt = _UNSET
+        self._dtstr = _UNSET
+        self._unixtime = _UNSET
+
+    @classmethod
+    def from_filetime(cls, filetime: int) -> 'WindowsTime':
+        """Create a WindowsTime from a raw 64-bit FILETIME value."""
+        wt = cls.__new__(cls)
+        wt.filetime = filetime
+        wt._dt = _UNSET
+        wt._dtstr = _UNSET
+        wt._unixtime = _UNSET
+        return wt
+
+    def __reduce__(self):
+        return (WindowsTime.from_filetime, (self.filetime,))
+
+    @property
+    def low(self) -> int:
+        return self.filetime & 0xFFFFFFFF
+
+    @property
+    def high(self) -> int:
+        return self.filetime >> 32
+
+    @property
+    def dt(self) -> Optional[datetime]:
+        if self._dt is _UNSET:
+            self._dt, self._dtstr = _convert_filetime(self.filetime)
+        return self._dt
+
+    @property
+    def dtstr(self) -> str:
+        if self._dtstr is _UNSET:
+            self._dt, self._dtstr = _convert_filetime(self.filetime)
+        return self._dtstr
+
+    @property
+    def unixtime(self) -> float:
+        if self._unixtime is _UNSET:
+            if self.filetime == 0 or self.filetime > MAX_FILETIME:
+                self._unixtime = 0
+            else:
+                self._unixtime = self.get_unix_time()
+        return self._unixtime
 
     def get_unix_time(self) -> float:
-        t = float(self.high) * 2**32 + self.low
-        return (t / 10000000) - 11644473600 
\ No newline at end of file
+        return _filetime_to_unix(self.filetime)
+
+    @staticmethod
+    def cache_info():
+        """Return hit/miss statistics of the shared formatting cache."""
+        return _convert_filetime.cache_info()
+
+
+def _filetime_ticks(filetimes: Any):
+    """Return (defined mask, valid mask, ticks since the Unix epoch) for an array of raw FILETIME values."""
+    if not HAS_NUMPY:
+        raise ImportError("NumPy is required for batch timestamp conversion. Install with: pip install numpy")
+    filetimes = np.asarray(filetimes, dtype=np.uint64)
+    defined = filetimes != 0
+    valid = defined & (filetimes <= MAX_FILETIME)
+    ticks = np.where(valid, filetimes, FILETIME_UNIX_EPOCH).astype(np.int64) - FILETIME_UNIX_EPOCH
+    return defined, valid, ticks
+
+
+def filetimes_to_unix(filetimes: Any) -> 'np.ndarray':
+    """
+    Convert raw FILETIME values to Unix timestamps in one pass.
+
+    Undefined (zero) and out-of-range values map to 0, as with WindowsTime.unixtime.
+
+    Args:
+        filetimes: Array-like of 64-bit FILETIME values
+
+    Returns:
+        float64 array of seconds since the Unix epoch
+    """
+    _, valid, ticks = _filetime_ticks(filetimes)
+    return np.where(valid, ticks / FILETIME_TICKS_PER_SECOND, 0.0)
+
+
+def filetimes_to_datetime64(filetimes: Any, unit: str = 'ns') -> 'np.ndarray':
+    """
+    Convert raw FILETIME values to datetime64 in one pass.
+
+    With unit='ns' the full 100 ns FILETIME precision is kept, at the cost of the
+    datetime64[ns] range (1678-2262); coarser units truncate but cover year 9999.
+    Undefined and unrepresentable values become NaT.
+
+    Args:
+        filetimes: Array-like of 64-bit FILETIME values
+        unit: One of 's', 'ms', 'us' or 'ns'
+
+    Returns:
+        datetime64 array in the requested unit
+    """
+    ticks_per_unit = {'s': FILETIME_TICKS_PER_SECOND, 'ms': 10000, 'us': 10, 'ns': None}
+    if unit not in ticks_per_unit:
+        raise ValueError(f"Unsupported datetime64 unit: {unit}")
+
+    _, valid, ticks = _filetime_ticks(filetimes)
+    if unit == 'ns':
+        limit = np.iinfo(np.int64).max // 100
+        valid &= (ticks <= limit) & (ticks >= -limit)
+        values = np.where(valid, ticks, 0) * 100
+    else:
+        values = ticks // ticks_per_unit[unit]
+
+    nat = np.iinfo(np.int64).min
+    return np.where(valid, values, nat).astype(np.int64).view(f'datetime64[{unit}]')
+
+
+def _format_filetime(filetime: int, timespec: str) -> str:
+    """Format one FILETIME with integer arithmetic, as format_filetimes does with NumPy."""
+    if filetime == 0:
+        return "Not defined"
+    ticks = filetime - FILETIME_UNIX_EPOCH
+    if filetime > MAX_FILETIME or (timespec == 'nanoseconds' and abs(ticks) > MAX_NANOSECOND_TICKS):
+        return "Invalid timestamp"
+    dt = FILETIME_EPOCH + timedelta(microseconds=filetime // 10)
+    if timespec == 'nanoseconds':
+        return f"{dt.isoformat(timespec='microseconds')}{filetime % 10 * 100:03d}Z"
+    return dt.isoformat(timespec=timespec) + 'Z'
+
+
+def format_filetimes(filetimes: Any, timespec: str = 'milliseconds') -> Union['np.ndarray', List[str]]:
+    """
+    Format raw FILETIME values as ISO 8601 UTC strings in one pass.
+
+    Strings match WindowsTime.dtstr, including the "Not defined" and
+    "Invalid timestamp" placeholders, except that the sub-second digits are
+    truncated exactly rather than rounded through a float. Without NumPy the
+    values are formatted one at a time with the same result.
+
+    Args:
+        filetimes: Array-like of 64-bit FILETIME values
+        timespec: 'seconds', 'milliseconds', 'microseconds' or 'nanoseconds'
+
+    Returns:
+        Array of strings, or a list of strings without NumPy
+    """
+    if timespec not in TIMESPEC_UNITS:
+        raise ValueError(f"Unsupported timespec: {timespec}")
+    if not HAS_NUMPY:
+        return [_format_filetime(int(filetime), timespec) for filetime in filetimes]
+
+    unit = TIMESPEC_UNITS[timespec]
+    defined, valid, _ = _filetime_ticks(filetimes)
+    dt64 = filetimes_to_datetime64(filetimes, unit=unit)
+    valid &= ~np.isnat(dt64)
+
+    text = np.char.add(np.datetime_as_string(dt64, unit=unit), 'Z')
+    text = np.where(valid, text, 'Invalid timestamp')
+    return np.where(defined, text, 'Not defined')
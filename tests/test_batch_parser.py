@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import pytest
+import tempfile
+from pathlib import Path
+from src.analyzeMFT.constants import *
+from src.analyzeMFT.mft_record import MftRecord
+from src.analyzeMFT.test_generator import create_test_mft
+
+np = pytest.importorskip("numpy")
+
+from src.analyzeMFT.batch_parser import RecordBatch, iter_record_batches, header_dtype, HEADER_FIELDS, FILETIME_KEYS
+
+
+class TestRecordBatch:
+    """Test columnar header decoding against MftRecord."""
+
+    def setup_method(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.mft_path = Path(self.temp_dir) / "batch.mft"
+        create_test_mft(str(self.mft_path), num_records=50, test_type="normal")
+        self.data = self.mft_path.read_bytes()
+
+    def teardown_method(self):
+        """Clean up test environment."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_header_dtype_spans_record(self):
+        """Test that one dtype element covers exactly one record."""
+        assert header_dtype().itemsize == MFT_RECORD_SIZE
+
+    def test_columns_match_mft_record(self):
+        """Test every header column against the per-record parser."""
+        batch = RecordBatch(self.data)
+        assert len(batch) == len(self.data) // MFT_RECORD_SIZE
+
+        for i in range(len(batch)):
+            record = MftRecord(self.data[i * MFT_RECORD_SIZE:(i + 1) * MFT_RECORD_SIZE])
+            for name, _, _ in HEADER_FIELDS:
+                assert int(batch[name][i]) == getattr(record, name), f"{name} mismatch at record {i}"
+
+    def test_statistics(self):
+        """Test statistics computed from columns match a manual count."""
+        batch = RecordBatch(self.data)
+        records = list(batch.iter_records())
+        stats = batch.get_statistics()
+
+        assert stats['total_records'] == len(records)
+        assert stats['active_records'] == sum(1 for r in records if r.flags & FILE_RECORD_IN_USE)
+        assert stats['directories'] == sum(1 for r in records if r.flags & FILE_RECORD_IS_DIRECTORY)
+        assert stats['files'] == stats['total_records'] - stats['directories']
+
+    def test_record_on_demand(self):
+        """Test building a single record from the batch."""
+        batch = RecordBatch(self.data)
+        record = batch.record(5)
+        assert record.recordnum == int(batch['recordnum'][5])
+
+        with pytest.raises(IndexError):
+            batch.record(len(batch))
+
+    def test_iter_records_with_mask(self):
+        """Test building records only for directories."""
+        batch = RecordBatch(self.data)
+        directories = list(batch.iter_records(mask=batch.is_directory))
+        assert len(directories) == int(np.count_nonzero(batch.is_directory))
+        assert all(r.flags & FILE_RECORD_IS_DIRECTORY for r in directories)
+
+    def test_filetime_columns_match_mft_record(self):
+        """Test the vectorized $SI/$FN walk against the per-record parser."""
+        batch = RecordBatch(self.data)
+        columns = batch.filetime_columns()
+
+        for i in range(len(batch)):
+            record = batch.record(i)
+            for prefix, times in (('si', record.si_times), ('fn', record.fn_times)):
+                for key in FILETIME_KEYS:
+                    expected = (times[key].high << 32) | times[key].low
+                    assert int(columns[f'{prefix}_{key}'][i]) == expected, f"{prefix}_{key} mismatch at record {i}"
+
+    def test_time_strings(self):
+        """Test bulk ISO formatting of batch timestamps."""
+        batch = RecordBatch(self.data)
+        strings = batch.time_strings()
+        record = batch.record(0)
+
+        assert set(strings) == {f'{p}_{k}' for p in ('si', 'fn') for k in FILETIME_KEYS}
+        assert strings['fn_crtime'][0] == record.fn_times['crtime'].dtstr
+
+    def test_trailing_bytes_ignored(self):
+        """Test that a partial trailing record is not decoded."""
+        batch = RecordBatch(self.data[:3 * MFT_RECORD_SIZE + 100])
+        assert len(batch) == 3
+
+    def test_iter_record_batches(self):
+        """Test reading a file as consecutive batches."""
+        batches = list(iter_record_batches(str(self.mft_path), batch_size=16))
+        assert sum(len(b) for b in batches) == len(self.data) // MFT_RECORD_SIZE
+        assert [b.first_index for b in batches] == [0, 16, 32, 48][:len(batches)]
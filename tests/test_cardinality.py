@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+import hashlib
+import pytest
+from src.analyzeMFT.cardinality import (
+    AdaptiveCounter, ExactCounter, HyperLogLog, create_counter
+)
+
+
+def digests(start, count):
+    return [hashlib.md5(str(i).encode()).digest() for i in range(start, start + count)]
+
+
+class TestCardinality:
+    """Test exact and HyperLogLog distinct-value counters."""
+
+    def test_exact_counter(self):
+        """Test that the exact counter ignores duplicates."""
+        counter = ExactCounter()
+        for value in digests(0, 50) + digests(0, 50) + ['text', 'text']:
+            counter.add(value)
+        assert len(counter) == 51
+        assert counter.exact
+
+    @pytest.mark.parametrize("count", [10, 1000, 50000])
+    def test_hyperloglog_accuracy(self, count):
+        """Test the estimate stays within a few standard errors of the true count."""
+        hll = HyperLogLog(precision=12)
+        hll.update(digests(0, count))
+        hll.update(digests(0, count // 2))
+
+        assert abs(len(hll) - count) <= max(2, count * 0.05)
+        assert len(hll.registers) == 4096
+
+    def test_hyperloglog_precision_bounds(self):
+        """Test that precision outside 4-16 is rejected."""
+        assert len(HyperLogLog(precision=4).registers) == 16
+        for precision in (3, 17):
+            with pytest.raises(ValueError):
+                HyperLogLog(precision=precision)
+
+    def test_hyperloglog_merge(self):
+        """Test merging counters equals counting the union."""
+        a = HyperLogLog(precision=10)
+        b = HyperLogLog(precision=10)
+        union = HyperLogLog(precision=10)
+        a.update(digests(0, 3000))
+        b.update(digests(2000, 3000))
+        union.update(digests(0, 5000))
+
+        a.merge(b)
+        assert a.registers == union.registers
+        with pytest.raises(ValueError):
+            a.merge(HyperLogLog(precision=12))
+
+    def test_adaptive_counter_switches_to_hll(self):
+        """Test exact counting below the threshold and a bounded estimate above it."""
+        counter = AdaptiveCounter(threshold=100, precision=12)
+        for value in digests(0, 100):
+            counter.add(value)
+        assert counter.exact
+        assert len(counter) == 100
+
+        for value in digests(100, 5000):
+            counter.add(value)
+        assert not counter.exact
+        assert isinstance(counter.counter, HyperLogLog)
+        assert abs(len(counter) - 5100) <= 5100 * 0.05
+
+    def test_create_counter(self):
+        """Test the counter factory modes."""
+        assert isinstance(create_counter('exact'), ExactCounter)
+        assert isinstance(create_counter('hll', precision=8), HyperLogLog)
+        assert isinstance(create_counter('auto'), AdaptiveCounter)
+        with pytest.raises(ValueError):
+            create_counter('bloom')
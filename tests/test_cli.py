@@ -25,7 +25,7 @@ async def test_main_with_valid_arguments(mock_analyzer, mock_stdout, caplog):
     with patch.object(sys, 'argv', test_args):
         await main()
     
-    mock_analyzer.assert_called_once_with('test.mft', 'output.csv', 0, 0, False, 'csv', None, 1000, True, None)
+    mock_analyzer.assert_called_once_with('test.mft', 'output.csv', 0, 0, False, 'csv', None, 1000, True, None, False, 'auto', None, None, 'auto', 12, True, False, None, None, None, False, False)
     mock_analyzer.return_value.analyze.assert_called_once()
     assert "Analysis complete. Results written to output.csv" in caplog.text
 
@@ -46,7 +46,7 @@ async def test_main_with_different_export_formats(mock_analyzer, export_format):
     with patch.object(sys, 'argv', test_args):
         await main()
     
-    mock_analyzer.assert_called_once_with('test.mft', f'output.{export_format}', 0, 0, False, export_format, None, 1000, True, None)
+    mock_analyzer.assert_called_once_with('test.mft', f'output.{export_format}', 0, 0, False, export_format, None, 1000, True, None, False, 'auto', None, None, 'auto', 12, True, False, None, None, None, False, False)
 
 @pytest.mark.asyncio
 async def test_main_with_debug_option(mock_analyzer):
@@ -54,7 +54,7 @@ async def test_main_with_debug_option(mock_analyzer):
     with patch.object(sys, 'argv', test_args):
         await main()
     
-    mock_analyzer.assert_called_once_with('test.mft', 'output.csv', 1, 0, False, 'csv', None, 1000, True, None)
+    mock_analyzer.assert_called_once_with('test.mft', 'output.csv', 1, 0, False, 'csv', None, 1000, True, None, False, 'auto', None, None, 'auto', 12, True, False, None, None, None, False, False)
 
 @pytest.mark.asyncio
 async def test_main_with_hash_option(mock_analyzer):
@@ -62,7 +62,7 @@ async def test_main_with_hash_option(mock_analyzer):
     with patch.object(sys, 'argv', test_args):
         await main()
     
-    mock_analyzer.assert_called_once_with('test.mft', 'output.csv', 0, 0, True, 'csv', None, 1000, True, None)
+    mock_analyzer.assert_called_once_with('test.mft', 'output.csv', 0, 0, True, 'csv', None, 1000, True, None, False, 'auto', None, None, 'auto', 12, True, False, None, None, None, False, False)
 
 @pytest.mark.asyncio
 async def test_main_with_version_option(capsys):
@@ -1,8 +1,11 @@
 import pytest
 import asyncio
+import json
+import xml.etree.ElementTree as ET
 from unittest.mock import patch, mock_open
-from src.analyzeMFT.file_writers import FileWriters
+from src.analyzeMFT.file_writers import FileWriters, create_stream_writer, json_line, xml_element, ExcelStreamWriter
 from src.analyzeMFT.mft_record import MftRecord
+from src.analyzeMFT.constants import CSV_HEADER
 
 @pytest.fixture
 def mock_records():
@@ -16,19 +19,108 @@ async def test_write_csv(mock_records):
         mock_file().write.assert_called()
 
 @pytest.mark.asyncio
-async def test_write_json(mock_records):
-    with patch('json.dump') as mock_json_dump:
-        await FileWriters.write_json(mock_records, 'output.json')
-        mock_json_dump.assert_called_once()
+async def test_write_json(tmp_path, mock_records):
+    output = tmp_path / "output.json"
+    await FileWriters.write_json(mock_records, str(output))
+    assert output.read_text() == json.dumps([r.to_dict() for r in mock_records], indent=2, default=str)
+
+    filepaths = [f"\\file_{i}" for i in range(5)]
+    await FileWriters.write_json(mock_records, str(output), filepaths)
+    streamed = tmp_path / "streamed.json"
+    writer = create_stream_writer("json", str(streamed))
+    writer.write_records(mock_records, filepaths)
+    writer.close()
+    assert output.read_bytes() == streamed.read_bytes()
 
 @pytest.mark.asyncio
-async def test_write_xml(mock_records):
-    with patch('xml.etree.ElementTree.ElementTree.write') as mock_xml_write:
-        await FileWriters.write_xml(mock_records, 'output.xml')
-        mock_xml_write.assert_called_once()
+async def test_write_xml(tmp_path, mock_records):
+    output = tmp_path / "output.xml"
+    await FileWriters.write_xml(mock_records, str(output))
+    root = ET.parse(output).getroot()
+    assert root.tag == "mft_records"
+    assert len(root.findall("record")) == 5
+    assert [child.tag for child in root.find("record")] == list(mock_records[0].to_dict())
+    assert root.find("record/si_times/crtime") is not None
 
 @pytest.mark.asyncio
 async def test_write_excel(mock_records):
     with patch('openpyxl.Workbook') as mock_workbook:
         await FileWriters.write_excel(mock_records, 'output.xlsx')
-        mock_workbook.return_value.save.assert_called_once_with('output.xlsx')
\ No newline at end of file
+        mock_workbook.return_value.save.assert_called_once_with('output.xlsx')
+
+@pytest.mark.parametrize("export_format", ["json", "xml", "excel", "body", "tsk", "timeline"])
+def test_stream_writer_empty_output(tmp_path, export_format):
+    output = tmp_path / f"empty.{export_format}"
+    writer = create_stream_writer(export_format, str(output))
+    writer.close()
+    writer.close()
+    assert output.exists()
+    if export_format == "json":
+        assert json.loads(output.read_text()) == []
+
+def test_stream_writer_chunks(tmp_path, mock_records):
+    output = tmp_path / "stream.json"
+    writer = create_stream_writer("json", str(output))
+    writer.write_records(mock_records[:2], ["\\a", "\\b"])
+    writer.write_records(mock_records[2:], ["\\c", "\\d", "\\e"])
+    writer.close()
+    records = json.loads(output.read_text())
+    assert [record['filepath'] for record in records] == ["\\a", "\\b", "\\c", "\\d", "\\e"]
+    assert writer.records_written == 5
+
+def test_create_stream_writer_without_stream_support():
+    assert create_stream_writer("csv", "output.csv") is None
+    assert create_stream_writer("sqlite", "output.db") is None
+
+def test_jsonl_stream_writer(tmp_path, mock_records):
+    output = tmp_path / "stream.jsonl"
+    writer = create_stream_writer("jsonl", str(output))
+    writer.write_records(mock_records, [f"\\file_{i}" for i in range(5)])
+    writer.close()
+    lines = output.read_bytes().splitlines()
+    assert len(lines) == 5
+    records = [json.loads(line) for line in lines]
+    assert [record['filepath'] for record in records] == [f"\\file_{i}" for i in range(5)]
+    assert list(records[0])[:-1] == list(mock_records[0].to_dict())
+
+def test_json_line_is_compact():
+    assert json_line({'filename': 'café.txt', 'size': 1}) == '{"filename":"café.txt","size":1}\n'.encode('utf-8')
+
+@pytest.mark.asyncio
+async def test_write_jsonl(tmp_path, mock_records):
+    output = tmp_path / "output.jsonl"
+    await FileWriters.write_jsonl(mock_records, str(output))
+    assert [json.loads(line) for line in output.read_bytes().splitlines()] == [r.to_dict() for r in mock_records]
+
+    filepaths = [f"\\file_{i}" for i in range(5)]
+    await FileWriters.write_jsonl(mock_records, str(output), filepaths)
+    streamed = tmp_path / "streamed.jsonl"
+    writer = create_stream_writer("jsonl", str(streamed))
+    writer.write_records(mock_records, filepaths)
+    writer.close()
+    assert output.read_bytes() == streamed.read_bytes()
+
+def test_xml_element_escaping():
+    assert xml_element("filename", "a<b>&c") == "<filename>a&lt;b&gt;&amp;c</filename>"
+    assert xml_element("filename", "bad\x01name") == "<filename>bad\\x01name</filename>"
+    assert xml_element("types", [16, 48]) == "<types><item>16</item><item>48</item></types>"
+    assert xml_element("md5", None) == "<md5/>"
+    ET.fromstring(xml_element("record", {"filename": "\x00<\ud800>"}))
+
+def test_excel_sheet_rollover(tmp_path, mock_records):
+    import openpyxl
+    output = tmp_path / "rollover.xlsx"
+    writer = ExcelStreamWriter(str(output))
+    writer.max_rows = 3
+    writer.write_records(mock_records[:3], ["\\a", "\\b", "\\c"])
+    writer.write_records(mock_records[3:])
+    writer.close()
+    assert writer.get_stats()['sheets'] == 3
+
+    workbook = openpyxl.load_workbook(output, read_only=True)
+    assert workbook.sheetnames == ["MFT", "MFT (2)", "MFT (3)"]
+    rows = [list(sheet.values) for sheet in workbook.worksheets]
+    assert [len(sheet_rows) for sheet_rows in rows] == [3, 3, 2]
+    assert all(sheet_rows[0][0] == CSV_HEADER[0] for sheet_rows in rows)
+    filepaths = [row[CSV_HEADER.index('Filepath')] for sheet_rows in rows for row in sheet_rows[1:]]
+    assert filepaths == ["\\a", "\\b", "\\c", None, None]
@@ -5,7 +5,8 @@ import hashlib
 import zlib
 import logging
 from unittest.mock import Mock, patch
-from src.analyzeMFT.hash_processor import HashProcessor, HashResult
+from src.analyzeMFT.hash_processor import HashProcessor, HashResult, HashMemo
+from src.analyzeMFT.validators import ValidationError
 
 
 class TestHashResult:
@@ -80,10 +81,10 @@ class TestHashProcessor:
         results = processor.compute_hashes_single_threaded(records)
         
         assert len(results) == 1
-        result = results[0]        expected_md5 = hashlib.md5(test_data).hexdigest()
-        expected_sha256 = hashlib.sha256(test_data).hexdigest()
-        expected_sha512 = hashlib.sha512(test_data).hexdigest()
-        expected_crc32 = f"{zlib.crc32(test_data) & 0xffffffff:08x}"
+        result = results[0]        expected_md5 = hashlib.md5(test_data).digest()
+        expected_sha256 = hashlib.sha256(test_data).digest()
+        expected_sha512 = hashlib.sha512(test_data).digest()
+        expected_crc32 = (zlib.crc32(test_data) & 0xffffffff).to_bytes(4, "big")
         
         assert result.md5 == expected_md5
         assert result.sha256 == expected_sha256
@@ -105,8 +106,8 @@ class TestHashProcessor:
         results = processor.compute_hashes_single_threaded(test_records)
         
         assert len(results) == len(test_records)        for i, (record_data, result) in enumerate(zip(test_records, results)):
-            expected_md5 = hashlib.md5(record_data).hexdigest()
-            expected_sha256 = hashlib.sha256(record_data).hexdigest()
+            expected_md5 = hashlib.md5(record_data).digest()
+            expected_sha256 = hashlib.sha256(record_data).digest()
             
             assert result.md5 == expected_md5
             assert result.sha256 == expected_sha256
@@ -132,7 +133,7 @@ class TestHashProcessor:
         result = results[0]
         assert isinstance(result, HashResult)
         
-        expected_md5 = hashlib.md5(test_data[0]).hexdigest()
+        expected_md5 = hashlib.md5(test_data[0]).digest()
         assert result.md5 == expected_md5
     
     def test_compute_hashes_adaptive_small_batch(self):
@@ -163,7 +164,7 @@ class TestHashProcessor:
         
         assert len(results) == len(test_cases)        for i, result in enumerate(results):
             assert isinstance(result, HashResult)
-            assert len(result.md5) == 32            assert len(result.sha256) == 64            assert len(result.sha512) == 128            assert len(result.crc32) == 8            assert result.record_index == i
+            assert len(result.md5) == 16            assert len(result.sha256) == 32            assert len(result.sha512) == 64            assert len(result.crc32) == 4            assert result.record_index == i
     
     def test_compute_hashes_large_record(self):
         """Test computing hashes for large individual record."""
@@ -173,7 +174,7 @@ class TestHashProcessor:
         results = processor.compute_hashes_single_threaded(records)
         
         assert len(results) == 1
-        result = results[0]        expected_md5 = hashlib.md5(large_data).hexdigest()
+        result = results[0]        expected_md5 = hashlib.md5(large_data).digest()
         assert result.md5 == expected_md5
         assert result.record_index == 0
     
@@ -226,6 +227,119 @@ class TestHashProcessor:
         results = processor.compute_hashes_single_threaded(test_records)
         
         assert len(results) == len(test_records)        for i, (record_data, result) in enumerate(zip(test_records, results)):
-            expected_md5 = hashlib.md5(record_data).hexdigest()
+            expected_md5 = hashlib.md5(record_data).digest()
             assert result.md5 == expected_md5
-            assert result.record_index == i
\ No newline at end of file
+            assert result.record_index == i
+
+    def test_pool_reused_across_calls(self):
+        """Test that the worker pool is started once and reused."""
+        records = [f"record_{i:03d}".encode() for i in range(20)]
+        with HashProcessor(num_processes=2, logger=self.logger) as processor:
+            first = processor.compute_hashes_multiprocessed(records)
+            executor = processor._executor
+            second = processor.compute_hashes_multiprocessed(records)
+
+            assert processor._executor is executor
+            stats = processor.get_performance_stats()
+            assert stats['pool_starts'] == 1
+            assert stats['pool_startup_time'] > 0
+            assert [r.md5 for r in first] == [r.md5 for r in second]
+
+        assert processor._executor is None
+
+    def test_close_without_pool(self):
+        """Test that closing an unused processor is a no-op."""
+        processor = HashProcessor(num_processes=2, logger=self.logger)
+        processor.close()
+        processor.close()
+        assert processor.get_performance_stats()['pool_starts'] == 0
+
+    def test_shared_memory_matches_single_threaded(self):
+        """Test shared-memory transfer against single-threaded hashing for variable-length records."""
+        records = [f"record_{i}".encode() * (i + 1) for i in range(40)] + [b""]
+        expected = HashProcessor(num_processes=1, logger=self.logger).compute_hashes_single_threaded(records)
+
+        with HashProcessor(num_processes=2, logger=self.logger) as processor:
+            results = processor.compute_hashes_multiprocessed(records)
+            assert processor.get_performance_stats()['transfer'] == 'shared_memory'
+            results_again = processor.compute_hashes_multiprocessed(records[:12])
+
+        for result, reference in zip(results, expected):
+            assert (result.md5, result.sha256, result.sha512, result.crc32) == \
+                   (reference.md5, reference.sha256, reference.sha512, reference.crc32)
+        assert [r.md5 for r in results_again] == [r.md5 for r in expected[:12]]
+
+    def test_pickled_transfer_fallback(self):
+        """Test that disabling shared memory falls back to pickled transfer."""
+        records = [f"record_{i}".encode() for i in range(20)]
+        with HashProcessor(num_processes=2, logger=self.logger, use_shared_memory=False) as processor:
+            results = processor.compute_hashes_multiprocessed(records)
+            assert processor.get_performance_stats()['transfer'] == 'pickle'
+
+        assert [r.md5 for r in results] == [hashlib.md5(r).digest() for r in records]
+
+    def test_selected_algorithms_only(self):
+        """Test that only the selected digests are computed, in every transfer mode."""
+        records = [f"record_{i}".encode() * (i + 1) for i in range(20)]
+        expected = [hashlib.sha256(r).digest() for r in records]
+
+        single = HashProcessor(num_processes=1, logger=self.logger, algorithms=("sha256",))
+        results = single.compute_hashes_single_threaded(records)
+        assert [r.sha256 for r in results] == expected
+        assert all(r.md5 is None and r.sha512 is None and r.crc32 is None for r in results)
+
+        for use_shared_memory in (True, False):
+            with HashProcessor(num_processes=2, logger=self.logger, use_shared_memory=use_shared_memory,
+                               algorithms="crc32,sha256") as processor:
+                assert processor.algorithms == ("sha256", "crc32")
+                results = processor.compute_hashes_multiprocessed(records)
+            assert [r.sha256 for r in results] == expected
+            assert [r.crc32 for r in results] == [(zlib.crc32(r) & 0xffffffff).to_bytes(4, "big") for r in records]
+            assert all(r.md5 is None and r.sha512 is None for r in results)
+
+    def test_invalid_algorithm_rejected(self):
+        """Test that unknown or empty algorithm selections are rejected."""
+        with pytest.raises(ValidationError):
+            HashProcessor(logger=self.logger, algorithms=("sha1",))
+        with pytest.raises(ValidationError):
+            HashProcessor(logger=self.logger, algorithms=())
+
+    def test_memo_reuses_repeated_images(self):
+        """Test that repeated record images are hashed once and answered from the memo."""
+        zeroed = bytes(1024)
+        records = [zeroed, b"record_a", zeroed, b"record_b", zeroed]
+        processor = HashProcessor(num_processes=1, logger=self.logger)
+
+        with patch.object(processor, 'compute_hashes_single_threaded',
+                          wraps=processor.compute_hashes_single_threaded) as mock_single:
+            results = processor.compute_hashes_adaptive(records)
+            mock_single.assert_called_once_with([zeroed, b"record_a", b"record_b"])
+            again = processor.compute_hashes_adaptive([b"record_b", zeroed])
+            assert mock_single.call_count == 1
+
+        assert [r.record_index for r in results] == list(range(5))
+        assert [r.md5 for r in results] == [hashlib.md5(r).digest() for r in records]
+        assert [r.md5 for r in again] == [hashlib.md5(b"record_b").digest(), hashlib.md5(zeroed).digest()]
+        stats = processor.get_performance_stats()
+        assert (stats['memo_hits'], stats['memo_misses']) == (4, 3)
+
+    def test_memo_confirms_bytes_and_evicts(self):
+        """Test that fingerprint collisions miss and the memo stays bounded."""
+        memo = HashMemo(max_entries=2)
+        key = memo.key(b"abc")
+        memo.put(key, b"abc", (b"digest",) * 4)
+        assert memo.get(key, b"abc") == (b"digest",) * 4
+        assert memo.get(key, b"abd") is None
+
+        memo.put(memo.key(b"x"), b"x", (None,) * 4)
+        memo.put(memo.key(b"y"), b"y", (None,) * 4)
+        assert len(memo.entries) == 2
+        assert memo.get(key, b"abc") is None
+
+    def test_memo_disabled(self):
+        """Test that memo_size=0 hashes every record."""
+        processor = HashProcessor(num_processes=1, logger=self.logger, memo_size=0)
+        results = processor.compute_hashes_adaptive([b"same"] * 3)
+        assert processor.memo is None
+        assert processor.get_performance_stats()['total_records'] == 3
+        assert len({r.md5 for r in results}) == 1
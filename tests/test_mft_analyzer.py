@@ -36,7 +36,7 @@ async def test_analyze(analyzer, mock_mft_file, mock_mft_record):
                 assert analyzer.stats['files'] == 1
 
 @pytest.mark.asyncio
-@pytest.mark.parametrize("export_format", ["csv", "json", "xml", "excel", "body", "timeline", "l2t"])
+@pytest.mark.parametrize("export_format", ["csv", "body", "timeline", "l2t"])
 async def test_analyze_with_different_export_formats(export_format, mock_mft_file, mock_mft_record):
     analyzer = MftAnalyzer("test.mft", f"output.{export_format}", debug=False, compute_hashes=False, export_format=export_format)
     
@@ -47,6 +47,20 @@ async def test_analyze_with_different_export_formats(export_format, mock_mft_fil
                 
                 getattr(mock_file_writers, f"write_{export_format}").assert_called_once()
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("export_format", ["json", "xml", "jsonl", "excel"])
+async def test_analyze_chunked_export_formats(export_format, mock_mft_file, mock_mft_record):
+    analyzer = MftAnalyzer("test.mft", f"output.{export_format}", debug=False, compute_hashes=False, export_format=export_format)
+
+    with patch("builtins.open", mock_open(read_data=mock_mft_file)):
+        with patch("src.analyzeMFT.mft_analyzer.MftRecord", return_value=mock_mft_record):
+            with patch("src.analyzeMFT.mft_analyzer.create_stream_writer") as mock_create:
+                mock_create.return_value.get_stats.return_value = {'records': 0, 'write_time': 0.0}
+                await analyzer.analyze()
+
+                mock_create.assert_called_once_with(export_format, f"output.{export_format}")
+                mock_create.return_value.close.assert_called()
+
 @pytest.mark.asyncio
 async def test_analyze_with_compute_hashes(mock_mft_file, mock_mft_record):
     analyzer = MftAnalyzer("test.mft", "output.csv", debug=False, compute_hashes=True, export_format="csv")
@@ -109,13 +123,24 @@ async def test_build_filepath(analyzer, mock_mft_record):
 
 @pytest.mark.asyncio
 async def test_build_filepath_with_deep_path(analyzer, mock_mft_record):
-    analyzer.mft_records = {i: MagicMock(recordnum=i, filename=f"dir{i}", get_parent_record_num=lambda: i+1) for i in range(300)}
-    analyzer.mft_records[299].get_parent_record_num.return_value = 5
+    analyzer.mft_records = {i: MagicMock(recordnum=i, filename=f"dir{i}", seq=1) for i in range(6, 306)}
+    for i in range(6, 306):
+        analyzer.mft_records[i].get_parent_record_num.return_value = i + 1
+    analyzer.mft_records[305].get_parent_record_num.return_value = 5
     analyzer.mft_records[5] = MagicMock(recordnum=5, filename="root", get_parent_record_num=lambda: 5)
     
-    filepath = analyzer.build_filepath(analyzer.mft_records[0])
-    assert filepath.startswith("DeepPath\\")
-    assert len(filepath.split("\\")) == 256
+    filepath = analyzer.build_filepath(analyzer.mft_records[6])
+    assert filepath.startswith("\\dir305\\")
+    assert len(filepath.split("\\")) == 301
+
+@pytest.mark.asyncio
+async def test_build_filepath_with_cycle(analyzer):
+    analyzer.mft_records = {
+        10: MagicMock(recordnum=10, filename="a", seq=1, get_parent_record_num=lambda: 11),
+        11: MagicMock(recordnum=11, filename="b", seq=1, get_parent_record_num=lambda: 10),
+    }
+    
+    assert analyzer.build_filepath(analyzer.mft_records[10]) == "CyclicPath\\b\\a"
 @pytest.mark.asyncio
 async def test_build_filepath_with_orphaned_file(analyzer, mock_mft_record):
     mock_mft_record.get_parent_record_num.return_value = mock_mft_record.recordnum
@@ -182,8 +207,9 @@ async def test_analyze_with_all_flags(mock_mft_file, mock_mft_record):
     
     with patch("builtins.open", mock_open(read_data=mock_mft_file)):
         with patch("src.analyzeMFT.mft_analyzer.MftRecord", return_value=mock_mft_record):
-            with patch("src.analyzeMFT.mft_analyzer.FileWriters") as mock_file_writers:
+            with patch("src.analyzeMFT.mft_analyzer.create_stream_writer") as mock_create:
+                mock_create.return_value.get_stats.return_value = {'records': 0, 'write_time': 0.0}
                 await analyzer.analyze()
                 
-                mock_file_writers.write_json.assert_called_once()
+                mock_create.assert_called_once_with("json", "output.csv")
                 assert 'unique_md5' in analyzer.stats
\ No newline at end of file
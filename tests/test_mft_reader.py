@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import pytest
+import tempfile
+from pathlib import Path
+from src.analyzeMFT.constants import *
+from src.analyzeMFT.mft_record import MftRecord
+from src.analyzeMFT.mft_reader import MftReader, benchmark_readers
+from src.analyzeMFT.hash_processor import HashProcessor
+from src.analyzeMFT.test_generator import create_test_mft
+
+
+class TestMftReader:
+    """Test mmap and buffered record readers."""
+
+    def setup_method(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.mft_path = Path(self.temp_dir) / "reader.mft"
+        create_test_mft(str(self.mft_path), num_records=25, test_type="normal")
+        self.data = self.mft_path.read_bytes()
+
+    def teardown_method(self):
+        """Clean up test environment."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @pytest.mark.parametrize("io_mode", ["mmap", "buffered"])
+    def test_reads_all_records(self, io_mode):
+        """Test that both modes return every record in order."""
+        records = []
+        with MftReader(str(self.mft_path), chunk_size=10, io_mode=io_mode) as reader:
+            assert reader.mode == io_mode
+            for chunk in reader:
+                assert len(chunk) <= 10
+                records.extend(bytes(view) for view in chunk)
+
+        assert b''.join(records) == self.data
+
+    def test_trailing_partial_record_ignored(self):
+        """Test that an incomplete trailing record is not returned."""
+        with open(self.mft_path, 'ab') as f:
+            f.write(b'\x00' * 100)
+
+        for io_mode in ("mmap", "buffered"):
+            with MftReader(str(self.mft_path), chunk_size=7, io_mode=io_mode) as reader:
+                assert sum(len(chunk) for chunk in reader) == len(self.data) // MFT_RECORD_SIZE
+
+    def test_auto_falls_back_for_empty_file(self):
+        """Test that auto mode falls back to buffered reads when mmap is impossible."""
+        empty = Path(self.temp_dir) / "empty.mft"
+        empty.write_bytes(b'')
+
+        with MftReader(str(empty), io_mode="auto") as reader:
+            assert reader.mode == "buffered"
+            assert reader.read_chunk() == []
+
+        with pytest.raises(ValueError):
+            MftReader(str(empty), io_mode="mmap").open()
+
+    def test_invalid_mode(self):
+        """Test that an unknown I/O mode is rejected."""
+        with pytest.raises(ValueError):
+            MftReader(str(self.mft_path), io_mode="direct")
+
+    def test_records_and_hashes_from_views(self):
+        """Test that parsing and hashing memoryview records matches bytes input."""
+        with MftReader(str(self.mft_path), chunk_size=25, io_mode="mmap") as reader:
+            chunk = reader.read_chunk()
+            from_views = [MftRecord(view, compute_hashes=True).to_csv() for view in chunk]
+            hashes = HashProcessor(num_processes=2).compute_hashes_multiprocessed(chunk)
+            del chunk
+
+        raw = [self.data[i:i + MFT_RECORD_SIZE] for i in range(0, len(self.data), MFT_RECORD_SIZE)]
+        assert from_views == [MftRecord(r, compute_hashes=True).to_csv() for r in raw]
+        assert [h.md5 for h in hashes] == [MftRecord(r, compute_hashes=True).md5 for r in raw]
+
+    def test_benchmark_readers(self):
+        """Test the reader benchmark reports every mode."""
+        results = benchmark_readers(str(self.mft_path), chunk_size=10)
+        assert set(results) == {'read', 'buffered', 'mmap'}
+        assert all(r['records'] == len(self.data) // MFT_RECORD_SIZE for r in results.values())
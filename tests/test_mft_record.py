@@ -1,8 +1,9 @@
 import pytest
 import struct
+import hashlib
 import os
 from unittest.mock import patch, MagicMock
-from src.analyzeMFT.mft_record import MftRecord
+from src.analyzeMFT.mft_record import MftRecord, MFT_RECORD_HEADER, attribute_projection
 from src.analyzeMFT.constants import *
 from src.analyzeMFT.windows_time import WindowsTime
 import uuid
@@ -215,10 +216,20 @@ def test_to_csv(mft_record):
 def test_compute_hashes(mft_record):
     mft_record.compute_hashes()
     
-    assert len(mft_record.md5) == 32
-    assert len(mft_record.sha256) == 64
-    assert len(mft_record.sha512) == 128
-    assert len(mft_record.crc32) == 8
+    assert len(mft_record.md5) == 16
+    assert len(mft_record.sha256) == 32
+    assert len(mft_record.sha512) == 64
+    assert len(mft_record.crc32) == 4
+    assert mft_record.to_csv()[-4:] == [mft_record.md5.hex(), mft_record.sha256.hex(),
+                                        mft_record.sha512.hex(), mft_record.crc32.hex()]
+
+def test_compute_selected_hashes(mft_record):
+    mft_record.compute_hashes(('sha256',))
+    
+    assert mft_record.sha256 == hashlib.sha256(mft_record.raw_record).digest()
+    assert mft_record.md5 is None and mft_record.sha512 is None and mft_record.crc32 is None
+    assert mft_record.to_csv()[-4:] == ["", mft_record.sha256.hex(), "", ""]
+    assert mft_record.to_dict()['sha256'] == mft_record.sha256.hex()
 
 def test_get_file_type(mft_record):
     mft_record.flags = FILE_RECORD_IS_DIRECTORY
@@ -372,4 +383,96 @@ def test_parse_large_attribute():
     large_attr_record[24:] = large_attr_data
     
     record = MftRecord(large_attr_record)
-    assert DATA_ATTRIBUTE in record.attribute_types
\ No newline at end of file
+    assert DATA_ATTRIBUTE in record.attribute_types
+
+def test_header_struct_covers_record_header():
+    assert MFT_RECORD_HEADER.size == MFT_RECORD_RECORD_NUMBER_OFFSET + MFT_RECORD_RECORD_NUMBER_SIZE
+
+def test_parse_record_from_memoryview(mock_raw_record):
+    record = MftRecord(memoryview(bytes(mock_raw_record)))
+    assert record.magic == int.from_bytes(MFT_RECORD_MAGIC, BYTE_ORDER)
+    assert record.upd_off == 42
+    assert record.lsn == 12345
+    assert record.flags == FILE_RECORD_IN_USE
+    assert record.next_attrid == 2
+    assert record.recordnum == 5
+
+def test_record_has_no_instance_dict(mft_record):
+    assert not hasattr(mft_record, '__dict__')
+    with pytest.raises(AttributeError):
+        mft_record.unknown_field = 1
+
+def test_attribute_mask(mft_record):
+    mft_record.add_attribute_type(DATA_ATTRIBUTE)
+    mft_record.add_attribute_type(LOGGED_UTILITY_STREAM_ATTRIBUTE)
+    mft_record.add_attribute_type(0x1234)
+    assert mft_record.has_attribute(DATA_ATTRIBUTE)
+    assert mft_record.has_attribute(LOGGED_UTILITY_STREAM_ATTRIBUTE)
+    assert mft_record.has_attribute(0x1234)
+    assert not mft_record.has_attribute(FILE_NAME_ATTRIBUTE)
+    assert mft_record.attribute_types == {DATA_ATTRIBUTE, LOGGED_UTILITY_STREAM_ATTRIBUTE, 0x1234}
+
+def test_times_setter_round_trip(mft_record):
+    times = {key: WindowsTime.from_filetime(131000000000000000 + i) for i, key in enumerate(('crtime', 'mtime', 'ctime', 'atime'))}
+    mft_record.fn_times = times
+    assert {k: v.filetime for k, v in mft_record.fn_times.items()} == {k: v.filetime for k, v in times.items()}
+    assert all(t.filetime == 0 for t in mft_record.si_times.values())
+
+def test_attribute_fields_survive_init():
+    record = bytearray(MFT_RECORD_SIZE)
+    struct.pack_into("<H", record, 20, 56)
+    vn_data = struct.pack("<H", 4) + "Test".encode('utf-16-le')
+    add_attribute(record, 56, VOLUME_NAME_ATTRIBUTE, vn_data)
+    assert MftRecord(record).volume_name == "Test"
+
+def test_release_raw_keeps_parsed_fields(mft_record):
+    csv_row = mft_record.to_csv()
+    mft_record.release_raw()
+    assert mft_record.raw_record is None
+    assert mft_record.to_csv() == csv_row
+
+def test_to_dict_is_json_serializable(mft_record):
+    import json
+    bitmap_data = struct.pack("<L", 4) + b'\xff' * 4
+    add_attribute(mft_record.raw_record, 56, BITMAP_ATTRIBUTE, bitmap_data)
+    mft_record.parse_bitmap(56)
+    data = json.loads(json.dumps(mft_record.to_dict()))
+    assert data['recordnum'] == 5
+    assert data['si_times']['crtime'] == "Not defined"
+    assert data['bitmap']['data'] == 'ffffffff'
+    assert 'raw_record' not in data
+
+def test_attribute_projection_for_export_formats():
+    assert attribute_projection('csv') is None
+    assert attribute_projection('body') == {STANDARD_INFORMATION_ATTRIBUTE, FILE_NAME_ATTRIBUTE}
+    # Custom fields add to what the format prints and never drop $FILE_NAME or $STANDARD_INFORMATION
+    assert attribute_projection('csv', ['recordnum', 'volume_name']) is None
+    assert attribute_projection('body', ['recordnum']) == {STANDARD_INFORMATION_ATTRIBUTE, FILE_NAME_ATTRIBUTE}
+    assert attribute_projection('body', ['volume_name']) == {STANDARD_INFORMATION_ATTRIBUTE, FILE_NAME_ATTRIBUTE,
+                                                             VOLUME_NAME_ATTRIBUTE}
+    assert attribute_projection('body', ['not_a_field']) is None
+
+def test_projection_skips_unselected_attributes(mock_raw_record):
+    vn_data = struct.pack("<H", 4) + "Test".encode('utf-16-le')
+    offset = add_attribute(mock_raw_record, 56, VOLUME_NAME_ATTRIBUTE, vn_data)
+    add_attribute(mock_raw_record, offset, BITMAP_ATTRIBUTE, struct.pack("<L", 4) + b'\xff' * 4)
+
+    record = MftRecord(mock_raw_record, attributes=frozenset({VOLUME_NAME_ATTRIBUTE}))
+    assert record.volume_name == "Test"
+    assert record.bitmap is None
+    assert record.has_attribute(BITMAP_ATTRIBUTE)
+
+def test_attribute_headers_kept_on_request(mock_raw_record):
+    vn_data = struct.pack("<H", 4) + "Test".encode('utf-16-le')
+    offset = add_attribute(mock_raw_record, 56, VOLUME_NAME_ATTRIBUTE, vn_data)
+    struct.pack_into('<LLBBHHH', mock_raw_record, offset, DATA_ATTRIBUTE, 80, 1, 3, 72, 0, 4)
+    struct.pack_into('<QQH', mock_raw_record, offset + 16, 0, 9, 64)
+    struct.pack_into('<QQQ', mock_raw_record, offset + 40, 40960, 40000, 40000)
+    mock_raw_record[offset + 72:offset + 78] = "ads".encode('utf-16-le')
+
+    record = MftRecord(mock_raw_record, attribute_headers=True)
+    assert record.attribute_headers == [
+        (VOLUME_NAME_ATTRIBUTE, '', True, 0, 56, 34, 24, 10, 10),
+        (DATA_ATTRIBUTE, 'ads', False, 4, offset, 80, 64, 40000, 40960),
+    ]
+    assert MftRecord(mock_raw_record).attribute_headers is None
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+import asyncio
+import logging
+import pytest
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+from src.analyzeMFT.constants import *
+from src.analyzeMFT.mft_record import MftRecord
+from src.analyzeMFT.mft_analyzer import MftAnalyzer
+from src.analyzeMFT.parallel_parser import ParallelParser, plan_shards, parse_shard
+from src.analyzeMFT.test_generator import create_test_mft
+
+
+class TestParallelParser:
+    """Test sharded multi-process parsing."""
+
+    def setup_method(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.mft_path = Path(self.temp_dir) / "parallel.mft"
+        create_test_mft(str(self.mft_path), num_records=120, test_type="normal")
+        self.data = self.mft_path.read_bytes()
+
+    def teardown_method(self):
+        """Clean up test environment."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_plan_shards(self):
+        """Test shards are record-aligned and cover every complete record."""
+        shards = plan_shards(10 * MFT_RECORD_SIZE + 100, 4)
+        assert shards == [(0, 4), (4, 4), (8, 2)]
+        assert plan_shards(0, 4) == []
+
+        with pytest.raises(ValueError):
+            plan_shards(MFT_RECORD_SIZE, 0)
+
+    def test_parse_shard_matches_mft_record(self):
+        """Test a worker shard against parsing each record directly."""
+        result = parse_shard((str(self.mft_path), 0, 10, 5, True, 0, None, HASH_ALGORITHMS, False))
+        assert result.bytes_read == 5 * MFT_RECORD_SIZE
+
+        assert all(isinstance(row, tuple) for row in result.rows)
+        for i, record in enumerate(result.records()):
+            raw = self.data[(10 + i) * MFT_RECORD_SIZE:(11 + i) * MFT_RECORD_SIZE]
+            expected = MftRecord(raw, compute_hashes=True)
+            assert record.raw_record is None
+            assert record.to_csv() == expected.to_csv()
+            assert record.to_row() == expected.to_row()
+
+    def test_shards_merged_in_order(self):
+        """Test results arrive in file order across worker processes."""
+        parser = ParallelParser(str(self.mft_path), num_processes=2, shard_records=7)
+        shards = list(parser)
+
+        assert [s.index for s in shards] == list(range(len(shards)))
+        recordnums = [r.recordnum for s in shards for r in s.records()]
+        assert recordnums == [MftRecord(self.data[i:i + MFT_RECORD_SIZE]).recordnum
+                              for i in range(0, len(self.data), MFT_RECORD_SIZE)]
+        assert parser.stats['records'] == len(recordnums)
+
+    def test_async_iteration(self):
+        """Test that awaiting shards gives the same results and stops cleanly part way through."""
+        async def collect(limit=None):
+            parser = ParallelParser(str(self.mft_path), num_processes=2, shard_records=7)
+            shards = parser.iter_async()
+            results = []
+            try:
+                async for shard in shards:
+                    results.append(shard)
+                    if len(results) == limit:
+                        break
+            finally:
+                await shards.aclose()
+            return parser, results
+
+        parser, results = asyncio.run(collect())
+        expected = list(ParallelParser(str(self.mft_path), num_processes=2, shard_records=7))
+        assert [s.rows for s in results] == [s.rows for s in expected]
+        assert parser.stats['shards'] == len(expected) and parser.stats['wall_time'] > 0
+
+        parser, results = asyncio.run(collect(limit=2))
+        assert [s.index for s in results] == [0, 1]
+
+    def test_retain_raw_records_ignored_in_parallel(self):
+        """Test that raw records are neither kept nor budgeted when workers parse."""
+        output = Path(self.temp_dir) / "out.csv"
+        with patch.object(logging.getLogger('analyzeMFT'), 'warning') as warning:
+            analyzer = MftAnalyzer(str(self.mft_path), str(output), retain_raw_records=True, parallel_workers=2)
+        assert not analyzer.retain_raw_records
+        assert any("--retain-raw-records is ignored" in call.args[0] for call in warning.call_args_list)
+        assert MftAnalyzer(str(self.mft_path), str(output), retain_raw_records=True).retain_raw_records
+
+    def test_analyzer_parallel_matches_sequential(self):
+        """Test parallel analysis writes the same CSV as the sequential path."""
+        outputs = {}
+        for workers in (None, 2):
+            output = Path(self.temp_dir) / f"out_{workers}.csv"
+            analyzer = MftAnalyzer(str(self.mft_path), str(output), chunk_size=16,
+                                   compute_hashes=True, parallel_workers=workers)
+            asyncio.run(analyzer.analyze())
+            outputs[workers] = output.read_text()
+            assert analyzer.stats['total_records'] == len(self.data) // MFT_RECORD_SIZE
+            assert analyzer.stats['parse_errors'] == 0
+
+        assert outputs[None] == outputs[2]
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+import asyncio
+import csv
+import struct
+import tempfile
+from pathlib import Path
+import pytest
+from src.analyzeMFT.batch_parser import RecordBatch
+from src.analyzeMFT.constants import *
+from src.analyzeMFT.mft_record import MftRecord
+from src.analyzeMFT.mft_analyzer import MftAnalyzer
+from src.analyzeMFT.path_index import PathIndex, scan_record
+from src.analyzeMFT.test_generator import create_test_mft
+
+
+def make_record(recordnum, filename, parent, directory=False):
+    """Build a record holding only a resident $FILE_NAME attribute."""
+    record = bytearray(MFT_RECORD_SIZE)
+    flags = FILE_RECORD_IN_USE | (FILE_RECORD_IS_DIRECTORY if directory else 0)
+    struct.pack_into(STRUCT_MFT_RECORD_HEADER, record, 0, int.from_bytes(MFT_RECORD_MAGIC, BYTE_ORDER),
+                     48, 3, 0, 1, 1, 56, flags, MFT_RECORD_SIZE, MFT_RECORD_SIZE, 0, 4, recordnum)
+    name = filename.encode('utf-16-le')
+    content = struct.pack('<Q', parent | (1 << 48)) + bytes(56) + bytes([len(filename), 1]) + name
+    attr_len = (24 + len(content) + 7) & ~7
+    struct.pack_into('<LLLHH', record, 56, FILE_NAME_ATTRIBUTE, attr_len, 0, len(content), 0)
+    struct.pack_into('<H', record, 76, 24)
+    record[80:80 + len(content)] = content
+    struct.pack_into('<L', record, 56 + attr_len, 0xFFFFFFFF)
+    return bytes(record)
+
+
+class TestPathIndex:
+    """Test the first-pass name and parent index."""
+
+    def setup_method(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.mft_path = Path(self.temp_dir) / "index.mft"
+
+    def teardown_method(self):
+        """Clean up test environment."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_forward_reference_mft(self):
+        """Write root, a file at record 6 and its parent directory at record 8."""
+        records = [make_record(i, f"System_{i}", 5) for i in range(5)]
+        records.append(make_record(5, ".", 5, directory=True))
+        records.append(make_record(6, "early.txt", 8))
+        records.append(make_record(7, "other.txt", 5))
+        records.append(make_record(8, "LateDir", 5, directory=True))
+        self.mft_path.write_bytes(b''.join(records))
+
+    def test_scan_matches_full_parse(self):
+        """Test the header/$FILE_NAME scan against MftRecord for every record."""
+        create_test_mft(str(self.mft_path), num_records=60, test_type="normal")
+        data = self.mft_path.read_bytes()
+
+        for offset in range(0, len(data), MFT_RECORD_SIZE):
+            raw = data[offset:offset + MFT_RECORD_SIZE]
+            record = MftRecord(raw)
+            recordnum, seq, flags, parent_ref, filename = scan_record(memoryview(raw))
+            assert (recordnum, seq, flags, filename) == (record.recordnum, record.seq, record.flags, record.filename)
+            assert parent_ref & 0x0000FFFFFFFFFFFF == record.get_parent_record_num()
+
+    def test_lookup_and_interned_names(self):
+        """Test lookups by header record number and that repeated names are stored once."""
+        self.write_forward_reference_mft()
+        index = PathIndex.build(str(self.mft_path), chunk_size=4)
+
+        assert len(index) == 9
+        entry = index.get(6)
+        assert (entry.filename, entry.get_parent_record_num(), entry.parent_seq) == ("early.txt", 8, 1)
+        assert index.get(8).flags & FILE_RECORD_IS_DIRECTORY
+        assert index.get(42) is None
+
+        index = PathIndex()
+        index.add(make_record(0, "early.txt", 5))
+        index.add(make_record(1, "early.txt", 8))
+        assert bytes(index.name_pool) == b"early.txt"
+        assert index.get(1).filename == "early.txt"
+
+    def test_batch_matches_per_record_add(self):
+        """Test that indexing a RecordBatch gives the same columns as adding each record."""
+        pytest.importorskip("numpy")
+        create_test_mft(str(self.mft_path), num_records=60, test_type="normal")
+        records = [make_record(3, "moved.txt", 5), make_record(1, "a" * 200, 5)]
+        records.append(make_record(2, "again.txt", 3))
+        overlong = bytearray(make_record(4, "cut.txt", 5))
+        overlong[80 + 64] = 255
+        records.append(bytes(overlong))
+        data = self.mft_path.read_bytes() + b''.join(records)
+
+        per_record, batched = PathIndex(), PathIndex()
+        for offset in range(0, len(data), MFT_RECORD_SIZE):
+            per_record.add(data[offset:offset + MFT_RECORD_SIZE])
+        for offset in range(0, len(data), 16 * MFT_RECORD_SIZE):
+            batched.add_batch(RecordBatch(data[offset:offset + 16 * MFT_RECORD_SIZE]))
+
+        for column in ('recordnums', 'seqs', 'flags', 'parents', 'name_offsets', 'name_lengths', 'name_pool'):
+            assert getattr(batched, column) == getattr(per_record, column)
+        assert batched.positions == per_record.positions and batched.positions
+        assert batched.get(3).filename == "moved.txt"
+
+    def test_interning_is_bounded(self):
+        """Test that the interning table keeps only recent names and common names stay shared."""
+        index = PathIndex(intern_size=8)
+        for recordnum in range(100):
+            index.add(make_record(recordnum, "desktop.ini" if recordnum % 2 else f"file_{recordnum}.txt", 5))
+            assert len(index._interned) <= 8
+
+        assert bytes(index.name_pool).count(b"desktop.ini") == 1
+        assert [index.get(n).filename for n in (0, 1, 98, 99)] == ["file_0.txt", "desktop.ini", "file_98.txt", "desktop.ini"]
+        index.finish()
+        assert index._interned is None
+
+    def test_compact_size(self):
+        """Test that the index uses tens of bytes per record."""
+        create_test_mft(str(self.mft_path), num_records=500, test_type="normal")
+        index = PathIndex.build(str(self.mft_path))
+        assert index.memory_usage() / len(index) < 64
+
+    def test_analyzer_resolves_forward_references(self):
+        """Test that a parent stored after its child resolves with the index and not without it."""
+        self.write_forward_reference_mft()
+        paths = {}
+        for use_index in (True, False):
+            output = Path(self.temp_dir) / f"out_{use_index}.csv"
+            analyzer = MftAnalyzer(str(self.mft_path), str(output), chunk_size=2, path_index=use_index)
+            asyncio.run(analyzer.analyze())
+            with open(output, newline='') as f:
+                rows = list(csv.DictReader(f))
+            # The path is written to the last column; the first row per record is the chunked write
+            paths[use_index] = {}
+            for row in rows:
+                paths[use_index].setdefault(row['Filename'], row['CRC32'])
+
+        assert paths[True]["early.txt"] == "\\LateDir\\early.txt"
+        assert paths[False]["early.txt"] == "UnknownParent_8\\early.txt"
+        assert paths[True]["other.txt"] == paths[False]["other.txt"] == "\\other.txt"
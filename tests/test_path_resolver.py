@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import pytest
+from src.analyzeMFT.path_resolver import PathResolver
+
+
+class FakeRecord:
+    """Minimal record exposing what PathResolver reads."""
+
+    def __init__(self, recordnum, filename, parent, seq=1):
+        self.recordnum = recordnum
+        self.filename = filename
+        self.parent = parent
+        self.seq = seq
+
+    def get_parent_record_num(self):
+        return self.parent
+
+
+class TestPathResolver:
+    """Test memoized path reconstruction."""
+
+    def setup_method(self):
+        """Build a small tree: root(5) -> Windows(30) -> System32(31) -> files."""
+        self.records = {}
+        for record in (FakeRecord(5, ".", 5), FakeRecord(30, "Windows", 5), FakeRecord(31, "System32", 30),
+                       FakeRecord(40, "a.dll", 31), FakeRecord(41, "b.dll", 31), FakeRecord(42, "", 31)):
+            self.records[record.recordnum] = record
+        self.resolver = PathResolver(self.records.get)
+
+    def test_paths_and_cache_hits(self):
+        """Test that siblings reuse the cached directory path."""
+        assert self.resolver.resolve(self.records[40]) == "\\Windows\\System32\\a.dll"
+        misses = self.resolver.misses
+        assert self.resolver.resolve(self.records[41]) == "\\Windows\\System32\\b.dll"
+        assert self.resolver.resolve(self.records[42]) == "\\Windows\\System32\\Unknown_42"
+        assert self.resolver.misses == misses
+        assert self.resolver.hits == 2
+        assert self.resolver.resolve(self.records[5]) == ""
+
+    def test_orphan_and_unknown_parent(self):
+        """Test the markers for self-referencing and missing parents."""
+        orphan = FakeRecord(50, "orphan.txt", 50)
+        lost = FakeRecord(51, "lost.txt", 9999)
+        assert self.resolver.resolve(orphan) == "OrphanedFiles\\orphan.txt"
+        assert self.resolver.resolve(lost) == "UnknownParent_9999\\lost.txt"
+
+    def test_unknown_parent_not_cached(self):
+        """Test that a path is resolved again once a forward-referenced parent arrives."""
+        self.records[61] = FakeRecord(61, "child_dir", 60)
+        leaf = FakeRecord(62, "leaf.txt", 61)
+        assert self.resolver.resolve(leaf) == "UnknownParent_60\\child_dir\\leaf.txt"
+
+        self.records[60] = FakeRecord(60, "late", 5)
+        assert self.resolver.resolve(leaf) == "\\late\\child_dir\\leaf.txt"
+
+    def test_cycle_detected(self):
+        """Test that a parent loop is cut instead of walking a fixed depth."""
+        self.records[70] = FakeRecord(70, "loop_a", 71)
+        self.records[71] = FakeRecord(71, "loop_b", 70)
+        assert self.resolver.resolve(self.records[70]) == "CyclicPath\\loop_b\\loop_a"
+        assert self.resolver.cycles == 1
+
+    def test_deep_path_not_truncated(self):
+        """Test that chains deeper than the old 255-level cutoff resolve fully."""
+        parent = 5
+        for recordnum in range(100, 400):
+            self.records[recordnum] = FakeRecord(recordnum, f"d{recordnum}", parent)
+            parent = recordnum
+        path = self.resolver.resolve(self.records[399])
+        assert path.split("\\")[1] == "d100"
+        assert len(path.split("\\")) == 301
+
+    def test_bounded_cache(self):
+        """Test least recently used eviction and sequence-number keys."""
+        resolver = PathResolver(self.records.get, max_entries=2)
+        resolver.resolve(self.records[40])
+        assert len(resolver.cache) == 2
+        assert (31, 1) in resolver.cache and (5, 1) not in resolver.cache
+
+        self.records[31] = FakeRecord(31, "Reused", 5, seq=2)
+        assert resolver.resolve(self.records[41]) == "\\Reused\\b.dll"
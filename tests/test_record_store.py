@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import asyncio
+import os
+import random
+import tempfile
+from pathlib import Path
+import pytest
+from src.analyzeMFT.mft_analyzer import MftAnalyzer
+from src.analyzeMFT.record_store import RecordStore
+from src.analyzeMFT.test_generator import create_test_mft
+
+
+class TestRecordStore:
+    """Test the spill-to-disk record mapping."""
+
+    def setup_method(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up test environment."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_behaves_like_dict(self):
+        """Test random sets, gets and deletes against a dict, including iteration order."""
+        rng = random.Random(7)
+        expected = {}
+        with RecordStore(max_in_memory=20, directory=self.temp_dir) as store:
+            for step in range(2000):
+                key = rng.randrange(150)
+                action = rng.random()
+                if action < 0.6:
+                    expected[key] = store[key] = ("record", key, step)
+                elif action < 0.9:
+                    assert store.get(key) == expected.get(key)
+                elif key in expected:
+                    del expected[key]
+                    del store[key]
+                assert len(store) == len(expected)
+
+            assert list(store) == list(expected)
+            assert list(store.items()) == list(expected.items())
+            assert store.get_stats()['spilled'] > 0
+
+    def test_values_read_without_promotion(self):
+        """Test that iterating values leaves the hot set alone and that close removes the file."""
+        store = RecordStore(max_in_memory=10, directory=self.temp_dir)
+        for key in range(100):
+            store[key] = f"record_{key}"
+        hot_keys = list(store.hot)
+
+        assert list(store.values()) == [f"record_{key}" for key in range(100)]
+        assert list(store.hot) == hot_keys
+        assert 5 in store and 500 not in store
+        assert store[5] == "record_5"
+        assert list(store.hot)[-1] == 5
+
+        path = store.path
+        assert os.path.exists(path)
+        store.close()
+        assert not os.path.exists(path)
+
+    def test_lookups_during_iteration(self):
+        """Test that reads and evictions inside a values() or items() loop skip and repeat nothing."""
+        store = RecordStore(max_in_memory=10, directory=self.temp_dir)
+        for key in range(100):
+            store[key] = f"record_{key}"
+
+        seen = []
+        for key, record in store.items():
+            seen.append(key)
+            if key in (20, 40, 59):
+                for lookup in range(key + 1, key + 15):
+                    assert store.get(lookup) == f"record_{lookup}"
+        assert seen == list(range(100))
+        assert list(store.values()) == [f"record_{key}" for key in range(100)]
+
+        store[60] = "changed"
+        for _ in range(2):
+            for key in range(80, 100):
+                store.get(key)
+        assert 60 not in store.hot and store.get_stats()['on_disk'] == 100 - len(store.hot)
+        assert len(store) == 100 and store[60] == "changed"
+        del store[60]
+        assert 60 not in store and len(store) == 99
+        store.close()
+
+    def test_rejects_empty_hot_set(self):
+        """Test that at least one record must stay in memory."""
+        with pytest.raises(ValueError):
+            RecordStore(max_in_memory=0)
+
+    @pytest.mark.parametrize("export_format", ["csv", "body"])
+    def test_analyzer_output_unchanged(self, export_format):
+        """Test that spilling records does not change the export."""
+        mft_path = Path(self.temp_dir) / "spill.mft"
+        create_test_mft(str(mft_path), num_records=300, test_type="normal")
+        outputs = []
+        for limit in (None, 25):
+            output = Path(self.temp_dir) / f"out_{limit}.{export_format}"
+            analyzer = MftAnalyzer(str(mft_path), str(output), export_format=export_format, chunk_size=64,
+                                   max_records_in_memory=limit, spill_dir=self.temp_dir)
+            asyncio.run(analyzer.analyze())
+            outputs.append(output.read_bytes())
+
+        assert outputs[0] == outputs[1]
+        assert not list(Path(self.temp_dir).glob("analyzeMFT_records_*"))
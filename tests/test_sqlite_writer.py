@@ -2,12 +2,39 @@
 
 import pytest
 import sqlite3
+import struct
 import tempfile
 import logging
 from pathlib import Path
 from unittest.mock import Mock, patch
-from src.analyzeMFT.sqlite_writer import SQLiteWriter
+from src.analyzeMFT.sqlite_writer import (SQLiteWriter, BackgroundSQLiteWriter, SCHEMA_INDEXES, LOAD_INDEXES,
+                                         DIRECTORY_INDEXES)
 from src.analyzeMFT.mft_record import MftRecord
+from src.analyzeMFT.constants import *
+
+
+def build_raw_record(recordnum, filename, parent_ref, seq=1):
+    """Build a raw record with resident $STANDARD_INFORMATION, $FILE_NAME and $OBJECT_ID attributes."""
+    record = bytearray(MFT_RECORD_SIZE)
+    struct.pack_into(STRUCT_MFT_RECORD_HEADER, record, 0, int.from_bytes(MFT_RECORD_MAGIC, BYTE_ORDER),
+                     48, 3, 0, seq, 1, 56, FILE_RECORD_IN_USE, 400, MFT_RECORD_SIZE, (2 << 48) | 17, 6, recordnum)
+    name = filename.encode('utf-16-le')
+    attributes = [
+        (STANDARD_INFORMATION_ATTRIBUTE, struct.pack('<QQQQ', 131092560000000000, 131092560010000000,
+                                                     131092560020000000, 131092560030000000) + bytes(16)),
+        (FILE_NAME_ATTRIBUTE, struct.pack('<QQQQQQQLL', parent_ref, 131092560040000000, 0, 0, 0, 8192, 4096, 0, 0)
+         + bytes([len(filename), 1]) + name),
+        (OBJECT_ID_ATTRIBUTE, bytes(range(64))),
+    ]
+    offset = 56
+    for attr_type, content in attributes:
+        attr_len = (24 + len(content) + 7) & ~7
+        struct.pack_into('<LLLHH', record, offset, attr_type, attr_len, 0, len(content), 0)
+        struct.pack_into('<H', record, offset + 20, 24)
+        record[offset + 24:offset + 24 + len(content)] = content
+        offset += attr_len
+    struct.pack_into('<L', record, offset, 0xFFFFFFFF)
+    return bytes(record)
 
 
 class TestSQLiteWriter:
@@ -113,6 +140,25 @@ class TestSQLiteWriter:
         
         writer.close()
     
+    def test_hash_digests_stored_as_blobs(self):
+        """Test that hash digests are stored as raw bytes and unselected hashes as NULL."""
+        writer = SQLiteWriter(str(self.test_db_path), self.logger)
+        writer.connect()
+        
+        digest = bytes(range(32))
+        record = self.create_mock_record(record_num=7, sha256=digest)
+        writer.write_record(record, "/test/path/test_file_7.txt")
+        writer.conn.commit()
+        
+        result = writer.cursor.execute(
+            "SELECT md5_hash, sha256_hash, typeof(sha256_hash) FROM mft_records WHERE record_number = ?",
+            (7,)
+        ).fetchone()
+        
+        assert result == (None, digest, 'blob')
+        
+        writer.close()
+    
     def test_write_multiple_records(self):
         """Test writing multiple MFT records."""
         writer = SQLiteWriter(str(self.test_db_path), self.logger)
@@ -279,4 +325,270 @@ class TestSQLiteWriter:
         count = writer2.cursor.fetchone()[0]
         assert count == 2
         
-        writer2.close()
\ No newline at end of file
+        writer2.close()
+
+    def get_index_names(self, conn):
+        """Return the names of the explicit indexes in a database."""
+        rows = conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND sql IS NOT NULL").fetchall()
+        return {row[0] for row in rows}
+
+    def test_bulk_load_defers_indexes(self):
+        """Test that bulk load tunes the connection and builds indexes only at the end."""
+        writer = SQLiteWriter(str(self.test_db_path), self.logger, bulk_load=True)
+        writer.connect()
+        assert writer.cursor.execute("PRAGMA synchronous").fetchone()[0] == 0
+        assert writer.cursor.execute("PRAGMA cache_size").fetchone()[0] == -256 * 1024
+        assert writer.cursor.execute("PRAGMA temp_store").fetchone()[0] == 2
+        assert self.get_index_names(writer.conn) == {name for name, _ in LOAD_INDEXES + DIRECTORY_INDEXES}
+
+        records = [self.create_mock_record(record_num=i, flags=i % 4) for i in range(50)]
+        writer.write_records_batch(records, {i: f"/test/path/test_file_{i}.txt" for i in range(50)})
+        writer.close()
+
+        conn = sqlite3.connect(str(self.test_db_path))
+        try:
+            assert self.get_index_names(conn) == {name for name, _ in SCHEMA_INDEXES + LOAD_INDEXES + DIRECTORY_INDEXES}
+            assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+            assert conn.execute("SELECT COUNT(*), SUM(is_directory) FROM mft_records").fetchone() == (50, 24)
+            assert conn.execute("SELECT filepath FROM mft_records WHERE record_number = 7").fetchone() == \
+                ("/test/path/test_file_7.txt",)
+        finally:
+            conn.close()
+
+    def test_bulk_load_into_existing_database(self):
+        """Test that loading into an existing database drops and rebuilds its indexes."""
+        with SQLiteWriter(str(self.test_db_path), self.logger) as writer:
+            writer.write_records_batch([self.create_mock_record(record_num=1)])
+
+        writer = SQLiteWriter(str(self.test_db_path), self.logger, bulk_load=True, cache_kib=4096)
+        writer.connect()
+        assert writer.cursor.execute("PRAGMA cache_size").fetchone()[0] == -4096
+        assert writer.cursor.execute("PRAGMA temp_store").fetchone()[0] == 1
+        assert self.get_index_names(writer.conn) == {name for name, _ in LOAD_INDEXES + DIRECTORY_INDEXES}
+        writer.write_records_batch([self.create_mock_record(record_num=2)])
+        writer.finish_bulk_load()
+        assert not writer.bulk_loading
+        assert self.get_index_names(writer.conn) == {name for name, _ in SCHEMA_INDEXES + LOAD_INDEXES + DIRECTORY_INDEXES}
+        assert writer.cursor.execute("PRAGMA synchronous").fetchone()[0] == 2
+        assert writer.get_statistics()['total_records'] == 2
+        writer.close()
+
+    def test_background_writer(self):
+        """Test that batches queued from this thread are inserted and committed by the writer thread."""
+        writer = BackgroundSQLiteWriter(str(self.test_db_path), self.logger, queue_size=2, commit_rows=25)
+        writer.start()
+        for start in range(0, 100, 10):
+            records = [self.create_mock_record(record_num=i) for i in range(start, start + 10)]
+            writer.submit(records, {i: f"/test/path/test_file_{i}.txt" for i in range(start, start + 10)})
+        writer.close()
+        writer.close()
+
+        stats = writer.get_stats()
+        assert stats['rows'] == 100 and stats['batches'] == 10
+        assert stats['commits'] == 4
+        assert stats['queue_depth'] == 0 and 1 <= stats['max_queue_depth'] <= 2
+        assert stats['max_commit_latency'] >= stats['avg_commit_latency'] >= 0
+
+        conn = sqlite3.connect(str(self.test_db_path))
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM mft_records").fetchone()[0] == 100
+            assert self.get_index_names(conn) == {name for name, _ in SCHEMA_INDEXES + LOAD_INDEXES + DIRECTORY_INDEXES}
+        finally:
+            conn.close()
+
+    def test_background_writer_connect_error(self):
+        """Test that a database that cannot be opened fails start() on the calling thread."""
+        self.test_db_path.write_bytes(b"")
+        writer = BackgroundSQLiteWriter(str(self.test_db_path / "nested.db"), self.logger)
+        with pytest.raises(Exception):
+            writer.start()
+        writer.close()
+
+    def test_batch_writes_attributes_and_full_columns(self):
+        """Test one mft_attributes row per kept attribute header and the full record columns."""
+        headers = [
+            (0x10, '', True, 0, 56, 96, 24, 72, 72),
+            (0x80, 'ads', False, 3, 152, 80, 64, 40000, 40960),
+            (0xF0, '', True, 5, 232, 32, 24, 8, 8),
+        ]
+        first = self.create_mock_record(record_num=20, attribute_headers=headers[:1], md5=b'\x01' * 16)
+        replaced = self.create_mock_record(record_num=21, attribute_headers=headers[:1])
+        second = self.create_mock_record(record_num=21, attribute_headers=headers)
+
+        writer = SQLiteWriter(str(self.test_db_path), self.logger, bulk_load=True)
+        writer.connect()
+        writer.write_records_batch([first, replaced])
+        writer.write_records_batch([second], {21: "/test/path/ads.txt"})
+        writer.close()
+
+        conn = sqlite3.connect(str(self.test_db_path))
+        try:
+            rows = conn.execute("""
+                SELECT record_number, attribute_type, attribute_name, attribute_size, resident, data_size,
+                       attribute_id, attribute_offset, content_offset, allocated_size
+                FROM mft_attributes ORDER BY record_number, attribute_offset
+            """).fetchall()
+            assert rows == [(20, 0x10, '', 96, 1, 72, 0, 56, 24, 72)] + [
+                (21, t, n, length, int(r), size, i, o, c, alloc) for t, n, r, i, o, length, c, size, alloc in headers]
+            assert conn.execute("SELECT name FROM attribute_types WHERE id = 240").fetchone() == ("UNKNOWN_0xf0",)
+            assert conn.execute("""
+                SELECT filepath, parent_record_number, md5_hash, has_ads FROM mft_records WHERE record_number = 21
+            """).fetchone() == ("/test/path/ads.txt", 5, None, 1)
+            assert conn.execute("SELECT md5_hash FROM mft_records WHERE record_number = 20").fetchone() == (b'\x01' * 16,)
+            assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+        finally:
+            conn.close()
+
+    def test_batch_columns_from_parsed_record(self):
+        """Test that the record columns are filled from a parsed MftRecord."""
+        record = MftRecord(build_raw_record(30, "parsed.txt", (3 << 48) | 5, seq=7), attribute_headers=True)
+        with SQLiteWriter(str(self.test_db_path), self.logger) as writer:
+            writer.write_records_batch([record], {30: "\\parsed.txt"})
+            row = writer.cursor.execute("""
+                SELECT record_number, sequence_number, used_size, allocated_size, base_record_number,
+                       next_attribute_id, filename, parent_record_number, parent_sequence_number,
+                       si_creation_time, si_modification_time, si_access_time, si_entry_time,
+                       fn_creation_time, fn_modification_time, real_file_size,
+                       object_id, birth_domain_id, is_active, is_directory, has_ads
+                FROM mft_records WHERE record_number = 30
+            """).fetchone()
+
+        si_times = record.si_times
+        assert row == (30, 7, 400, MFT_RECORD_SIZE, 17, 6, "parsed.txt", 5, 3,
+                       si_times['crtime'].dtstr, si_times['mtime'].dtstr, si_times['atime'].dtstr,
+                       si_times['ctime'].dtstr, record.fn_times['crtime'].dtstr, None, 4096,
+                       record.object_id, record.birth_domain_id, 1, 0, 0)
+        assert row[9].startswith("2016-") and row[16]
+
+    def test_times_formatted_exactly(self):
+        """Test that batch and single-record writes truncate sub-second digits exactly, as a float would not."""
+        record = MftRecord(build_raw_record(30, "parsed.txt", 5), attribute_headers=True)
+        record.timestamps[4] = 2186186077639449999
+        rows = []
+        for single in (False, True):
+            with SQLiteWriter(str(self.test_db_path), self.logger) as writer:
+                if single:
+                    writer.write_record(record, "\\parsed.txt")
+                else:
+                    writer.write_records_batch([record], {30: "\\parsed.txt"})
+                rows.append(writer.cursor.execute("""
+                    SELECT si_creation_time, si_entry_time, fn_creation_time, fn_modification_time
+                    FROM mft_records WHERE record_number = 30
+                """).fetchone())
+
+        assert rows[0] == rows[1]
+        assert rows[0][0] == record.si_times['crtime'].dtstr
+        assert rows[0][2] == "8528-09-30T23:02:43.944Z"
+        assert rows[0][3] is None
+
+    def test_full_text_search(self):
+        """Test substring and prefix search through the FTS5 index and that it follows later writes."""
+        names = {1: "Report_2023.docx", 2: "old-report.pdf", 3: "notes.txt", 4: "ab.txt", 5: "Report%.txt"}
+        records = [self.create_mock_record(record_num=num, filename=name) for num, name in names.items()]
+        filepaths = {num: f"\\Users\\Docs\\{name}" if num < 3 else f"\\Temp\\{name}" for num, name in names.items()}
+
+        writer = SQLiteWriter(str(self.test_db_path), self.logger, bulk_load=True, full_text=True)
+        writer.connect()
+        writer.write_records_batch(records, filepaths)
+        writer.close()
+
+        writer = SQLiteWriter(str(self.test_db_path), self.logger)
+        writer.connect()
+        assert writer.search_tokenizer in ("trigram", "unicode61")
+
+        def found(*args, **kwargs):
+            return [row[0] for row in writer.search(*args, **kwargs)]
+
+        assert found("report") == [1, 2, 5]
+        assert found("rt_2") == [1]
+        assert found("%") == [5]
+        assert found("report", prefix=True) == [1, 5]
+        assert found("users\\docs", column="filepath") == [1, 2]
+        assert found("ab") == [4]
+        assert found("report", limit=1) == [1]
+        with pytest.raises(ValueError):
+            writer.search("report", column="notes")
+
+        writer.write_record(self.create_mock_record(record_num=2, filename="renamed.pdf"), "\\Temp\\renamed.pdf")
+        writer.conn.commit()
+        assert found("report") == [1, 5]
+        assert found("renamed") == [2]
+        # Raises if the index no longer matches mft_records
+        writer.cursor.execute("INSERT INTO mft_search (mft_search) VALUES ('integrity-check')")
+        writer.close()
+
+    def test_full_text_search_word_tokenizer(self):
+        """Test the unicode61 fallback: word prefixes use the index and substrings still match."""
+        records = [self.create_mock_record(record_num=1, filename="Report_2023.docx"),
+                   self.create_mock_record(record_num=2, filename="summary report.txt")]
+        with patch("src.analyzeMFT.sqlite_writer.SEARCH_TOKENIZERS", ("unicode61",)):
+            with SQLiteWriter(str(self.test_db_path), self.logger, full_text=True) as writer:
+                writer.write_records_batch(records)
+                assert writer.search_tokenizer == "unicode61"
+                assert [row[0] for row in writer.search("repo", prefix=True)] == [1]
+                assert [row[0] for row in writer.search("port")] == [1, 2]
+
+    def write_directory_tree(self, writer):
+        """Write root(5) -> Users(30) -> x(31) -> AppData(32) with files at each level."""
+        tree = [(5, ".", 5, True, ""), (30, "Users", 5, True, "\\Users"),
+                (31, "x", 30, True, "\\Users\\x"), (32, "AppData", 31, True, "\\Users\\x\\AppData"),
+                (40, "boot.ini", 5, False, "\\boot.ini"), (41, "ntuser.dat", 31, False, "\\Users\\x\\ntuser.dat"),
+                (42, "cache.db", 32, False, "\\Users\\x\\AppData\\cache.db"),
+                (43, "orphan.txt", 99, False, "UnknownParent_99\\orphan.txt")]
+        records = [self.create_mock_record(record_num=num, filename=name, parent_record_num=parent,
+                                           flags=3 if directory else 1, filesize=num * 10)
+                   for num, name, parent, directory, _ in tree]
+        writer.write_records_batch(records, {num: path for num, _, _, _, path in tree})
+
+    def test_directory_index(self):
+        """Test nested-set subtree, depth and size queries and that they use the lft index."""
+        with SQLiteWriter(str(self.test_db_path), self.logger, bulk_load=True) as writer:
+            self.write_directory_tree(writer)
+            writer.finish_bulk_load()
+
+            assert writer.cursor.execute("SELECT id, parent_id, depth FROM directories ORDER BY lft").fetchall() == \
+                [(5, 5, 0), (30, 5, 1), (31, 30, 2), (32, 31, 3)]
+            users = writer.find_directory("\\Users")
+            assert users == 30
+            assert writer.find_directory("\\Missing") is None
+            assert writer.subtree(users) == [(31, "x", 1), (32, "AppData", 2), (41, "ntuser.dat", 2), (42, "cache.db", 3)]
+            assert writer.subtree(users, max_depth=2) == [(31, "x", 1), (32, "AppData", 2), (41, "ntuser.dat", 2)]
+            assert [row[0] for row in writer.subtree(5)] == [30, 31, 32, 40, 41, 42]
+            assert writer.directory_size(users) == (2, 830)
+            assert writer.directory_size(5) == (3, 1230)
+
+            plan = writer.cursor.execute("EXPLAIN QUERY PLAN SELECT id FROM directories WHERE lft BETWEEN 1 AND 5")
+            assert any("idx_directories_lft" in row[-1] for row in plan.fetchall())
+
+    def test_directory_index_cycle(self):
+        """Test that directories in a parent loop still get disjoint intervals."""
+        records = [self.create_mock_record(record_num=50, filename="a", parent_record_num=51, flags=3),
+                   self.create_mock_record(record_num=51, filename="b", parent_record_num=50, flags=3)]
+        with SQLiteWriter(str(self.test_db_path), self.logger) as writer:
+            writer.write_records_batch(records)
+            assert writer.build_directory_index() == 2
+            rows = writer.cursor.execute("SELECT id, lft, rgt, depth FROM directories ORDER BY lft").fetchall()
+            assert rows == [(50, 0, 3, 0), (51, 1, 2, 1)]
+
+    def test_compact_paths(self):
+        """Test that derivable paths are cleared and come back through the record_paths view."""
+        with SQLiteWriter(str(self.test_db_path), self.logger, bulk_load=True, compact_paths=True) as writer:
+            self.write_directory_tree(writer)
+
+        conn = sqlite3.connect(str(self.test_db_path))
+        try:
+            stored = dict(conn.execute("SELECT record_number, filepath FROM mft_records").fetchall())
+            assert stored[42] is None and stored[31] is None
+            assert stored[5] == "" and stored[43] == "UnknownParent_99\\orphan.txt"
+            paths = dict(conn.execute("SELECT record_number, filepath FROM record_paths").fetchall())
+            assert paths[42] == "\\Users\\x\\AppData\\cache.db"
+            assert paths[40] == "\\boot.ini"
+            assert paths[43] == "UnknownParent_99\\orphan.txt"
+        finally:
+            conn.close()
+
+        with SQLiteWriter(str(self.test_db_path), self.logger) as writer:
+            assert writer.search("AppData", column="filepath") == [
+                (32, "AppData", "\\Users\\x\\AppData"), (42, "cache.db", "\\Users\\x\\AppData\\cache.db")]
+            assert writer.search("boot") == [(40, "boot.ini", "\\boot.ini")]
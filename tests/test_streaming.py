@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+import asyncio
+import json
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+import pytest
+from unittest.mock import patch
+from src.analyzeMFT.mft_analyzer import MftAnalyzer, resident_memory
+from src.analyzeMFT.sqlite_writer import (BackgroundSQLiteWriter, BULK_LOAD_CACHE_KIB, DEFAULT_QUEUE_BATCHES,
+                                          MIN_CACHE_KIB)
+from src.analyzeMFT.test_generator import create_test_mft
+
+
+class TestStreamingMode:
+    """Test chunk-at-a-time export with a bounded set of records in memory."""
+
+    def setup_method(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.mft_path = Path(self.temp_dir) / "stream.mft"
+        create_test_mft(str(self.mft_path), num_records=300, test_type="normal")
+
+    def teardown_method(self):
+        """Clean up test environment."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def run_analyzer(self, export_format, **kwargs):
+        output = Path(self.temp_dir) / f"out_{export_format}_{len(list(Path(self.temp_dir).iterdir()))}"
+        analyzer = MftAnalyzer(str(self.mft_path), str(output), export_format=export_format, chunk_size=64, **kwargs)
+        asyncio.run(analyzer.analyze())
+        return analyzer, output
+
+    @pytest.mark.parametrize("export_format", ["body", "tsk", "timeline"])
+    def test_matches_full_export(self, export_format):
+        """Test that streaming writes the same lines as the whole-list writers."""
+        _, full = self.run_analyzer(export_format)
+        analyzer, streamed = self.run_analyzer(export_format, streaming=True)
+
+        # The whole-list export keeps one record per record number; streaming writes every slot,
+        # including the zeroed slots 12-15 that all read as record 0
+        full_lines = full.read_bytes().splitlines()
+        streamed_lines = streamed.read_bytes().splitlines()
+        assert set(full_lines) <= set(streamed_lines)
+        lines_per_record = 4 if export_format == "timeline" else 1
+        assert len(streamed_lines) == analyzer.stats['total_records'] * lines_per_record
+        assert analyzer.mft_records == {}
+        assert analyzer.stats['total_records'] == 300
+
+    def test_json_and_xml_documents(self):
+        """Test that the incrementally written JSON and XML are complete documents with paths."""
+        _, json_output = self.run_analyzer("json", streaming=True)
+        records = json.loads(json_output.read_text(encoding='utf-8'))
+        assert len(records) == 300
+        assert all('filepath' in record for record in records)
+
+        _, xml_output = self.run_analyzer("xml", streaming=True)
+        root = ET.parse(xml_output).getroot()
+        assert len(root.findall("record")) == 300
+        assert root.find("record/filepath") is not None
+
+    def test_jsonl_written_per_chunk(self):
+        """Test that JSON Lines output is written chunk by chunk with or without streaming."""
+        analyzer, output = self.run_analyzer("jsonl")
+        _, streamed = self.run_analyzer("jsonl", streaming=True)
+
+        assert output.read_bytes() == streamed.read_bytes()
+        lines = output.read_bytes().splitlines()
+        assert len(lines) == analyzer.stats['total_records']
+        assert all('filepath' in json.loads(line) for line in lines)
+
+    @pytest.mark.parametrize("export_format", ["jsonl", "xml", "sqlite"])
+    def test_chunked_writers_keep_no_records(self, export_format):
+        """Test that formats written chunk by chunk against the path index hold no parsed records."""
+        analyzer, _ = self.run_analyzer(export_format)
+        assert analyzer.path_index is not None
+        assert len(analyzer.mft_records) == 0
+        assert analyzer.stats['total_records'] == 300
+
+    def budget_mb(self, margin_mb):
+        """Return a budget of margin_mb above what the process already holds."""
+        return resident_memory() // (1024 * 1024) + margin_mb
+
+    def test_max_memory_limits_chunk_size(self):
+        """Test that the budget shrinks chunks and the path cache, and implies streaming."""
+        analyzer = MftAnalyzer(str(self.mft_path), str(Path(self.temp_dir) / "budget.csv"),
+                               chunk_size=50000, max_memory=self.budget_mb(64))
+        asyncio.run(analyzer.analyze())
+
+        assert analyzer.streaming
+        assert analyzer.chunk_size < 50000
+        assert analyzer.path_resolver.max_entries == analyzer.path_cache_size < 65536
+        assert analyzer.stats['total_records'] == 300
+
+        # The resident memory is charged, so a budget it already fills cannot fit one record
+        analyzer.max_memory = self.budget_mb(0)
+        with pytest.raises(MemoryError):
+            analyzer.apply_memory_budget(0, 1000)
+
+    def test_max_memory_sizes_sqlite_writer(self):
+        """Test that a budget shrinks the SQLite page cache and write queue and charges them per record."""
+        budget = self.budget_mb(64)
+        analyzer = MftAnalyzer(str(self.mft_path), str(Path(self.temp_dir) / "budget.db"),
+                               export_format="sqlite", chunk_size=50000, max_memory=budget)
+        analyzer.apply_memory_budget(0, 50000)
+        assert MIN_CACHE_KIB <= analyzer.sqlite_cache_kib < BULK_LOAD_CACHE_KIB
+        assert 1 <= analyzer.sqlite_queue_batches <= DEFAULT_QUEUE_BATCHES
+        sqlite_chunk_size = analyzer.chunk_size
+
+        csv_analyzer = MftAnalyzer(str(self.mft_path), str(Path(self.temp_dir) / "budget.csv"),
+                                   chunk_size=50000, max_memory=budget)
+        csv_analyzer.apply_memory_budget(0, 50000)
+        assert sqlite_chunk_size < csv_analyzer.chunk_size
+
+        with patch("src.analyzeMFT.mft_analyzer.BackgroundSQLiteWriter", wraps=BackgroundSQLiteWriter) as writer:
+            asyncio.run(analyzer.analyze())
+        assert writer.call_args.kwargs['cache_kib'] == analyzer.sqlite_cache_kib
+        assert writer.call_args.kwargs['queue_size'] == analyzer.sqlite_queue_batches
+        assert analyzer.stats['total_records'] == 300
+
+    def test_check_memory_shrinks_then_stops(self):
+        """Test that going over the budget halves the chunk size and then stops the run."""
+        analyzer = MftAnalyzer(str(self.mft_path), str(Path(self.temp_dir) / "over.csv"),
+                               chunk_size=4, max_memory=self.budget_mb(64))
+        over = (analyzer.max_memory + 1) * 1024 * 1024
+        with patch("src.analyzeMFT.mft_analyzer.resident_memory", return_value=over):
+            analyzer.check_memory()
+            assert analyzer.chunk_size == 2
+            analyzer.check_memory()
+            assert analyzer.chunk_size == 1
+            with pytest.raises(MemoryError):
+                analyzer.check_memory()
+
+        analyzer.check_memory()
+        assert analyzer.chunk_size == 1
+
+    def test_over_budget_run_is_aborted(self):
+        """Test that a run whose resident memory stays over the budget is stopped after a chunk."""
+        output = Path(self.temp_dir) / "over.jsonl"
+        analyzer = MftAnalyzer(str(self.mft_path), str(output), export_format="jsonl",
+                               chunk_size=64, max_memory=self.budget_mb(64))
+        measured = iter([0, 0] + [(analyzer.max_memory + 1) * 1024 * 1024] * 100)
+        with patch("src.analyzeMFT.mft_analyzer.resident_memory", side_effect=lambda: next(measured)):
+            with pytest.raises(MemoryError):
+                asyncio.run(analyzer.analyze())
+        assert analyzer.aborted
+        assert 0 < analyzer.stats['total_records'] < 300
+
+    def test_setup_failures_stop_the_run(self):
+        """Test that an unmet budget or a missing index in streaming mode raises instead of finishing."""
+        output = Path(self.temp_dir) / "aborted.jsonl"
+        analyzer = MftAnalyzer(str(self.mft_path), str(output), export_format="jsonl", max_memory=self.budget_mb(64))
+        analyzer.max_memory = 0.001
+        with pytest.raises(MemoryError):
+            asyncio.run(analyzer.analyze())
+        assert analyzer.aborted and analyzer.stats['total_records'] == 0
+
+        analyzer = MftAnalyzer(str(self.mft_path), str(output), export_format="jsonl", streaming=True)
+        with patch("src.analyzeMFT.mft_analyzer.PathIndex.build", side_effect=OSError("unreadable")):
+            with pytest.raises(OSError):
+                asyncio.run(analyzer.analyze())
+        assert analyzer.aborted
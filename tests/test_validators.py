@@ -152,11 +152,19 @@ class TestNumericValidation:
         with pytest.raises(NumericValidationError, match="Debug level must be between"):
             validate_numeric_bounds(chunk_size=1000, debug=-1)
 
+    def test_validate_hll_precision(self):
+        """Test HyperLogLog precision validation"""
+        validate_numeric_bounds(chunk_size=1000, hll_precision=4)
+        validate_numeric_bounds(chunk_size=1000, hll_precision=16)
+        for precision in (3, 17):
+            with pytest.raises(NumericValidationError, match="HyperLogLog precision must be between"):
+                validate_numeric_bounds(chunk_size=1000, hll_precision=precision)
+
 class TestExportFormatValidation:
     
     def test_validate_export_format_valid(self):
         """Test valid export formats pass validation"""
-        for format_name in ['csv', 'json', 'xml', 'excel', 'body', 'timeline', 'l2t', 'sqlite', 'tsk']:
+        for format_name in ['csv', 'json', 'jsonl', 'xml', 'excel', 'body', 'timeline', 'l2t', 'sqlite', 'tsk']:
             result = validate_export_format(format_name, f"output.{format_name}")
             assert result == format_name
     
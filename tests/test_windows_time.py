@@ -1,5 +1,6 @@
 import pytest
-from src.analyzeMFT.windows_time import WindowsTime
+from src.analyzeMFT import windows_time
+from src.analyzeMFT.windows_time import WindowsTime, filetimes_to_unix, filetimes_to_datetime64, format_filetimes
 from datetime import datetime, timezone
 
 def test_windows_time_initialization():
@@ -32,9 +33,86 @@ def test_windows_time_far_future():    filetime = 135379296000000000    low = fi
     assert wt.dt.month == 1
     assert wt.dt.day == 1
 
+def test_windows_time_truncates_exactly():
+    wt = WindowsTime.from_filetime(131092560009999999)
+    assert wt.dtstr == "2016-06-01T12:00:00.999Z" == format_filetimes([131092560009999999])[0]
+    assert wt.dt == datetime(2016, 6, 1, 12, 0, 0, 999999, tzinfo=timezone.utc)
+
 def test_windows_time_dst_transition():    filetime = 131023080000000000    low = filetime & 0xFFFFFFFF
     high = filetime >> 32
     wt = WindowsTime(low, high)
     assert wt.dt.hour == 2
     assert wt.dt.minute == 0
-    assert wt.dt.tzinfo == timezone.utc  # Ensure the time is in UTC
\ No newline at end of file
+    assert wt.dt.tzinfo == timezone.utc  # Ensure the time is in UTC
+
+def test_format_filetimes_matches_windows_time():
+    pytest.importorskip("numpy")
+    filetimes = [0, 132854688000000000, 0xFFFFFFFFFFFFFFFF, 135379296000000000]
+    strings = format_filetimes(filetimes)
+    for filetime, text in zip(filetimes, strings):
+        assert text == WindowsTime(filetime & 0xFFFFFFFF, filetime >> 32).dtstr
+
+def test_format_filetimes_full_precision():
+    pytest.importorskip("numpy")
+    strings = format_filetimes([132854688000000001], timespec='nanoseconds')
+    assert strings[0] == "2022-01-01T00:00:00.000000100Z"
+
+def test_format_filetimes_without_numpy(monkeypatch):
+    filetimes = [0, 132854688000000001, 0xFFFFFFFFFFFFFFFF, 250000000000000009]
+    expected = {
+        'seconds': ["Not defined", "2022-01-01T00:00:00Z", "Invalid timestamp", "2393-03-21T20:26:40Z"],
+        'milliseconds': ["Not defined", "2022-01-01T00:00:00.000Z", "Invalid timestamp", "2393-03-21T20:26:40.000Z"],
+        'nanoseconds': ["Not defined", "2022-01-01T00:00:00.000000100Z", "Invalid timestamp", "Invalid timestamp"],
+    }
+    monkeypatch.setattr(windows_time, 'HAS_NUMPY', False)
+    for timespec, strings in expected.items():
+        assert format_filetimes(filetimes, timespec=timespec) == strings
+    monkeypatch.undo()
+    if windows_time.HAS_NUMPY:
+        for timespec, strings in expected.items():
+            assert list(format_filetimes(filetimes, timespec=timespec)) == strings
+
+def test_filetimes_to_unix():
+    pytest.importorskip("numpy")
+    unix = filetimes_to_unix([0, 132854688000000000, 0xFFFFFFFFFFFFFFFF])
+    assert list(unix) == [0.0, 1640995200.0, 0.0]
+
+def test_filetimes_to_datetime64():
+    np = pytest.importorskip("numpy")
+    values = filetimes_to_datetime64([0, 132854688000000000], unit='us')
+    assert np.isnat(values[0])
+    assert values[1] == np.datetime64('2022-01-01T00:00:00', 'us')
+    with pytest.raises(ValueError):
+        filetimes_to_datetime64([0], unit='fortnight')
+
+
+def test_windows_time_from_filetime():
+    filetime = 132854688000000000
+    wt = WindowsTime.from_filetime(filetime)
+    assert wt.low == filetime & 0xFFFFFFFF
+    assert wt.high == filetime >> 32
+    assert wt.dtstr == WindowsTime(filetime & 0xFFFFFFFF, filetime >> 32).dtstr
+
+def test_windows_time_is_lazy():
+    wt = WindowsTime.from_filetime(132854688000000000)
+    assert wt.unixtime == 1640995200.0
+    assert wt._dt is windows_time._UNSET and wt._dtstr is windows_time._UNSET
+    assert wt.dt == datetime(2022, 1, 1, tzinfo=timezone.utc)
+    assert wt._dt is wt.dt and wt._dtstr == "2022-01-01T00:00:00.000Z"
+    hits = WindowsTime.cache_info().hits
+    assert WindowsTime.from_filetime(132854688000000000).dtstr == wt.dtstr
+    assert WindowsTime.cache_info().hits == hits + 1
+
+def test_windows_time_shared_cache():
+    first = WindowsTime.from_filetime(131092560000000000)
+    second = WindowsTime.from_filetime(131092560000000000)
+    assert first.dt is second.dt
+    assert first.dtstr is second.dtstr
+
+def test_windows_time_pickle():
+    import pickle
+    wt = WindowsTime.from_filetime(132854688000000000)
+    wt.dtstr
+    restored = pickle.loads(pickle.dumps(wt))
+    assert restored.filetime == wt.filetime
+    assert restored.dtstr == wt.dtstr